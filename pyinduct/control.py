@@ -1,12 +1,14 @@
 
+from collections.abc import Mapping
 from itertools import chain
 import numpy as np
 
-from .registry import get_base
+from .registry import get_base, is_registered
 from .core import domain_intersection, integrate_function, \
-    TransformationInfo, get_weight_transformation
+    TransformationInfo, LinearTransformation, _get_weight_transformation
 from .placeholder import EquationTerm, ScalarTerm, IntegralTerm, Scalars, FieldVariable, get_common_target
 from .simulation import SimulationInput, CanonicalForms
+from .visualization import EvalData
 """
 This module contains all classes and functions related to the creation of controllers as well as the implementation
 for simulation purposes.
@@ -40,12 +42,21 @@ class Controller(SimulationInput):
     wrapper class for all controllers that have to interact with the simulation environment
 
     :param control_law: function handle that calculates the control output if provided with correct weights
+    :param record: record mode, see :py:class:`SimulationInput`
+    :param decimation: record decimation, see :py:class:`SimulationInput`
+    :param sample_time: sample time of a digital controller, the control law is only evaluated at the sample
+        instants and held in between, see :py:class:`SimulationInput`
+
+    Besides the output, the weights are recorded under the key ``weights`` . The weights in the bases of the law are
+    only computed from them when they are demanded, see :py:func:`get_results` .
     """
 
-    def __init__(self, control_law):
-        SimulationInput.__init__(self, name=control_law.name)
+    def __init__(self, control_law, record="all", decimation=1, sample_time=None):
+        SimulationInput.__init__(self, name=control_law.name, record=record, decimation=decimation,
+                                 sample_time=sample_time)
         c_forms = approximate_control_law(control_law)
         self._evaluator = LawEvaluator(c_forms, self._value_storage)
+        self._weight_lbl = None
 
     def _calc_output(self, **kwargs):
         """
@@ -53,7 +64,35 @@ class Controller(SimulationInput):
         :param current_weights: current weights of the simulations system approximation
         :return: control output :math:`u`
         """
-        return self._evaluator(kwargs["weights"], kwargs["weight_lbl"])
+        self._weight_lbl = kwargs["weight_lbl"]
+        res = self._evaluator(kwargs["weights"], kwargs["weight_lbl"])
+        return dict(output=res["output"], weights=np.array(kwargs["weights"]))
+
+    def get_results(self, time_steps, result_key="output", interpolation="nearest", as_eval_data=False):
+        """
+        see :py:func:`SimulationInput.get_results` , the labels of the bases of the control law can be given as
+        *result_key* to get the recorded weights transformed into these bases
+        """
+        if result_key in self._value_storage or result_key not in self._evaluator.labels:
+            return SimulationInput.get_results(self, time_steps, result_key, interpolation, as_eval_data)
+
+        weights = SimulationInput.get_results(self, time_steps, "weights", interpolation)
+        results = self._evaluator.transform_batch(weights, self._weight_lbl, result_key)
+        if as_eval_data:
+            return EvalData([time_steps], results, name=".".join([self.name, result_key]))
+
+        return results
+
+    def evaluate_batch(self, weights, weight_lbl):
+        """
+        calculate the controller output for a whole set of weights, e.g. from a simulation run. Other than calling
+        the controller, nothing is stored.
+
+        :param weights: 2d ndarray with one weight vector per row
+        :param weight_lbl: label of the weights
+        :return: 1d ndarray of control outputs
+        """
+        return self._evaluator.evaluate_batch(weights, weight_lbl)
 
 
 def approximate_control_law(control_law):
@@ -129,11 +168,19 @@ def _parse_control_law(law):
 class LawEvaluator(object):
     """
     object that evaluates the control law approximation given by a CanonicalForms object
+
+    On the first call for a weight label (and derivative order), the law is compiled: the eval vectors of all linear
+    terms are multiplied with their (linear) weight transformations and summed up into one gain vector. Hence,
+    evaluating a linear law boils down to a single dot product. Terms that can not be folded (nonlinear terms or
+    transformations that are not given by a matrix) are evaluated separately. The compiled law is rebuilt if one of
+    the involved bases, including the assistant systems of the transformations, has been registered anew.
+
+    Besides the output, every call returns the weights transformed into the bases of the law, see
+    :py:func:`__call__` . These are only computed when they are read.
     """
     def __init__(self, cfs, storage=None):
         self._cfs = cfs
-        self._transformations = {}
-        self._eval_vectors = {}
+        self._compiled = {}
         self._storage = storage
 
     @staticmethod
@@ -156,54 +203,125 @@ class LawEvaluator(object):
 
         return vectors
 
-    def __call__(self, weights, weight_label):
+    def _compile(self, weight_label, weight_size):
         """
-        evaluation function for approximated control law
-        :param weights: 1d ndarray of approximation weights
-        :param weight_label: string, label of functions the weights correspond to.
-        :return: control output u
+        fold the control law for weights of the given label and size
+
+        :return: tuple of gain vector, constant term, list of the remaining (label, handle, power, vector) terms,
+            list of (label, handle) tuples of the weight transformations and list of (label, base) tuples of the
+            involved bases
         """
-        res = {}
-        output = 0+0j
+        src_base = get_base(weight_label, 0)
+        gain = np.zeros((weight_size, ), dtype=complex)
+        remaining = []
+        transformations = []
+        bases = [(weight_label, src_base)]
 
-        # add dynamic part
         for lbl, law in self._cfs.get_dynamic_terms().items():
-            dst_weights = [0]
+            handle = None
             if "E" in law is not None:
-                # build eval vector
-                if lbl not in self._eval_vectors.keys():
-                    self._eval_vectors[lbl] = self._build_eval_vector(law)
+                vectors = self._build_eval_vector(law)
 
                 # collect information
                 info = TransformationInfo()
                 info.src_lbl = weight_label
                 info.dst_lbl = lbl
-                info.src_base = get_base(weight_label, 0)
+                info.src_base = src_base
                 info.dst_base = get_base(lbl, 0)
-                info.src_order = int(weights.size / info.src_base.size) - 1
-                info.dst_order = int(next(iter(self._eval_vectors[lbl].values())).size / info.dst_base.size) - 1
+                info.src_order = int(weight_size / info.src_base.size) - 1
+                info.dst_order = int(next(iter(vectors.values())).size / info.dst_base.size) - 1
 
-                # look up transformation
-                if info not in self._transformations.keys():
-                    # fetch handle
-                    handle = get_weight_transformation(info)
-                    self._transformations[info] = handle
-
-                # transform weights
-                dst_weights = self._transformations[info](weights)
-
-                # evaluate
-                vectors = self._eval_vectors[lbl]
+                handle, dependencies = _get_weight_transformation(info)
+                bases.extend(dependencies.items())
                 for p, vec in vectors.items():
-                    output = output + np.dot(vec, np.power(dst_weights, p))
-
-            res[lbl] = dst_weights
+                    if p == 1 and isinstance(handle, LinearTransformation):
+                        gain = gain + np.dot(vec, handle.matrix)
+                    else:
+                        remaining.append((lbl, handle, p, vec))
+            transformations.append((lbl, handle))
 
         # add constant term
         static_terms = self._cfs.get_static_terms()
-        if "f" in static_terms:
-            output = output + static_terms["f"]
+        offset = static_terms.get("f", 0)
+
+        return _real_if_close(gain), _real_if_close(offset), remaining, transformations, bases
+
+    def _get_compiled(self, weights, weight_label):
+        key = (weight_label, weights.shape[-1])
+        compiled = self._compiled.get(key, None)
+        # registering a base anew creates a new array
+        if compiled is None or not all([is_registered(lbl) and get_base(lbl, 0) is base for lbl, base in compiled[4]]):
+            compiled = self._compiled[key] = self._compile(weight_label, weights.shape[-1])
+        return compiled
+
+    def __call__(self, weights, weight_label):
+        """
+        evaluation function for approximated control law
+        :param weights: 1d ndarray of approximation weights
+        :param weight_label: string, label of functions the weights correspond to.
+        :return: mapping with the control output u under the key ``output`` and the transformed weights under the
+            labels of the law's bases
+        """
+        gain, offset, remaining, transformations, bases = self._get_compiled(weights, weight_label)
+        res = _LawResult(weights, transformations)
+
+        output = np.dot(gain, weights) + offset
+        for lbl, handle, p, vec in remaining:
+            output = output + np.dot(vec, np.power(res[lbl], p))
+
+        if remaining or np.iscomplexobj(output):
+            output = self._check_output(output)
+
+        res.output = output
+        return res
 
+    @property
+    def labels(self):
+        """
+        labels of the bases of the control law
+        """
+        return list(self._cfs.get_dynamic_terms().keys())
+
+    def transform_batch(self, weights, weight_label, label):
+        """
+        transform a whole set of weight vectors into the base of the law given by *label*
+
+        :param weights: 2d ndarray with one weight vector per row
+        :param weight_label: string, label of functions the weights correspond to.
+        :param label: label of the destination base
+        :return: 2d ndarray with one transformed weight vector per row
+        """
+        weights = np.atleast_2d(weights)
+        handle = dict(self._get_compiled(weights, weight_label)[3])[label]
+        if handle is None:
+            return np.zeros((weights.shape[0], 1))
+        if isinstance(handle, LinearTransformation):
+            return np.dot(weights, handle.matrix.T)
+
+        return np.array([handle(row) for row in weights])
+
+    def evaluate_batch(self, weights, weight_label):
+        """
+        evaluate the control law for a whole set of weight vectors, e.g. the results of a simulation
+
+        :param weights: 2d ndarray with one weight vector per row
+        :param weight_label: string, label of functions the weights correspond to.
+        :return: 1d ndarray of control outputs
+        """
+        weights = np.atleast_2d(weights)
+        gain, offset, remaining, transformations, bases = self._get_compiled(weights, weight_label)
+
+        output = np.dot(gain, weights.T).reshape(-1) + offset
+        for lbl, handle, p, vec in remaining:
+            output = output + np.array([np.dot(vec, np.power(handle(row), p)) for row in weights]).reshape(-1)
+
+        if remaining or np.iscomplexobj(output):
+            output = np.array([self._check_output(out) for out in output])
+
+        return output
+
+    @staticmethod
+    def _check_output(output):
         # TODO: replace with the one from utils
         if abs(np.imag(output)) > np.finfo(np.complex128).eps * 100:
             print("Warning: Imaginary part of output is nonzero! out = {0}".format(output))
@@ -213,5 +331,40 @@ class LawEvaluator(object):
             raise ValueError("calculated complex control output u={0},"
                                           " check for errors in control law!".format(out))
 
-        res["output"] = out
-        return res
+        return out
+
+
+class _LawResult(Mapping):
+    """
+    result of :py:class:`LawEvaluator` , the weights are only transformed into the bases of the law when they are read
+
+    :param weights: weights the law has been evaluated for
+    :param transformations: list of (label, handle) tuples of the weight transformations
+    """
+
+    def __init__(self, weights, transformations):
+        self._weights = np.array(weights)
+        self._handles = dict(transformations)
+        self._values = {}
+        self.output = None
+
+    def __getitem__(self, key):
+        if key == "output":
+            return self.output
+        if key not in self._values:
+            handle = self._handles[key]
+            self._values[key] = [0] if handle is None else handle(self._weights)
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(list(self._handles) + ["output"])
+
+    def __len__(self):
+        return len(self._handles) + 1
+
+
+def _real_if_close(value):
+    """
+    drop the imaginary part of compiled gains if it vanishes, the same tolerance as for the control output is used
+    """
+    return np.real_if_close(value, tol=10000000)
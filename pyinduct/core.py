@@ -2,11 +2,13 @@
 
 from abc import ABCMeta, abstractmethod
 from copy import copy
+from functools import reduce, wraps
 from numbers import Number
 import numpy as np
 from scipy import integrate
-from scipy.linalg import block_diag
-from .registry import get_base
+from scipy.interpolate import CubicSpline, PPoly
+from scipy.linalg import block_diag, solve_triangular
+from .registry import get_base, register_base, is_registered
 import collections
 
 
@@ -95,11 +97,7 @@ class BaseFraction(object, metaclass=ABCMeta):
     def _transformation_factory(info):
         mat = calculate_expanded_base_transformation_matrix(info.src_base, info.dst_base, info.src_order,
                                                             info.dst_order)
-
-        def handle(weights):
-            return np.dot(mat, weights)
-
-        return handle
+        return LinearTransformation(mat)
 
     @abstractmethod
     def scalar_product_hint(self):
@@ -132,15 +130,29 @@ class BaseFraction(object, metaclass=ABCMeta):
         pass
 
 
+def _arithmetic_operator(operator):
+    """
+    let *operator* of :py:class:`Function` return NotImplemented for operands that are neither numbers nor functions
+    """
+    @wraps(operator)
+    def _operator(self, other):
+        if not isinstance(other, (Number, Function)):
+            return NotImplemented
+        return operator(self, other)
+
+    return _operator
+
+
 class Function(BaseFraction):
     """
     Most common instance of a :class:`BaseFraction`.
     This class handles all tasks concerning derivation and evaluation of functions.
 
     To ensure the accurateness of numerical handling, areas where nonzero is given have to be provided.
-    """
 
-    # TODO: overload add and mul operators
+    Functions can be combined with numbers and other functions by the operators ``+ - * /`` and ``**`` , which
+    yields a :py:class:`FunctionExpression` .
+    """
 
     def __init__(self, eval_handle, domain=(-np.inf, np.inf), nonzero=(-np.inf, np.inf), derivative_handles=None,
                  vectorial=False):
@@ -301,6 +313,8 @@ class Function(BaseFraction):
         """
         self._check_domain(argument)
         if self.vectorial:
+            if not isinstance(argument, (Number, np.ndarray)):
+                argument = np.asarray(argument)
             return self._function_handle(argument)
         else:
             try:
@@ -327,6 +341,582 @@ class Function(BaseFraction):
                               derivative_handles=self._derivative_handles[order:])
         return derivative
 
+    @_arithmetic_operator
+    def __add__(self, other):
+        return _add(self, other)
+
+    @_arithmetic_operator
+    def __radd__(self, other):
+        return _add(other, self)
+
+    @_arithmetic_operator
+    def __sub__(self, other):
+        return _add(self, _multiply(other, -1))
+
+    @_arithmetic_operator
+    def __rsub__(self, other):
+        return _add(other, _multiply(self, -1))
+
+    @_arithmetic_operator
+    def __mul__(self, other):
+        return _multiply(self, other)
+
+    @_arithmetic_operator
+    def __rmul__(self, other):
+        return _multiply(other, self)
+
+    @_arithmetic_operator
+    def __truediv__(self, other):
+        return _multiply(self, _power(other, -1))
+
+    @_arithmetic_operator
+    def __rtruediv__(self, other):
+        return _multiply(other, _power(self, -1))
+
+    def __pow__(self, power):
+        if not isinstance(power, Number):
+            return NotImplemented
+        return _power(self, power)
+
+    def __neg__(self):
+        return _multiply(self, -1)
+
+
+def _evaluate_vectorized(handle, z, dtype=None, constant=False):
+    """
+    evaluate the callable *handle* at the places *z* (1d array) by one vectorized call. Handles that only accept
+    scalars or do not map *z* elementwise are evaluated point by point.
+
+    :param handle: callable
+    :param z: places to evaluate at
+    :param dtype: dtype of the result
+    :param constant: whether a scalar result of the vectorized call is the value of a constant handle (e.g.
+        ``lambda z: 1``) and broadcast to the shape of *z* , otherwise such handles are evaluated point by point
+    :return: np.ndarray of the shape of *z*
+    """
+    try:
+        values = np.asarray(handle(z), dtype=dtype)
+    except (TypeError, ValueError):
+        values = None
+
+    if constant and values is not None and values.ndim == 0:
+        return np.broadcast_to(values, z.shape)
+    if values is None or values.shape != z.shape:
+        values = np.array([handle(val) for val in z], dtype=dtype)
+    return values
+
+
+class ExponentialSumFunction(Function):
+    """
+    :py:class:`Function` that is known to be a sum of (complex) exponentials
+    :math:`f(z) = \\sum_k c_k e^{s_k z}` , e.g. the eigenfunctions of problems with constant coefficients.
+
+    The function itself is still evaluated by *eval_handle* , the representation is used to compute the inner
+    products with other functions of this kind in closed form, see :py:func:`dot_product_l2` . It is carried over to
+    the derivatives and scaled versions of the function.
+
+    :param eval_handle: callable object that can be evaluated
+    :param coefficients: coefficients :math:`c_k` , if None the function is treated as ordinary :py:class:`Function`
+    :param exponents: exponents :math:`s_k`
+    """
+
+    def __init__(self, eval_handle, coefficients, exponents, domain=(-np.inf, np.inf), nonzero=(-np.inf, np.inf),
+                 derivative_handles=None, vectorial=False):
+        Function.__init__(self, eval_handle, domain=domain, nonzero=nonzero, derivative_handles=derivative_handles,
+                          vectorial=vectorial)
+        if coefficients is None:
+            self._exp_terms = None
+        else:
+            self._exp_terms = (np.atleast_1d(coefficients), np.atleast_1d(exponents))
+
+    def exponential_terms(self):
+        """
+        :return: tuple of coefficients and exponents or None if no representation is available
+        """
+        return self._exp_terms
+
+    def derive(self, order=1):
+        derivative = Function.derive(self, order)
+        if order == 0 or self._exp_terms is None:
+            return derivative
+
+        coefficients, exponents = self._exp_terms
+        return ExponentialSumFunction(derivative._function_handle, coefficients * exponents ** order, exponents,
+                                      domain=self.domain, nonzero=self.nonzero,
+                                      derivative_handles=derivative._derivative_handles, vectorial=self.vectorial)
+
+    def scale(self, factor):
+        scaled = Function.scale(self, factor)
+        if scaled is self or self._exp_terms is None or isinstance(factor, collections.Callable):
+            return scaled
+
+        coefficients, exponents = self._exp_terms
+        return ExponentialSumFunction(scaled._function_handle, factor * coefficients, exponents,
+                                      domain=self.domain, nonzero=self.nonzero,
+                                      derivative_handles=scaled._derivative_handles, vectorial=self.vectorial)
+
+
+class TabulatedFunction(Function):
+    """
+    :py:class:`Function` that is only known on a grid, e.g. the numerical solution of an ode, a POD mode or a measured
+    profile. The samples are interpolated by a cubic spline whose coefficients are kept in one contiguous array. The
+    function is evaluated vectorized, its derivatives are the derivatives of the spline and its inner products with
+    other piecewise polynomials are computed exactly, see :py:func:`dot_product_l2` .
+
+    Many functions on the same grid should be created by :py:func:`tabulate_base` , which lets them share one table.
+
+    :param grid: strictly increasing sample points
+    :param values: samples at *grid* (ignored if *coefficients* are given)
+    :param coefficients: coefficients of the piecewise polynomial with the shape (order + 1, len(grid) - 1) in the
+        layout of :py:class:`scipy.interpolate.PPoly` , these are used without copying
+    :param bc_type: boundary condition type of the spline, see :py:class:`scipy.interpolate.CubicSpline`
+    """
+
+    def __init__(self, grid, values=None, coefficients=None, bc_type="not-a-knot"):
+        grid = np.ascontiguousarray(grid, dtype=float)
+        if coefficients is None:
+            if values is None:
+                raise ValueError("either values or coefficients have to be provided.")
+            coefficients = CubicSpline(grid, values, bc_type=bc_type).c
+        if coefficients.ndim != 2 or coefficients.shape[1] != grid.size - 1:
+            raise ValueError("coefficients do not fit to the grid.")
+
+        self._ppoly = PPoly.construct_fast(coefficients, grid, extrapolate=False)
+        Function.__init__(self, self._eval, domain=(grid[0], grid[-1]), nonzero=(grid[0], grid[-1]), vectorial=True)
+
+    @property
+    def grid(self):
+        return self._ppoly.x
+
+    @property
+    def coefficients(self):
+        return self._ppoly.c
+
+    def _eval(self, z):
+        return self._ppoly(z)[()]
+
+    def piecewise_polynomial(self):
+        """
+        :return: representation as :py:class:`scipy.interpolate.PPoly`
+        """
+        return self._ppoly
+
+    def derive(self, order=1):
+        if not isinstance(order, int):
+            raise TypeError("only integer allowed as derivation order")
+        if order == 0:
+            return self
+        if order < 0 or order >= self.coefficients.shape[0]:
+            raise ValueError("function cannot be differentiated that often.")
+
+        return TabulatedFunction(self.grid, coefficients=self._ppoly.derivative(order).c)
+
+    def scale(self, factor):
+        if factor == 1 or isinstance(factor, collections.Callable):
+            return Function.scale(self, factor)
+
+        return TabulatedFunction(self.grid, coefficients=factor * self.coefficients)
+
+
+def tabulate_base(grid, values=None, coefficients=None, bc_type="not-a-knot"):
+    """
+    create a base of :py:class:`TabulatedFunction` s on the same grid. The coefficients of all members are stored in
+    one contiguous array of shape (n, order + 1, len(grid) - 1) , the members only hold views of it. Hence, the base
+    can be shared with other processes without copying the table, e.g. by passing a table that lives in shared memory
+    as *coefficients*.
+
+    :param grid: strictly increasing sample points
+    :param values: samples of the n members at *grid* as array of shape (n, len(grid))
+    :param coefficients: table of coefficients (instead of *values*)
+    :param bc_type: boundary condition type of the splines, see :py:class:`scipy.interpolate.CubicSpline`
+    :return: numpy.ndarray of :py:class:`TabulatedFunction` s
+    """
+    grid = np.ascontiguousarray(grid, dtype=float)
+    if coefficients is None:
+        spline = CubicSpline(grid, np.atleast_2d(values), axis=1, bc_type=bc_type)
+        coefficients = np.ascontiguousarray(np.moveaxis(spline.c, -1, 0))
+
+    return np.array([TabulatedFunction(grid, coefficients=table) for table in coefficients])
+
+
+class PolynomialFunction(Function):
+    """
+    Piecewise polynomial :py:class:`Function` , e.g. a lagrangian shape function. The pieces are kept as
+    :py:class:`numpy.polynomial.Polynomial` s, hence scaling, integer powers, products and derivatives of these
+    functions are computed exactly and yield a :py:class:`PolynomialFunction` again. Their integrals and inner products
+    are computed exactly as well, see :py:func:`integrate_function` and :py:func:`dot_product_l2` .
+
+    Outside of the breakpoints the function is zero. At a breakpoint the mean of the left and right limit is returned,
+    at the ends of the support the inner limit. The ends of the support of derivatives are evaluated as mean of the
+    inner limit and zero, unless the end is a border of the function's domain or marked by *left_border* or
+    *right_border* , in which case the inner limit is returned as well.
+
+    :param breakpoints: strictly increasing breakpoints :math:`z_0 < \\dotsb < z_n`
+    :param pieces: n polynomials (or their coefficients in ascending order) in :math:`z` , the i-th piece is valid on
+        :math:`[z_i, z_{i+1}]`
+    :param left_border: whether :math:`z_0` is a border of the spatial domain
+    :param right_border: whether :math:`z_n` is a border of the spatial domain
+    :param domain: domain on which the function is defined
+    :param derivative_order: order of the derivative of a shape function this function represents
+    """
+
+    def __init__(self, breakpoints, pieces, left_border=False, right_border=False, domain=(-np.inf, np.inf),
+                 derivative_order=0):
+        breakpoints = np.array(breakpoints, dtype=float)
+        pieces = [piece.convert(kind=np.polynomial.Polynomial) if hasattr(piece, "convert")
+                  else np.polynomial.Polynomial(piece) for piece in pieces]
+        if breakpoints.ndim != 1 or len(pieces) != breakpoints.size - 1 or np.any(np.diff(breakpoints) <= 0):
+            raise ValueError("pieces do not fit to the breakpoints.")
+
+        self._pieces = pieces
+        self.left_border = left_border
+        self.right_border = right_border
+        self.derivative_order = derivative_order
+        self.degree = max(piece.degree() for piece in pieces)
+
+        # coefficients in the local coordinates of the pieces, see scipy.interpolate.PPoly
+        coefficients = np.zeros((self.degree + 1, len(pieces)))
+        for idx, piece in enumerate(pieces):
+            local_coef = piece(np.polynomial.Polynomial([breakpoints[idx], 1])).coef
+            coefficients[self.degree + 1 - local_coef.size:, idx] = local_coef[::-1]
+        self._ppoly = PPoly.construct_fast(coefficients, breakpoints, extrapolate=False)
+
+        # values at the breakpoints
+        left_limits = np.hstack((0, [piece(end) for piece, end in zip(pieces, breakpoints[1:])]))
+        right_limits = np.hstack(([piece(start) for piece, start in zip(pieces, breakpoints[:-1])], 0))
+        self._point_values = (left_limits + right_limits) / 2
+        borders = np.array(domain if isinstance(domain, list) else [domain])
+        if derivative_order == 0 or left_border or breakpoints[0] in borders.min(axis=1):
+            self._point_values[0] = right_limits[0]
+        if derivative_order == 0 or right_border or breakpoints[-1] in borders.max(axis=1):
+            self._point_values[-1] = left_limits[-1]
+
+        Function.__init__(self, self._eval, domain=domain, nonzero=(breakpoints[0], breakpoints[-1]), vectorial=True)
+
+    @property
+    def breakpoints(self):
+        return self._ppoly.x
+
+    @property
+    def pieces(self):
+        return self._pieces
+
+    def _eval(self, z):
+        values = self._ppoly(z)
+        idx = np.minimum(np.searchsorted(self.breakpoints, z), self.breakpoints.size - 1)
+        values = np.where(self.breakpoints[idx] == z, self._point_values[idx], values)
+        return np.where(np.isnan(values), 0, values)[()]
+
+    def _create(self, pieces, derivative_order=0):
+        return PolynomialFunction(self.breakpoints, pieces, left_border=self.left_border,
+                                  right_border=self.right_border, domain=self.domain,
+                                  derivative_order=self.derivative_order + derivative_order)
+
+    def piecewise_polynomial(self):
+        """
+        :return: representation as :py:class:`scipy.interpolate.PPoly`
+        """
+        return self._ppoly
+
+    def derive(self, order=1):
+        if not isinstance(order, int):
+            raise TypeError("only integer allowed as derivation order")
+        if order == 0:
+            return self
+        if order < 0 or order > self.degree:
+            raise ValueError("function cannot be differentiated that often.")
+
+        return self._create([piece.deriv(order) for piece in self._pieces], order)
+
+    def raise_to(self, power):
+        if power == 1 or power < 0 or power != int(power):
+            return Function.raise_to(self, power)
+
+        return self._create([piece ** int(power) for piece in self._pieces])
+
+    def scale(self, factor):
+        if isinstance(factor, PolynomialFunction):
+            return self.multiply(factor)
+        if factor == 1 or isinstance(factor, collections.Callable):
+            return Function.scale(self, factor)
+
+        return self._create([factor * piece for piece in self._pieces])
+
+    def multiply(self, other):
+        """
+        exact product with another :py:class:`PolynomialFunction`
+
+        :param other: :py:class:`PolynomialFunction`
+        :return: :py:class:`PolynomialFunction`
+        """
+        if not isinstance(other, PolynomialFunction):
+            raise TypeError("only PolynomialFunctions can be multiplied exactly.")
+
+        start = max(self.breakpoints[0], other.breakpoints[0])
+        end = min(self.breakpoints[-1], other.breakpoints[-1])
+        if start >= end:
+            return self.scale(0)
+
+        breakpoints = np.union1d(self.breakpoints, other.breakpoints)
+        breakpoints = breakpoints[(breakpoints >= start) & (breakpoints <= end)]
+        centers = (breakpoints[:-1] + breakpoints[1:]) / 2
+        pieces = [self._pieces[first] * other._pieces[second]
+                  for first, second in zip(np.searchsorted(self.breakpoints, centers) - 1,
+                                           np.searchsorted(other.breakpoints, centers) - 1)]
+
+        # an end of the product is a border if it is one for all factors that end there
+        left_border = all(func.left_border for func in [self, other] if func.breakpoints[0] == start)
+        right_border = all(func.right_border for func in [self, other] if func.breakpoints[-1] == end)
+        return PolynomialFunction(breakpoints, pieces, left_border=left_border, right_border=right_border,
+                                  domain=domain_intersection(self.domain, other.domain),
+                                  derivative_order=max(self.derivative_order, other.derivative_order))
+
+
+class FunctionExpression(Function):
+    """
+    Node of an expression tree of :py:class:`Function` s as it is built by their arithmetic operators, e.g.
+    ``2 * f + g / h`` . A node is either a weighted sum :math:`c + \\sum_i w_i f_i(z)` or a product of powers
+    :math:`\\prod_i f_i(z)^{w_i}` of its operands. While the tree is built, constants are folded, scales are merged
+    into the weights of sums, equal operands are collected and products of :py:class:`PolynomialFunction` s are
+    computed exactly. The whole tree is evaluated vectorized in one pass, its derivatives are built from the
+    derivatives of the operands by the product and chain rule.
+
+    Instances are created by the operators and should not be constructed directly.
+
+    :param kind: "sum" or "product"
+    :param operands: list of (function, weight) tuples, the weights are factors for sums and exponents for products
+    :param constant: constant summand of a sum
+    :param domain: domain of the expression, defaults to the common domain of the operands
+    """
+
+    def __init__(self, kind, operands, constant=0, domain=None):
+        if kind not in ("sum", "product"):
+            raise ValueError("unknown kind of expression: {}".format(kind))
+
+        self._kind = kind
+        self._operands = operands
+        self._constant = constant
+        if domain is None:
+            domain = _common_domain([func for func, weight in operands])
+        Function.__init__(self, self._eval, domain=domain,
+                          nonzero=_expression_support(kind, operands, constant, domain), vectorial=True)
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def operands(self):
+        return self._operands
+
+    @property
+    def constant(self):
+        return self._constant
+
+    def _eval(self, z):
+        if self._kind == "sum":
+            result = self._constant + np.zeros(np.shape(z))
+            for func, weight in self._operands:
+                result = result + weight * _evaluate_operand(func, z)
+        else:
+            result = np.ones(np.shape(z))
+            for func, weight in self._operands:
+                result = result * _evaluate_operand(func, z) ** weight
+
+        return result[()]
+
+    def derive(self, order=1):
+        if not isinstance(order, int):
+            raise TypeError("only integer allowed as derivation order")
+        if order == 0:
+            return self
+        if order < 0:
+            raise ValueError("function cannot be differentiated that often.")
+        if not self._operands:
+            return _constant(0, self.domain)
+
+        if self._kind == "sum":
+            terms = [func.derive(1) * weight for func, weight in self._operands]
+        else:
+            factors = [func ** weight for func, weight in self._operands]
+            terms = []
+            for idx, (func, weight) in enumerate(self._operands):
+                outer = func.derive(1) * weight if weight == 1 else func.derive(1) * func ** (weight - 1) * weight
+                terms.append(reduce(_multiply, factors[:idx] + factors[idx + 1:], outer))
+
+        return reduce(_add, terms).derive(order - 1)
+
+    def raise_to(self, power):
+        return self ** power
+
+    def scale(self, factor):
+        if isinstance(factor, (Number, Function)):
+            return self * factor
+        return Function.scale(self, factor)
+
+
+def _common_domain(functions):
+    domain = [(-np.inf, np.inf)]
+    for func in functions:
+        domain = domain_intersection(domain, func.domain)
+    if not domain:
+        raise ValueError("functions have no common domain.")
+    return domain
+
+
+def _expression_support(kind, operands, constant, domain):
+    """
+    nonzero area of an expression, see :py:class:`FunctionExpression`
+    """
+    if kind == "sum":
+        if constant != 0 or not operands:
+            return domain
+        starts, ends = zip(*[interval for func, weight in operands for interval in func.nonzero])
+        return [(min(starts), max(ends))]
+
+    support = domain
+    for func, weight in operands:
+        if weight > 0:
+            support = domain_intersection(support, func.nonzero)
+    return support
+
+
+def _evaluate_operand(func, z):
+    values = func._eval(z) if isinstance(func, FunctionExpression) else func(z)
+    return np.asarray(values) + 0.
+
+
+def _constant_value(operand):
+    """
+    :return: value of *operand* if it is a number or a constant expression, else None
+    """
+    if isinstance(operand, Number):
+        return operand
+    if isinstance(operand, FunctionExpression) and not operand.operands:
+        return operand.constant
+    return None
+
+
+def _constant(value, domain):
+    return FunctionExpression("sum", [], constant=value, domain=domain)
+
+
+def _collect(operands):
+    """
+    merge the weights of equal operands and drop the vanishing ones
+    """
+    collected = []
+    for func, weight in operands:
+        for idx, (other, other_weight) in enumerate(collected):
+            if other is func:
+                collected[idx] = (func, other_weight + weight)
+                break
+        else:
+            collected.append((func, weight))
+    return [(func, weight) for func, weight in collected if weight != 0]
+
+
+def _add(first, second):
+    domain = _common_domain([op for op in (first, second) if isinstance(op, Function)])
+
+    constant = 0
+    operands = []
+    for op in (first, second):
+        value = _constant_value(op)
+        if value is not None:
+            constant += value
+        elif isinstance(op, FunctionExpression) and op.kind == "sum":
+            constant += op.constant
+            operands += op.operands
+        else:
+            operands.append((op, 1))
+
+    operands = _collect(operands)
+    if not operands:
+        return _constant(constant, domain)
+    if constant == 0 and len(operands) == 1 and operands[0][1] == 1:
+        return operands[0][0]
+    return FunctionExpression("sum", operands, constant=constant)
+
+
+def _scale(func, factor):
+    if factor == 0:
+        return _constant(0, func.domain)
+    if factor == 1:
+        return func
+    if isinstance(func, PolynomialFunction):
+        return func.scale(factor)
+    if isinstance(func, FunctionExpression) and func.kind == "sum":
+        return FunctionExpression("sum", [(op, factor * weight) for op, weight in func.operands],
+                                  constant=factor * func.constant, domain=func.domain)
+    return FunctionExpression("sum", [(func, factor)])
+
+
+def _split_scale(func):
+    """
+    :return: scale and unscaled part of *func*
+    """
+    if isinstance(func, FunctionExpression) and func.kind == "sum" and func.constant == 0 \
+            and len(func.operands) == 1:
+        return func.operands[0][1], func.operands[0][0]
+    return 1, func
+
+
+def _multiply(first, second):
+    first_value = _constant_value(first)
+    second_value = _constant_value(second)
+    if first_value is not None and second_value is not None:
+        domain = _common_domain([op for op in (first, second) if isinstance(op, Function)])
+        return _constant(first_value * second_value, domain)
+    if first_value is not None:
+        return _scale(second, first_value)
+    if second_value is not None:
+        return _scale(first, second_value)
+
+    first_scale, first = _split_scale(first)
+    second_scale, second = _split_scale(second)
+    if isinstance(first, PolynomialFunction) and isinstance(second, PolynomialFunction):
+        return _scale(first.multiply(second), first_scale * second_scale)
+
+    operands = []
+    for op in (first, second):
+        if isinstance(op, FunctionExpression) and op.kind == "product":
+            operands += op.operands
+        else:
+            operands.append((op, 1))
+
+    operands = _collect(operands)
+    domain = _common_domain([first, second])
+    if not operands:
+        product = _constant(1, domain)
+    elif len(operands) == 1 and operands[0][1] == 1:
+        product = operands[0][0]
+    elif not _expression_support("product", operands, 0, domain):
+        return _constant(0, domain)
+    else:
+        product = FunctionExpression("product", operands)
+    return _scale(product, first_scale * second_scale)
+
+
+def _power(func, power):
+    value = _constant_value(func)
+    if value is not None:
+        return value ** power if isinstance(func, Number) else _constant(value ** power, func.domain)
+    if power == 0:
+        return _constant(1, func.domain)
+    if power == 1:
+        return func
+
+    integer_power = power == int(power)
+    scale, func = _split_scale(func) if integer_power else (1, func)
+    if isinstance(func, PolynomialFunction) and integer_power and power > 0:
+        return _scale(func.raise_to(power), scale ** power)
+    if isinstance(func, FunctionExpression) and func.kind == "product" and integer_power:
+        operands = [(op, weight * power) for op, weight in func.operands]
+    else:
+        operands = [(func, power)]
+    return _scale(FunctionExpression("product", operands), scale ** power)
+
 
 class ComposedFunctionVector(BaseFraction):
     """
@@ -456,6 +1046,16 @@ def _dot_product_l2(first, second):
         if hasattr(first, "quad_int"):
             return first.quad_int()
 
+    first_terms = first.exponential_terms() if hasattr(first, "exponential_terms") else None
+    second_terms = second.exponential_terms() if hasattr(second, "exponential_terms") else None
+    if first_terms is not None and second_terms is not None and np.all(np.isfinite(areas)):
+        return _integrate_exponential_product(first_terms, second_terms, areas)
+
+    first_poly = first.piecewise_polynomial() if hasattr(first, "piecewise_polynomial") else None
+    second_poly = second.piecewise_polynomial() if hasattr(second, "piecewise_polynomial") else None
+    if first_poly is not None and second_poly is not None and np.all(np.isfinite(areas)):
+        return _integrate_polynomial_product(first_poly, second_poly, areas)
+
     if 0:
         # TODO let Function Class handle product to gain more speed
         if type(first) is type(second):
@@ -468,6 +1068,54 @@ def _dot_product_l2(first, second):
     return result
 
 
+def _integrate_exponential_product(first_terms, second_terms, areas):
+    """
+    closed form of :math:`\\int f(z)g(z)\\,dz` for two sums of exponentials, see :py:class:`ExponentialSumFunction`
+
+    :param first_terms: coefficients and exponents of :math:`f`
+    :param second_terms: coefficients and exponents of :math:`g`
+    :param areas: list of (finite) intervals to integrate over
+    :return: integral
+    """
+    coefficients = np.outer(first_terms[0], second_terms[0]).flatten()
+    exponents = np.add.outer(first_terms[1], second_terms[1]).flatten()
+    is_zero = exponents == 0
+    safe_exponents = np.where(is_zero, 1, exponents)
+
+    result = 0
+    for start, end in areas:
+        integrals = np.where(is_zero, end - start,
+                             np.exp(exponents * start) * np.expm1(exponents * (end - start)) / safe_exponents)
+        result += np.sum(coefficients * integrals)
+
+    # the imaginary parts of conjugated terms cancel out
+    if abs(np.imag(result)) <= 1e-9 * max(1, abs(result)):
+        return np.real(result)
+    return result
+
+
+def _integrate_polynomial_product(first, second, areas):
+    """
+    exact value of :math:`\\int f(z)g(z)\\,dz` for two piecewise polynomials. Between the merged breakpoints the
+    product is a polynomial, which is integrated exactly by a Gauss-Legendre rule with enough nodes.
+
+    :param first: :py:class:`scipy.interpolate.PPoly` of :math:`f`
+    :param second: :py:class:`scipy.interpolate.PPoly` of :math:`g`
+    """
+    degree = first.c.shape[0] + second.c.shape[0] - 2
+    nodes, weights = np.polynomial.legendre.leggauss(degree // 2 + 1)
+    breakpoints = np.union1d(first.x, second.x)
+
+    result = 0
+    for start, end in areas:
+        points = np.hstack((start, breakpoints[(breakpoints > start) & (breakpoints < end)], end))
+        half_widths = np.diff(points)[:, np.newaxis] / 2
+        z = points[:-1, np.newaxis] + half_widths * (nodes + 1)
+        result += np.sum(weights * half_widths * first(z) * second(z))
+
+    return result
+
+
 def integrate_function(function, interval):
     """
     integrates the given function over given interval
@@ -476,6 +1124,16 @@ def integrate_function(function, interval):
     :param interval:
     :return:
     """
+    # piecewise polynomials can be integrated exactly
+    poly = function.piecewise_polynomial() if hasattr(function, "piecewise_polynomial") else None
+    if poly is not None and np.all(np.isfinite(interval)):
+        result = 0
+        for start, end in interval:
+            start, end = max(start, poly.x[0]), min(end, poly.x[-1])
+            if start < end:
+                result += poly.integrate(start, end)
+        return result, 0
+
     result = 0
     err = 0
     for area in interval:
@@ -674,6 +1332,135 @@ def project_weights(projection_matrix, src_weights):
     return np.dot(projection_matrix, src_weights)
 
 
+def generate_pod_basis(weights, base_label, n_modes=None, energy=None, label=None, overwrite=False):
+    """
+    computes a proper orthogonal decomposition (POD) basis from snapshots of a simulation run.
+
+    The snapshots are given by the weights (e.g. the result of :py:func:`simulation.simulate_state_space`) of the
+    basis registered under *base_label*. Since the basis is not necessarily orthonormal, the singular value
+    decomposition is weighted by the gram matrix :math:`M` of the basis, so that the resulting modes are orthonormal
+    with respect to the L2 scalar product.
+
+    If neither *n_modes* nor *energy* are given, all modes belonging to nonzero singular values are used.
+
+    :param weights: 2d np.ndarray where axis 0 is the temporal index and axis 1 the weight index, if more columns
+        than basis functions are provided (e.g. temporal derivatives) only the leading ones are used
+    :param base_label: label of the basis the weights belong to
+    :param n_modes: number of modes to generate
+    :param energy: fraction (0 < energy <= 1) of the snapshot energy that the modes have to capture
+    :param label: if given, the POD basis is registered under this label, see :py:func:`register_base`
+    :param overwrite: force overwrite if label is already present
+    :return: tuple of POD basis (np.ndarray of :py:class:`Function`) and singular values
+    """
+    base = get_base(base_label, 0)
+    weights = np.atleast_2d(weights)
+    if weights.shape[1] < base.size:
+        raise ValueError("weights (len={0}) have to fit the basis (len={1})!".format(weights.shape[1], base.size))
+    if n_modes is not None and energy is not None:
+        raise ValueError("only one of n_modes and energy can be given!")
+    if energy is not None and not 0 < energy <= 1:
+        raise ValueError("energy has to be in (0, 1]")
+
+    # weighted snapshot matrix Y = L^T X with M = L L^T
+    gram_mat = np.real_if_close(calculate_scalar_product_matrix(dot_product_l2, base, base))
+    low_mat = np.linalg.cholesky(gram_mat)
+    snapshots = np.dot(low_mat.T, weights[:, :base.size].T)
+
+    u_mat, sing_values, _ = np.linalg.svd(snapshots, full_matrices=False)
+
+    if n_modes is None:
+        if energy is None:
+            n_modes = np.sum(sing_values > sing_values[0] * max(snapshots.shape) * np.finfo(float).eps)
+        else:
+            captured = np.cumsum(sing_values ** 2) / np.sum(sing_values ** 2)
+            n_modes = np.searchsorted(captured, energy - np.finfo(float).eps) + 1
+    if not 0 < n_modes <= sing_values.size:
+        raise ValueError("only {} modes available!".format(sing_values.size))
+
+    # coefficients of the modes regarding the original basis: L^-T U
+    coefficients = solve_triangular(low_mat.T, u_mat[:, :n_modes], lower=False)
+
+    if all([isinstance(func, PolynomialFunction) for func in base]):
+        # e.g. finite element bases, the modes are computed exactly and provide all derivatives themselves
+        modes = np.array(_combine_polynomials(base, coefficients))
+    else:
+        # collect available spatial derivatives
+        derivatives = []
+        while True:
+            try:
+                derivatives.append(get_base(base_label, len(derivatives) + 1))
+            except ValueError:
+                break
+
+        nonzero = _support_hull(base)
+
+        def combination_factory(coefficient_vector, funcs):
+            def _combined_func(z):
+                return np.dot(coefficient_vector, np.array([func(z) for func in funcs]))
+
+            return _combined_func
+
+        modes = np.array([Function(combination_factory(vec, base), domain=base[0].domain, nonzero=nonzero,
+                                   derivative_handles=[combination_factory(vec, der) for der in derivatives])
+                          for vec in coefficients.T])
+
+    if label is not None:
+        register_base(label, modes, overwrite=overwrite)
+
+    return modes, sing_values
+
+
+def _support_hull(funcs):
+    """
+    :return: tuple (start, end) of the smallest interval that covers the nonzero areas of all *funcs* , the areas
+        may be given in any order
+    """
+    borders = [border for func in funcs for area in func.nonzero for border in area]
+    return min(borders), max(borders)
+
+
+def _combine_polynomials(funcs, vectors):
+    """
+    exact linear combinations of the :py:class:`PolynomialFunction` s *funcs* , given by the columns of *vectors*
+
+    :param funcs: array of :py:class:`PolynomialFunction` s
+    :param vectors: array of shape (len(funcs), n) with the weights of the n combinations
+    :return: list of n :py:class:`PolynomialFunction` s on the merged breakpoints of *funcs*
+    """
+    breakpoints = reduce(np.union1d, [func.breakpoints for func in funcs])
+    centers = (breakpoints[:-1] + breakpoints[1:]) / 2
+    degree = max([func.degree for func in funcs])
+
+    # ascending coefficients of the pieces of each function on every merged piece, zero outside of its support
+    table = np.zeros((len(funcs), degree + 1, centers.size))
+    for idx, func in enumerate(funcs):
+        inside = np.flatnonzero((centers > func.breakpoints[0]) & (centers < func.breakpoints[-1]))
+        for col, piece_idx in zip(inside, np.searchsorted(func.breakpoints, centers[inside]) - 1):
+            coef = func.pieces[piece_idx].coef
+            table[idx, :coef.size, col] = coef
+
+    left_border = all([func.left_border for func in funcs if func.breakpoints[0] == breakpoints[0]])
+    right_border = all([func.right_border for func in funcs if func.breakpoints[-1] == breakpoints[-1]])
+    return [PolynomialFunction(breakpoints, list(combination.T), left_border=left_border,
+                               right_border=right_border, domain=funcs[0].domain)
+            for combination in np.tensordot(vectors, table, axes=(0, 0))]
+
+
+class LinearTransformation(object):
+    """
+    transformation handle for weight transformations that are given by a matrix. Other than arbitrary handles, these
+    can be composed and folded into gain vectors, see :py:class:`pyinduct.control.LawEvaluator`.
+
+    :param matrix: transformation matrix
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def __call__(self, weights):
+        return np.dot(self.matrix, weights)
+
+
 class TransformationInfo(object):
     """
     wrapper that holds information about transformations
@@ -695,23 +1482,93 @@ class TransformationInfo(object):
                (other.src_lbl, other.dst_lbl, other.src_order, other.dst_order)
 
 
+_transformations = {}
+
+
+def clear_transformation_cache():
+    """
+    remove all cached weight transformations, see :py:func:`get_weight_transformation`
+    """
+    _transformations.clear()
+
+
+def _same_base(first, second):
+    return len(first) == len(second) and all(a is b for a, b in zip(first, second))
+
+
+def _get_cached_transformation(key, info):
+    """
+    return the cached entry for *key* if it has been built for the bases of *info* and all intermediate bases it was
+    resolved with are still registered unchanged
+    """
+    entry = _transformations.get(key, None)
+    if entry is None:
+        return None
+
+    for lbl, base in entry[1].items():
+        if lbl == info.src_lbl:
+            current = info.src_base
+        elif lbl == info.dst_lbl:
+            current = info.dst_base
+        elif is_registered(lbl):
+            current = get_base(lbl, 0)
+        else:
+            return None
+        if not _same_base(base, current):
+            return None
+    return entry
+
+
 def get_weight_transformation(info):
     """
     somehow calculates a handle that will transform weights from src into weights for dst with the given derivative
     orders.
 
+    All transformations are cached. Consecutive linear transformations, e.g. via the assistant systems demanded by
+    the :py:func:`BaseFraction.transformation_hint` of the destination base, are multiplied into one matrix, so the
+    resulting handle costs a single matrix product. Cached transformations are discarded as soon as one of the bases
+    they have been resolved with (including the assistant systems) is registered anew, use
+    :py:func:`clear_transformation_cache` to drop them manually.
+
     :param info: transformation info
     :return: handle
     """
-    # trivial case
+    return _get_weight_transformation(info)[0]
+
+
+def _get_weight_transformation(info):
+    """
+    :py:func:`get_weight_transformation` that also returns the bases the handle depends on
+
+    :param info: transformation info
+    :return: tuple of handle and dict of all bases (by label) that have been used to resolve the handle
+    """
+    key = (info.src_lbl, info.src_order, info.dst_lbl, info.dst_order)
+    entry = _get_cached_transformation(key, info)
+    if entry is not None:
+        return entry
+
+    bases = {info.src_lbl: info.src_base, info.dst_lbl: info.dst_base}
     if info.src_lbl == info.dst_lbl:
+        # trivial case
         mat = calculate_expanded_base_transformation_matrix(info.src_base, None, info.src_order, info.dst_order, True)
+        handle = LinearTransformation(mat)
+    else:
+        handle, dependencies = _resolve_weight_transformation(info)
+        dependencies.update(bases)
+        bases = dependencies
+
+    _transformations[key] = (handle, bases)
+    return handle, bases
 
-        def identity(weights):
-            return np.dot(mat, weights)
 
-        return identity
+def _resolve_weight_transformation(info):
+    """
+    build the transformation handle by following the transformation hints of the destination base
 
+    :param info: transformation info
+    :return: tuple of handle and dict of the bases (by label) of the assistant systems
+    """
     # try to get help from the destination base
     handle, hint = info.dst_base[0].transformation_hint(info, True)
     # if handle is None:
@@ -724,8 +1581,9 @@ def get_weight_transformation(info):
     # check termination criterion
     if hint is None:
         # direct transformation possible
-        return handle
+        return handle, {}
 
+    bases = {}
     kwargs = {}
     new_handle = None
     if hasattr(hint, "extras"):
@@ -735,12 +1593,21 @@ def get_weight_transformation(info):
             new_info.dst_lbl = dep_lbl
             new_info.dst_base = get_base(dep_lbl, 0)
             new_info.dst_order = dep_order
-            dep_handle = get_weight_transformation(new_info)
+            dep_handle, dep_bases = _get_weight_transformation(new_info)
             kwargs[dep_lbl] = dep_handle
+            bases.update(dep_bases)
 
     if hint.src_lbl is not None:
         # transformation to assistant system required
-        new_handle = get_weight_transformation(hint)
+        new_handle, new_bases = _get_weight_transformation(hint)
+        bases.update(new_bases)
+
+    # chains of linear transformations collapse into one
+    if not kwargs and isinstance(handle, LinearTransformation):
+        if new_handle is None:
+            return handle, bases
+        if isinstance(new_handle, LinearTransformation):
+            return LinearTransformation(np.dot(handle.matrix, new_handle.matrix)), bases
 
     def last_handle(weights):
         if new_handle:
@@ -748,7 +1615,7 @@ def get_weight_transformation(info):
         else:
             return handle(weights, **kwargs)
 
-    return last_handle
+    return last_handle, bases
 
 
 def calculate_expanded_base_transformation_matrix(src_base, dst_base, src_order, dst_order, use_eye=False):
@@ -1,39 +1,57 @@
+from abc import ABCMeta, abstractmethod
 import numpy as np
 import scipy.integrate as si
-from scipy.interpolate import interp1d
+from scipy.interpolate import interp1d, CubicSpline, PPoly
 from scipy.optimize import fsolve
+from scipy.sparse import csc_matrix, csr_matrix
+from scipy.sparse.linalg import eigs, eigsh
 from . import utils as ut
 from . import placeholder as ph
-from .core import Function, back_project_from_base
+from .core import Function, ExponentialSumFunction, back_project_from_base, tabulate_base, _support_hull, \
+    _evaluate_vectorized
+from .registry import get_base, register_base
 from .shapefunctions import LagrangeFirstOrder, LagrangeSecondOrder
 from .placeholder import FieldVariable, TestFunction
 from .visualization import EvalData
-import pyqtgraph as pg
 from numbers import Number
-from functools import partial
+from functools import reduce
+from math import factorial
 import warnings
 import copy as cp
-import pyqtgraph as pg
 import collections
 
 
-class AddMulFunction(object):
+class AddMulFunction(Function):
+    """
+    Wrap a callable to combine it with others by ``+`` and ``*`` , e.g. in a matrix product. Since every
+    :py:class:`pyinduct.core.Function` supports these operators, this wrapper is only kept for compatibility.
+    Other than before, the wrapper is a :py:class:`pyinduct.core.Function` on the whole real line, hence *function*
+    is checked on construction the same way: callables that do not return a number when called with a scalar are
+    rejected with a TypeError. Likewise, it can only be multiplied by numbers and functions, other factors like
+    sequences are rejected and multiplying by an array yields an array of functions.
+
+    :param function: callable that returns a number when called with a scalar
+    """
+
     def __init__(self, function):
+        Function.__init__(self, function)
         self.function = function
 
-    def __call__(self, z):
-        return self.function(z)
-
-    def __mul__(self, other):
-        return AddMulFunction(lambda z: self.function(z) * other)
-
-    def __add__(self, other):
-        return AddMulFunction(lambda z: self.function(z) + other(z))
-
 
 class FiniteTransformFunction(Function):
     """
     Provide a transformed function y(z) = T x(z) for a given matrix T and function y(z)
+
+    The function is evaluated vectorized: the evaluation points are split into their sub-interval index and the
+    position within the sub-interval, the needed shifted evaluations of *function* are gathered in one call and the
+    (sparse) rows of *M* are applied to them.
+
+    :param function: function x(z)
+    :param M: transformation matrix of shape (2n, 2n)
+    :param b: position of the in-domain actuation
+    :param l: length of the spatial domain
+    :param scale_func: optional function the shifted evaluations are scaled with
+    :param nested_lambda: deprecated and ignored, the vectorized implementation is always used
     """
 
     def __init__(self, function, M, b, l, scale_func=None, nested_lambda=False):
@@ -44,6 +62,9 @@ class FiniteTransformFunction(Function):
             raise TypeError
         if not all([isinstance(num, (int, float)) for num in [b, l]]):
             raise TypeError
+        if nested_lambda:
+            warnings.warn("nested_lambda is deprecated and ignored, the vectorized implementation is always used.",
+                          DeprecationWarning)
 
         self.function = function
         self.M = M
@@ -58,58 +79,47 @@ class FiniteTransformFunction(Function):
         self.l0 = l / self.n
         self.z_disc = np.array([(i + 1) * self.l0 for i in range(self.n)])
 
-        if not nested_lambda:
-            # iteration mode
-            Function.__init__(self,
-                              self._call_transformed_func,
-                              nonzero=(0, l),
-                              derivative_handles=[])
-        else:
-            # nested lambda mode
-            self.x_func_vec = list()
-
-            for i in range(self.n):
-                self.x_func_vec.append(AddMulFunction(
-                    partial(lambda z, k: self.scale_func(k * self.l0 + z) * self.function(k * self.l0 + z), k=i)))
-            for i in range(self.n):
-                self.x_func_vec.append(AddMulFunction(
-                    partial(lambda z, k: self.scale_func(self.l - k * self.l0 - z) * self.function(
-                        self.l - k * self.l0 - z), k=i)))
-
-            self.y_func_vec = np.dot(self.x_func_vec, np.transpose(M))
-
-            Function.__init__(self,
-                              self._call_transformed_func_vec,
-                              nonzero=(0, l),
-                              derivative_handles=[])
-
-    def _call_transformed_func_vec(self, z):
-        i = int(z / self.l0)
-        zz = z % self.l0
-        if np.isclose(z, self.l0 * i) and not np.isclose(0, zz):
-            zz = 0
-        return self.y_func_vec[i](zz)
+        # column j of M belongs to the evaluation at shift_j + sign_j * zz
+        idx = np.arange(self.n)
+        self._shifts = np.hstack((idx * self.l0, self.l - idx * self.l0))
+        self._signs = np.hstack((np.ones(self.n), -np.ones(self.n)))
+        self._sparse_m = csr_matrix(M)
+
+        Function.__init__(self,
+                          self._call_transformed_func,
+                          nonzero=(0, l),
+                          derivative_handles=[],
+                          vectorial=True)
 
     def _call_transformed_func(self, z):
-        i = int(z / self.l0)
-        if i < 0 or i > self.n * 2 - 1:
+        scalar = np.ndim(z) == 0
+        z = np.atleast_1d(np.asarray(z, dtype=float))
+
+        # sub-interval index and position within
+        i = (z / self.l0).astype(int)
+        if np.any(i < 0) or np.any(i > self.n * 2 - 1):
             raise ValueError
         zz = z % self.l0
-        if np.isclose(z, self.l0 * i) and not np.isclose(0, zz):
-            zz = 0
-        to_return = 0
-        for j in range(self.n * 2):
-            mat_el = self.M[i, j]
-            if mat_el != 0:
-                if j <= self.n - 1:
-                    to_return += mat_el * self.function(j * self.l0 + zz) * self.scale_func(j * self.l0 + zz)
-                elif j >= self.n:
-                    jj = j - self.n
-                    to_return += mat_el * self.function(self.l - jj * self.l0 - zz) * self.scale_func(
-                        self.l - jj * self.l0 - zz)
-                elif j < 0 or j > 2 * self.n - 1:
-                    raise ValueError
-        return to_return
+        zz[np.isclose(z, self.l0 * i) & ~np.isclose(0, zz)] = 0
+
+        # gather the nonzero entries of the needed rows
+        indptr = self._sparse_m.indptr
+        counts = indptr[i + 1] - indptr[i]
+        points = np.repeat(np.arange(z.size), counts)
+        entries = np.arange(points.size) - np.repeat(np.cumsum(counts) - counts, counts) + indptr[i][points]
+        cols = self._sparse_m.indices[entries]
+
+        # evaluate all shifted functions at once
+        args = self._shifts[cols] + self._signs[cols] * zz[points]
+        values = self._sparse_m.data[entries] * _evaluate_vectorized(self.function, args, constant=True) \
+            * _evaluate_vectorized(self.scale_func, args, constant=True)
+
+        res = np.zeros(z.shape, dtype=np.result_type(values, float))
+        np.add.at(res, points, values)
+
+        if scalar:
+            return res[0]
+        return res
 
 
 class TransformedSecondOrderEigenfunction(Function):
@@ -153,8 +163,10 @@ class TransformedSecondOrderEigenfunction(Function):
         state_vect = self._transform_eigenfunction()
         self._transf_eig_func_real, self._transf_d_eig_func_real = state_vect[0:2]
         self._transf_eig_func_imag, self._transf_d_eig_func_imag = state_vect[2:4]
+        self._tables = tabulate_base(domain, state_vect[0:2])
 
-        Function.__init__(self, self._phi, nonzero=(domain[0], domain[-1]), derivative_handles=[self._d_phi])
+        Function.__init__(self, self._phi, nonzero=(domain[0], domain[-1]), derivative_handles=[self._d_phi],
+                          vectorial=True)
 
     def _ff(self, y, z):
         a2, a1, a0 = [self._a2, self._a1, self._a0]
@@ -174,18 +186,20 @@ class TransformedSecondOrderEigenfunction(Function):
         return [eigenfunction[:, 0], eigenfunction[:, 1], eigenfunction[:, 2], eigenfunction[:, 3]]
 
     def _phi(self, z):
-        return np.interp(z, self._domain, self._transf_eig_func_real)
+        return self._tables[0](np.clip(z, self._domain[0], self._domain[-1]))
 
     def _d_phi(self, z):
-        return np.interp(z, self._domain, self._transf_d_eig_func_real)
+        return self._tables[1](np.clip(z, self._domain[0], self._domain[-1]))
 
 
-class SecondOrderRobinEigenfunction(Function):
+class SecondOrderRobinEigenfunction(ExponentialSumFunction):
     def __init__(self, om, param, spatial_domain, phi_0=1):
         self._om = om
         self._param = param
         self.phi_0 = phi_0
-        Function.__init__(self, self._phi, nonzero=spatial_domain, derivative_handles=[self._d_phi, self._dd_phi])
+        ExponentialSumFunction.__init__(self, self._phi, *_robin_exponential_terms(om, param, phi_0),
+                                        nonzero=spatial_domain, derivative_handles=[self._d_phi, self._dd_phi],
+                                        vectorial=True)
 
     def _phi(self, z):
         a2, a1, a0, alpha, beta = self._param
@@ -233,7 +247,7 @@ class SecondOrderRobinEigenfunction(Function):
         return return_real_part(d_phi_i * self.phi_0)
 
 
-class SecondOrderDirichletEigenfunction(Function):
+class SecondOrderDirichletEigenfunction(ExponentialSumFunction):
     def __init__(self, omega, param, spatial_domain, norm_fac=1.):
         self._omega = omega
         self._param = param
@@ -241,7 +255,9 @@ class SecondOrderDirichletEigenfunction(Function):
 
         a2, a1, a0, _, _ = self._param
         self._eta = -a1 / 2. / a2
-        Function.__init__(self, self._phi, nonzero=spatial_domain, derivative_handles=[self._d_phi, self._dd_phi])
+        ExponentialSumFunction.__init__(self, self._phi, *_dirichlet_exponential_terms(omega, param, norm_fac),
+                                        nonzero=spatial_domain, derivative_handles=[self._d_phi, self._dd_phi],
+                                        vectorial=True)
 
     def _phi(self, z):
         eta = self._eta
@@ -263,21 +279,461 @@ class SecondOrderDirichletEigenfunction(Function):
         eta = self._eta
         om = self._omega
 
-        d_phi_i = np.exp(eta * z) * (om * (eta + 1) * np.cos(om * z) + (eta - om ** 2) * np.sin(om * z))
+        d_phi_i = np.exp(eta * z) * (2 * eta * om * np.cos(om * z) + (eta ** 2 - om ** 2) * np.sin(om * z))
 
         return return_real_part(d_phi_i * self.norm_fac)
 
 
+def _robin_exponential_terms(om, param, factor):
+    """
+    coefficients and exponents of the robin eigenfunction as sum of exponentials, see
+    :py:class:`pyinduct.core.ExponentialSumFunction`
+    """
+    a2, a1, a0, alpha, beta = param
+    eta = -a1 / 2. / a2
+    if np.isclose(0, np.abs(om), atol=1e-100):
+        # e^(eta z) (1 + (alpha - eta) z) is no sum of exponentials
+        return None, None
+
+    sin_coefficient = (alpha - eta) / om / 2j
+    return factor * np.array([.5 + sin_coefficient, .5 - sin_coefficient]), np.array([eta + 1j * om, eta - 1j * om])
+
+
+def _dirichlet_exponential_terms(om, param, factor):
+    """
+    coefficients and exponents of the dirichlet eigenfunction as sum of exponentials, see
+    :py:class:`pyinduct.core.ExponentialSumFunction`
+    """
+    a2, a1, a0, _, _ = param
+    eta = -a1 / 2. / a2
+    return factor * np.array([1, -1]) / 2j, np.array([eta + 1j * om, eta - 1j * om])
+
+
+class SecondOrderEigenfunctionFamily(object, metaclass=ABCMeta):
+    """
+    base class for families of eigenfunctions that only differ in their eigenfrequency. Other than creating one
+    instance per eigenfrequency, all members and their first two derivatives are evaluated at once as one broadcasted
+    (N, M) computation for N eigenfrequencies and M points. The result of the last evaluation is cached for each
+    derivative order, so the members (see :py:attr:`functions`) can pick their row without further computations.
+
+    :param eig_frequencies: array of eigenfrequencies :math:`\\omega_1, \\dotsc, \\omega_N` or None, if the
+        members are not given by eigenfrequencies
+    :param param: parameters of the eigenvalue problem
+    :param spatial_domain: domain of the eigenfunctions
+    :param factors: scalar or array of scale factors for the members
+    :param count: number of members, only needed if no eigenfrequencies are given
+    """
+
+    def __init__(self, eig_frequencies, param, spatial_domain, factors=1., count=None):
+        self.eig_frequencies = None if eig_frequencies is None else np.atleast_1d(eig_frequencies)
+        if count is None:
+            count = self.eig_frequencies.size
+        self.param = param
+        self.spatial_domain = spatial_domain
+        self.factors = np.broadcast_to(factors, (count, ))
+        self._cache = {}
+        self.functions = np.array([EigenfunctionFamilyMember(self, idx) for idx in range(count)])
+
+    def __len__(self):
+        return self.functions.size
+
+    def exponential_terms(self, idx, order=0):
+        """
+        representation of a member as sum of exponentials, see :py:class:`pyinduct.core.ExponentialSumFunction`
+
+        :return: tuple of coefficients and exponents or None if no representation is available
+        """
+        return None
+
+    @abstractmethod
+    def evaluate_member(self, idx, z, order=0):
+        """
+        evaluate a single member of the family
+
+        :param idx: index of the member
+        :param z: places to evaluate at
+        :param order: derivative order
+        """
+
+    def evaluate(self, z, order=0):
+        """
+        evaluate all members of the family
+
+        :param z: places to evaluate at
+        :param order: derivative order
+        :return: array of shape (N, M) with one row per member
+        """
+        if order not in (0, 1, 2):
+            raise ValueError("only derivatives up to the second order are available.")
+
+        z = np.array(z, dtype=float, ndmin=1)
+        cached = self._cache.get(order, None)
+        if cached is not None and np.array_equal(cached[0], z):
+            return cached[1]
+
+        values = self._evaluate_family(z, order)
+        values.flags.writeable = False
+        self._cache[order] = (z, values)
+        return values
+
+    @abstractmethod
+    def _evaluate_family(self, z, order):
+        """
+        evaluate all members at the places *z* (1d array)
+        """
+
+    def register(self, label, overwrite=False):
+        """
+        register the members of the family as one base, see :py:func:`pyinduct.registry.register_base`
+        """
+        register_base(label, self.functions, overwrite=overwrite)
+
+
+class EigenfunctionFamilyMember(Function):
+    """
+    member of a :py:class:`SecondOrderEigenfunctionFamily` . Calling the member only computes its own values, whereas
+    :py:func:`evaluation_hint` evaluates the whole family and picks the corresponding row.
+
+    :param family: family the member belongs to
+    :param idx: index of the member
+    :param order: derivative order
+    """
+
+    def __init__(self, family, idx, order=0):
+        self.family = family
+        self.idx = idx
+        self.order = order
+        Function.__init__(self, self._eval, nonzero=family.spatial_domain, vectorial=True)
+
+    def _eval(self, z):
+        return self.family.evaluate_member(self.idx, z, self.order)
+
+    def evaluation_hint(self, values):
+        return self.family.evaluate(values, self.order)[self.idx]
+
+    def exponential_terms(self):
+        return self.family.exponential_terms(self.idx, self.order)
+
+    def derive(self, order=1):
+        if not isinstance(order, int):
+            raise TypeError("only integer allowed as derivation order")
+        if order == 0:
+            return self
+        if order < 0 or self.order + order > 2:
+            raise ValueError("function cannot be differentiated that often.")
+
+        return EigenfunctionFamilyMember(self.family, self.idx, self.order + order)
+
+
+class _ClosedFormEigenfunctionFamily(SecondOrderEigenfunctionFamily):
+    """
+    base class for families whose members are given in closed form, depending only on the eigenfrequency
+    """
+
+    @abstractmethod
+    def _evaluate(self, z, om, order):
+        """
+        evaluate the eigenfunctions (without scale factor) for the given eigenfrequencies, broadcasting *z* and *om*
+
+        :param z: places to evaluate at
+        :param om: eigenfrequencies
+        :param order: derivative order
+        """
+
+    def evaluate_member(self, idx, z, order=0):
+        values = return_real_part(np.asarray(self._evaluate(np.asarray(z), self.eig_frequencies[idx], order)
+                                             * self.factors[idx]))
+        return values[()] if np.ndim(values) == 0 else values
+
+    def _evaluate_family(self, z, order):
+        return return_real_part(self._evaluate(z[np.newaxis, :], self.eig_frequencies[:, np.newaxis], order)
+                                * self.factors[:, np.newaxis])
+
+
+class SecondOrderRobinEigenfunctionFamily(_ClosedFormEigenfunctionFamily):
+    """
+    family of :py:class:`SecondOrderRobinEigenfunction` s, e.g. for the eigenfrequencies from
+    :py:func:`compute_rad_robin_eigenfrequencies`
+
+    :param eig_frequencies: array of eigenfrequencies
+    :param param: [a2, a1, a0, alpha, beta]
+    :param spatial_domain: domain of the eigenfunctions
+    :param phi_0: (array of) scale factor(s)
+    """
+
+    def __init__(self, eig_frequencies, param, spatial_domain, phi_0=1):
+        SecondOrderEigenfunctionFamily.__init__(self, eig_frequencies, param, spatial_domain, phi_0)
+
+    def exponential_terms(self, idx, order=0):
+        coefficients, exponents = _robin_exponential_terms(self.eig_frequencies[idx], self.param, self.factors[idx])
+        if coefficients is None:
+            return None
+        return coefficients * exponents ** order, exponents
+
+    def _evaluate(self, z, om, order):
+        a2, a1, a0, alpha, beta = self.param
+        eta = -a1 / 2. / a2
+
+        # sin(om*z)/om with its limit z for om = 0
+        is_zero = np.isclose(0, np.abs(om), atol=1e-100)
+        sin_term = np.where(is_zero, z, np.sin(om * z) / np.where(is_zero, 1, om))
+        cos_term = np.cos(om * z)
+
+        if order == 0:
+            res = cos_term + (alpha - eta) * sin_term
+        elif order == 1:
+            res = alpha * cos_term + (eta * (alpha - eta) - om ** 2) * sin_term
+        else:
+            res = (eta * (2 * alpha - eta) - om ** 2) * cos_term \
+                  + (eta ** 2 * (alpha - eta) - (eta + alpha) * om ** 2) * sin_term
+
+        return np.exp(eta * z) * res
+
+
+class SecondOrderDirichletEigenfunctionFamily(_ClosedFormEigenfunctionFamily):
+    """
+    family of :py:class:`SecondOrderDirichletEigenfunction` s
+
+    :param eig_frequencies: array of eigenfrequencies
+    :param param: [a2, a1, a0, alpha, beta]
+    :param spatial_domain: domain of the eigenfunctions
+    :param norm_fac: (array of) scale factor(s)
+    """
+
+    def __init__(self, eig_frequencies, param, spatial_domain, norm_fac=1.):
+        SecondOrderEigenfunctionFamily.__init__(self, eig_frequencies, param, spatial_domain, norm_fac)
+
+    def exponential_terms(self, idx, order=0):
+        coefficients, exponents = _dirichlet_exponential_terms(self.eig_frequencies[idx], self.param,
+                                                               self.factors[idx])
+        return coefficients * exponents ** order, exponents
+
+    def _evaluate(self, z, om, order):
+        a2, a1, a0, _, _ = self.param
+        eta = -a1 / 2. / a2
+
+        if order == 0:
+            res = np.sin(om * z)
+        elif order == 1:
+            res = om * np.cos(om * z) + eta * np.sin(om * z)
+        else:
+            res = 2 * eta * om * np.cos(om * z) + (eta ** 2 - om ** 2) * np.sin(om * z)
+
+        return np.exp(eta * z) * res
+
+
+class TransformedSecondOrderEigenfunctionFamily(SecondOrderEigenfunctionFamily):
+    """
+    family of :py:class:`TransformedSecondOrderEigenfunction` s. Instead of one ode solve per eigenvalue, the
+    eigenvalue problems for all :math:`N` eigenvalues are stacked into one :math:`4N` dimensional system, so the
+    coefficients :math:`a_2(z), a_1(z), a_0(z)` are evaluated only once per integration stage. The solution on the
+    shared grid *domain* is interpolated by cubic splines, the second derivative is recovered from the ode itself.
+
+    :param target_eigenvalues: array of (potentially complex) eigenvalues :math:`w_1, \\dotsc, w_N`
+    :param init_state_vects: y(0) = [Re{y(0)}, Re{y'(0)}, Im{y(0)}, Im{y'(0)}], either one for all members or one
+        per member (array of shape (N, 4))
+    :param dgl_coefficients: [a2(z), a1(z), a0(z)] (list of function handles or scalars)
+    :param domain: [z0, ..... , z1] (list of floats), grid of the ode solution
+    """
+
+    def __init__(self, target_eigenvalues, init_state_vects, dgl_coefficients, domain):
+        eig_values = np.atleast_1d(np.asarray(target_eigenvalues, dtype=complex))
+        init_state_vects = np.broadcast_to(np.asarray(init_state_vects, dtype=float), (eig_values.size, 4))
+        if len(dgl_coefficients) != 3:
+            raise TypeError("exactly three coefficients [a2, a1, a0] are needed.")
+        domain = np.asarray(domain, dtype=float)
+        if domain.ndim != 1 or domain.size < 2:
+            raise ValueError("domain has to be a grid with at least two points.")
+
+        self._a2, self._a1, self._a0 = [ut._convert_to_function(coef) for coef in dgl_coefficients]
+        self._eig_val_real = eig_values.real
+        self._eig_val_imag = eig_values.imag
+        self.domain = domain
+
+        # the members are decoupled, hence the jacobian is banded
+        states = si.odeint(self._ff, init_state_vects.ravel(), domain, ml=3, mu=1).reshape(domain.size, -1, 4)
+        self._splines = CubicSpline(domain, states, axis=0, extrapolate=False)
+
+        if np.allclose(eig_values.imag, 0):
+            eig_values = eig_values.real
+        self.eig_values = eig_values
+        SecondOrderEigenfunctionFamily.__init__(self, None, dgl_coefficients, (domain[0], domain[-1]),
+                                                count=eig_values.size)
+
+    def _ff(self, y, z):
+        y = y.reshape(-1, 4)
+        a2, a1, a0 = self._a2(z), self._a1(z), self._a0(z)
+        wr = self._eig_val_real
+        wi = self._eig_val_imag
+
+        d_y = np.empty_like(y)
+        d_y[:, 0] = y[:, 1]
+        d_y[:, 1] = (-(a0 - wr) * y[:, 0] - a1 * y[:, 1] - wi * y[:, 2]) / a2
+        d_y[:, 2] = y[:, 3]
+        d_y[:, 3] = (wi * y[:, 0] - (a0 - wr) * y[:, 2] - a1 * y[:, 3]) / a2
+        return d_y.ravel()
+
+    def _evaluate_states(self, z, idx, order):
+        """
+        real part of the (derived) members *idx* at the places *z*, result has the shape (len(idx), z.size)
+
+        Like :py:class:`TransformedSecondOrderEigenfunction` , the members keep their boundary values outside of the
+        grid instead of extrapolating the splines.
+        """
+        z = np.clip(z, self.domain[0], self.domain[-1])
+        states = np.swapaxes(self._splines(z)[:, idx], 0, 1)
+        if order < 2:
+            return states[..., order]
+
+        # recover the second derivative from the ode
+        a2, a1, a0 = [_evaluate_vectorized(coef, z, dtype=float, constant=True)
+                      for coef in (self._a2, self._a1, self._a0)]
+        wr = self._eig_val_real[idx][..., np.newaxis]
+        wi = self._eig_val_imag[idx][..., np.newaxis]
+        return (-(a0 - wr) * states[..., 0] - a1 * states[..., 1] - wi * states[..., 2]) / a2
+
+    def _evaluate_family(self, z, order):
+        return self._evaluate_states(z, np.arange(len(self)), order) * self.factors[:, np.newaxis]
+
+    def evaluate_member(self, idx, z, order=0):
+        z = np.asarray(z, dtype=float)
+        values = self._evaluate_states(np.atleast_1d(z), np.atleast_1d(idx), order) * self.factors[idx]
+        return values.reshape(z.shape)[()] if z.ndim == 0 else values.reshape(z.shape)
+
+
+class FemEigenfunctionFamily(SecondOrderEigenfunctionFamily):
+    """
+    numerical approximation of the eigenfunctions of the spatial operator of a weak formulation, e.g. from
+    :py:func:`pyinduct.utils.get_parabolic_robin_weak_form` . Other than the closed form families, no characteristic
+    equation and no root search is needed, hence arbitrary (spatially varying) coefficients can be handled.
+
+    The weak formulation :math:`M \\dot{x}(t) + K x(t) + \\dotsb = 0` has to be given in terms of a (fine) finite
+    element base, inputs are ignored. The eigenvalues :math:`\\lambda_i` closest to *sigma* of the generalized
+    eigenvalue problem :math:`-K v_i = \\lambda_i M v_i` are computed in shift-invert mode with
+    :py:func:`scipy.sparse.linalg.eigsh` ( :py:func:`scipy.sparse.linalg.eigs` if :math:`K` is not symmetric).
+    The members are sorted by descending eigenvalues and normalized with respect to the :math:`L^2` norm. The
+    eigenvectors are multiplied into the finite element base only once, see :py:func:`_tabulate_modes` , hence all
+    members are evaluated by one vectorized call.
+
+    :param weak_form: :py:class:`pyinduct.simulation.WeakFormulation` of first temporal order
+    :param n_modes: number of eigenfunctions
+    :param sigma: shift, the eigenvalues closest to sigma are computed
+    """
+
+    def __init__(self, weak_form, n_modes, sigma=0.):
+        from .simulation import parse_weak_formulation
+
+        cf = parse_weak_formulation(weak_form)
+        terms = cf.get_terms()["E"]
+        if 1 not in terms or set(terms) - {0, 1} or any([list(group) != [1] for group in terms.values()]):
+            raise ValueError("only linear weak formulations of first temporal order are supported.")
+
+        self.base_label = cf.weights
+        mass = csc_matrix(terms[1][1])
+        stiffness = csc_matrix(terms.get(0, {1: np.zeros(mass.shape)})[1])
+        if not 0 < n_modes < mass.shape[0]:
+            raise ValueError("the number of modes has to be smaller than the dimension of the fem base.")
+
+        if abs(stiffness - stiffness.T).max() <= 1e-12 * max(abs(stiffness).max(), 1):
+            eig_values, eig_vectors = eigsh(-stiffness, n_modes, mass, sigma=sigma)
+        else:
+            eig_values, eig_vectors = eigs(-stiffness, n_modes, mass, sigma=sigma)
+            eig_values = return_real_part(eig_values)
+            # make the eigenvectors real
+            eig_vectors = return_real_part(eig_vectors / eig_vectors[np.abs(eig_vectors).argmax(axis=0),
+                                                                     np.arange(n_modes)])
+
+        order = np.argsort(eig_values)[::-1]
+        eig_vectors = eig_vectors[:, order]
+        norms = np.sqrt(np.einsum("ij,ij->j", eig_vectors, mass.dot(eig_vectors)))
+        signs = np.sign(eig_vectors[np.abs(eig_vectors).argmax(axis=0), np.arange(n_modes)])
+        self.eig_vectors = eig_vectors * signs / norms
+
+        base = get_base(self.base_label, 0)
+        spatial_domain = _support_hull(base)
+        modes = _tabulate_modes(base, self.eig_vectors)
+        self._modes = [modes.derivative(der_order) for der_order in range(3)]
+        self.eig_values = eig_values[order]
+        SecondOrderEigenfunctionFamily.__init__(self, None, None, spatial_domain, count=n_modes)
+
+    def _evaluate_modes(self, z, order):
+        """
+        values of all members at the places *z* , the members are given by the last axis. Like for the finite
+        element base, the mean of the left and right limit is returned at inner breakpoints.
+        """
+        modes = self._modes[order]
+        values = modes(z)
+
+        at_break = np.isin(z, modes.x[1:-1])
+        if np.any(at_break):
+            # the left limits are given by the end of the previous piece
+            idx = np.searchsorted(modes.x, z[at_break]) - 1
+            widths = modes.x[idx + 1] - modes.x[idx]
+            powers = widths[:, np.newaxis] ** np.arange(modes.c.shape[0] - 1, -1, -1)
+            left_values = np.einsum("kin,ik->in", modes.c[:, idx], powers)
+            values[at_break] = (values[at_break] + left_values) / 2
+
+        inside = (z >= modes.x[0]) & (z <= modes.x[-1])
+        return np.where(inside[..., np.newaxis], values, 0)
+
+    def _evaluate_family(self, z, order):
+        return self._evaluate_modes(z, order).T
+
+    def evaluate_member(self, idx, z, order=0):
+        values = self._evaluate_modes(np.asarray(z, dtype=float), order)[..., idx]
+        return values[()] if np.ndim(values) == 0 else values
+
+
+def _tabulate_modes(base, vectors, refinement=8):
+    """
+    linear combinations of the members of *base* , given by the columns of *vectors* , as one
+    :py:class:`scipy.interpolate.PPoly` whose coefficients hold the combinations in their last axis.
+
+    If all members are piecewise polynomials (e.g. lagrangian shape functions), they are expanded on their merged
+    breakpoints and the combinations are exact. Otherwise, the members are sampled on *refinement* + 1 points of each
+    cell between their nonzero borders and the combinations are interpolated by one cubic spline per cell.
+
+    :param base: array of :py:class:`pyinduct.core.Function` s
+    :param vectors: array of shape (len(base), n) with the weights of the n combinations
+    :param refinement: number of samples per cell, if the base is sampled
+    :return: :py:class:`scipy.interpolate.PPoly`
+    """
+    polys = [func.piecewise_polynomial() if hasattr(func, "piecewise_polynomial") else None for func in base]
+    if any([poly is None for poly in polys]):
+        borders = np.unique([border for func in base for area in func.nonzero for border in area])
+        cells = [np.linspace(start, end, refinement + 1) for start, end in zip(borders[:-1], borders[1:])]
+        grid = np.hstack(cells)
+        values = np.dot(np.array([func(grid) for func in base]).T, vectors)
+
+        # the members may have kinks at their borders, hence the cells are interpolated separately
+        splines = [CubicSpline(cell, cell_values)
+                   for cell, cell_values in zip(cells, np.split(values, len(cells)))]
+        return PPoly.construct_fast(np.concatenate([spline.c for spline in splines], axis=1),
+                                    np.hstack([borders[0]] + [cell[1:] for cell in cells]), extrapolate=False)
+
+    breakpoints = reduce(np.union1d, [poly.x for poly in polys])
+    degree = max([poly.c.shape[0] for poly in polys]) - 1
+    starts = breakpoints[:-1]
+
+    # taylor coefficients of each member at the left end of every merged piece, zero outside of its support
+    coefficients = np.zeros((len(base), degree + 1, starts.size))
+    for idx, poly in enumerate(polys):
+        inside = (starts >= poly.x[0]) & (starts < poly.x[-1])
+        for der_order in range(degree + 1):
+            coefficients[idx, degree - der_order, inside] = poly(starts[inside], der_order) / factorial(der_order)
+
+    return PPoly.construct_fast(np.tensordot(coefficients, vectors, axes=(0, 0)), breakpoints, extrapolate=False)
+
+
 def compute_rad_robin_eigenfrequencies(param, l, n_roots=10, show_plot=False):
     a2, a1, a0, alpha, beta = param
     eta = -a1 / 2. / a2
 
     def characteristic_equation(om):
-        if np.round(om, 200) != 0.:
-            zero = (alpha + beta) * np.cos(om * l) + ((eta + beta) * (alpha - eta) / om - om) * np.sin(om * l)
-        else:
-            zero = (alpha + beta) * np.cos(om * l) + (eta + beta) * (alpha - eta) * l - om * np.sin(om * l)
-        return zero
+        # sin(om*l)/om with its limit l for om = 0
+        is_zero = np.round(om, 200) == 0.
+        sin_term = np.where(is_zero, l, np.sin(om * l) / np.where(is_zero, 1., om))
+        return (alpha + beta) * np.cos(om * l) + (eta + beta) * (alpha - eta) * sin_term - om * np.sin(om * l)
 
     def complex_characteristic_equation(om):
         if np.round(om, 200) != 0.:
@@ -290,7 +746,7 @@ def compute_rad_robin_eigenfrequencies(param, l, n_roots=10, show_plot=False):
     om_end = 3 * n_roots * np.pi / l
     start_values = np.arange(0, om_end, .1)
     om = ut.find_roots(characteristic_equation, 2 * n_roots, start_values, rtol=int(np.log10(l) - 6),
-                       show_plot=show_plot).tolist()
+                       show_plot=show_plot, bracket=True).tolist()
 
     # delete all around om = 0
     om.reverse()
@@ -324,25 +780,32 @@ def compute_rad_robin_eigenfrequencies(param, l, n_roots=10, show_plot=False):
 def return_real_part(to_return):
     """
     Check if the imaginary part of to_return vanishes
-    and return the real part
+    and return the real part. Arrays of any dimension keep their shape, whereas single numbers and
+    lists with one entry are returned as scalar.
     :param to_return:
     :return:
     """
     if not isinstance(to_return, (Number, list, np.ndarray)):
         raise TypeError
-    if isinstance(to_return, (list, np.ndarray)):
+    if isinstance(to_return, np.ndarray):
+        if not np.issubdtype(to_return.dtype, np.number):
+            raise TypeError
+    elif isinstance(to_return, list):
         if not all([isinstance(num, Number) for num in to_return]):
             raise TypeError
 
-    maybe_real = np.atleast_1d(np.real_if_close(to_return))
+    maybe_real = np.real_if_close(to_return)
 
-    if maybe_real.dtype == 'complex':
+    if np.iscomplexobj(maybe_real):
         raise ValueError("Something goes wrong, imaginary part does not vanish")
-    else:
-        if maybe_real.shape == (1,):
-            maybe_real = maybe_real[0]
+    if isinstance(to_return, np.ndarray) and to_return.ndim > 0:
         return maybe_real
 
+    maybe_real = np.atleast_1d(maybe_real)
+    if maybe_real.shape == (1,):
+        maybe_real = maybe_real[0]
+    return maybe_real
+
 
 def get_adjoint_rad_evp_param(param):
     """
@@ -40,13 +40,24 @@ def register_base(label, functions, overwrite=False):
     while True:
         try:
             derivatives[n] = np.array([func.derive(n) for func in funcs])
-            n += 1
         except ValueError:
             break
 
+        # constant expressions can be derived infinitely often, stop once all derivatives vanish
+        if all(_vanishes(func) for func in derivatives[n]):
+            break
+        n += 1
+
     _registry[label] = derivatives
 
 
+def _vanishes(func):
+    """
+    check whether func is an expression that is constantly zero, like the derivatives of constant expressions
+    """
+    return getattr(func, "kind", None) == "sum" and not func.operands and func.constant == 0
+
+
 def deregister_base(label):
     """
     removes a set of initial functions from the packages registry
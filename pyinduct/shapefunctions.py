@@ -1,6 +1,8 @@
 import numpy as np
 
-from .core import Function
+from numpy.polynomial import Polynomial
+
+from .core import Function, PolynomialFunction
 from .simulation import Domain
 
 """
@@ -9,7 +11,7 @@ for curing can be found here.
 """
 
 
-class LagrangeFirstOrder(Function):
+class LagrangeFirstOrder(PolynomialFunction):
     """
     Lagrangian shape functions of order 1
 
@@ -22,54 +24,19 @@ class LagrangeFirstOrder(Function):
             raise ValueError("Input data is nonsense, see Definition.")
 
         if kwargs.get("half", None) is None:
-            args1 = kwargs.copy()
-            args1.update({"right_border": False})
-            rise_fncs = self._function_factory(start, start, top, **args1)
-            args2 = kwargs.copy()
-            args2.update({"left_border": False})
-            fall_fncs = self._function_factory(top, end, end, **args2)
-
-            def _lag1st_factory(der):
-                def _lag1st_complete(z):
-                    if z == top:
-                        return .5*(rise_fncs[der](z) + fall_fncs[der](z))
-                    else:
-                        return rise_fncs[der](z) + fall_fncs[der](z)
-                return _lag1st_complete
-            funcs = [_lag1st_factory(derivative) for derivative in [0, 1]]
-        else:
-            funcs = self._function_factory(start, top, end, **kwargs)
-
-        Function.__init__(self, funcs[0], nonzero=(start, end), derivative_handles=funcs[1:])
-
-    @staticmethod
-    def _function_factory(start, mid, end, **kwargs):
-
-        if start == mid:
-            m = -1 / (start - end)
-            n = -m*start
-        elif mid == end:
-            m = 1 / (start - end)
-            n = 1 - m*start
+            breakpoints = [start, top, end]
+            pieces = [Polynomial.fromroots([start]) / (top - start), Polynomial.fromroots([end]) / (top - end)]
+        elif start == top:
+            breakpoints = [start, end]
+            pieces = [Polynomial.fromroots([start]) / (end - start)]
+        elif top == end:
+            breakpoints = [start, end]
+            pieces = [Polynomial.fromroots([end]) / (start - end)]
         else:
             raise ValueError
 
-        def _lag1st_half(z):
-            if start <= z <= end:
-                return m*z + n
-            else:
-                return 0
-
-        def _lag1st_half_dz(z):
-            if z == start and not kwargs.get("left_border", False) or \
-                        z == end and not kwargs.get("right_border", False):
-                return .5*m
-            if start <= z <= end:
-                return m
-            else:
-                return 0
-
-        return [_lag1st_half, _lag1st_half_dz]
+        PolynomialFunction.__init__(self, breakpoints, pieces, left_border=kwargs.get("left_border", False),
+                                    right_border=kwargs.get("right_border", False))
 
     @staticmethod
     def cure_hint(domain):
@@ -94,7 +61,7 @@ class LagrangeFirstOrder(Function):
         return domain, funcs
 
 
-class LagrangeSecondOrder(Function):
+class LagrangeSecondOrder(PolynomialFunction):
     # TODO generate svg of 2nd of Lag2nd and remove ascii art from docstring
     """
     Implementation of an lagrangian initial function of order 2::
@@ -120,94 +87,30 @@ class LagrangeSecondOrder(Function):
         assert(start <= mid <= end)
         if kwargs["curvature"] == "concave" and "half" not in kwargs:
             # interior special case
-            args1 = kwargs.copy()
-            args1.update({"right_border": False, "half": "right"})
-            func1 = self._function_factory(start, start + (mid-start)/2, mid, **args1)
-            args2 = kwargs.copy()
-            args2.update({"left_border": False, "half": "left"})
-            func2 = self._function_factory(mid, mid + (end-mid)/2, end, **args2)
-
-            def composed_func(z):
-                if start <= z <= mid:
-                    return func1[0](z)
-                elif mid < z <= end:
-                    return func2[0](z)
-                else:
-                    return 0
-
-            def composed_func_dz(z):
-                if z == mid:
-                    return 0
-                elif start <= z < mid:
-                    return func1[1](z)
-                elif mid < z <= end:
-                    return func2[1](z)
-                else:
-                    return 0
-
-            def composed_func_ddz(z):
-                if start <= z < mid:
-                    return func1[2](z)
-                elif z == mid:
-                    return func1[2](z) + func2[2](z)
-                elif mid <= z <= end:
-                    return func2[2](z)
-                else:
-                    return 0
-
-            funcs = (composed_func, composed_func_dz, composed_func_ddz)
+            breakpoints = [start, mid, end]
+            pieces = [self._polynomial_factory(start, start + (mid-start)/2, mid, curvature="concave", half="right"),
+                      self._polynomial_factory(mid, mid + (end-mid)/2, end, curvature="concave", half="left")]
         else:
-            funcs = self._function_factory(start, mid, end, **kwargs)
+            breakpoints = [start, end]
+            pieces = [self._polynomial_factory(start, mid, end, **kwargs)]
 
-        Function.__init__(self, funcs[0],
-                          nonzero=(start, end),
-                          derivative_handles=funcs[1:])
+        PolynomialFunction.__init__(self, breakpoints, pieces, left_border=kwargs.get("left_border", False),
+                                    right_border=kwargs.get("right_border", False))
 
     @staticmethod
-    def _function_factory(start, mid, end, **kwargs):
+    def _polynomial_factory(start, mid, end, **kwargs):
         if kwargs["curvature"] == "convex":
-            p = -(start+end)
-            q = start*end
-            s = 1/(mid**2 + p*mid + q)
-
+            roots, top = (start, end), mid
         elif kwargs["curvature"] == "concave":
             if kwargs["half"] == "left":
-                p = -(mid+end)
-                q = mid*end
-                s = 1/(start**2 + p*start + q)
+                roots, top = (mid, end), start
             elif kwargs["half"] == "right":
-                p = -(start+mid)
-                q = start*mid
-                s = 1/(end**2 + p*end + q)
+                roots, top = (start, mid), end
         else:
             raise ValueError
 
-        def lag2nd(z):
-            if start <= z <= end:
-                return s*(z**2 + p*z + q)
-            else:
-                return 0
-
-        def lag2nd_dz(z):
-            if z == start and not kwargs.get("left_border", False) or \
-                        z == end and not kwargs.get("right_border", False):
-                return .5*s*(2*z + p)
-            if start <= z <= end:
-                return s*(2*z + p)
-            else:
-                return 0
-
-        def lag2nd_ddz(z):
-            # if z == start or z == end:
-            if z == start and not kwargs.get("left_border", False) or \
-                        z == end and not kwargs.get("right_border", False):
-                return s
-            if start <= z <= end:
-                return s*2
-            else:
-                return 0
-
-        return lag2nd, lag2nd_dz, lag2nd_ddz
+        poly = Polynomial.fromroots(roots)
+        return poly / poly(top)
 
     @staticmethod
     def cure_hint(domain):
@@ -2,12 +2,17 @@
 
 from abc import ABCMeta, abstractmethod
 from collections import Iterable
+import os
+import pickle
+import time
 import warnings
 import numpy as np
 from itertools import chain
 from scipy.linalg import block_diag
 from scipy.interpolate import interp1d
 from scipy.integrate import ode
+from scipy.sparse import csc_matrix, csr_matrix, identity, issparse, hstack as sparse_hstack
+from scipy.sparse.linalg import splu
 
 from .registry import get_base, is_registered
 from .core import (Function, integrate_function, calculate_scalar_product_matrix,
@@ -69,32 +74,150 @@ class Domain(object):
         return self._limits
 
 
+class _GrowingArray(object):
+    """
+    array with amortized constant time appends along its first axis
+
+    :param capacity: initial capacity
+    """
+
+    def __init__(self, capacity=64):
+        self._capacity = capacity
+        self._data = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def data(self):
+        """
+        view on the stored entries
+        """
+        if self._data is None:
+            return np.empty((0, ))
+        return self._data[:self._size]
+
+    def append(self, value):
+        value = np.asarray(value)
+        if self._data is None:
+            self._data = np.empty((self._capacity, ) + value.shape, dtype=value.dtype)
+        elif value.shape != self._data.shape[1:]:
+            raise ValueError("shape {} of new entry does not match the shape {} of the stored entries."
+                             "".format(value.shape, self._data.shape[1:]))
+
+        if self._size == self._data.shape[0] or not np.can_cast(value.dtype, self._data.dtype, "same_kind"):
+            data = np.empty((2 * self._data.shape[0], ) + self._data.shape[1:],
+                            dtype=np.result_type(self._data, value))
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+
 class SimulationInput(object, metaclass=ABCMeta):
     """
     base class for all objects that want to act as an input for the time-step simulation.
 
     The calculated values for each time-step are stored in internal memory and can be accessed by
     py:func:`get_results` . After the simulation is finished.
+
+    Since the integrator evaluates the input several times per output step, recording every call can use a lot of
+    memory on long simulations. Therefore, the recording can be limited to the output steps of the simulation
+    (which are signalled by the keyword argument ``output_step=True``) and every *decimation* th record can be kept.
+
+    If a *sample_time* is given, the input works like a sampled-data system: the output is only calculated at the
+    sample instants :math:`kT` (which are signalled by the keyword argument ``sample=True``) and held in between.
+    The simulator restarts the integrator at every sample instant, see :py:func:`get_sample_times` . Calls in
+    between are not recorded, except for output steps in the record mode ``"steps"`` .
+
+    :param name: name of the input
+    :param record: ``"all"`` to record every call or ``"steps"`` to record the output steps only
+    :param decimation: keep only every *decimation* th record
+    :param sample_time: sample time :math:`T` of the zero-order hold, the input is continuous if omitted
     """
 
-    def __init__(self, name=""):
-        self._time_storage = []
-        self._value_storage = {}
+    def __init__(self, name="", record="all", decimation=1, sample_time=None):
+        if record not in ("all", "steps"):
+            raise ValueError("unknown record mode '{}'".format(record))
+        if decimation < 1:
+            raise ValueError("decimation has to be a positive integer.")
+        if sample_time is not None and sample_time <= 0:
+            raise ValueError("sample time has to be positive.")
+
         self.name = name
+        self.record = record
+        self.decimation = int(decimation)
+        self.sample_time = sample_time
+        self._record_count = 0
+        self._time_storage = _GrowingArray()
+        self._value_storage = {}
+        self._held = None
+        self._last_sample = None
 
     def __call__(self, **kwargs):
         """
         handle that is used by the simulator to retrieve input.
         """
-        out = self._calc_output(**kwargs)
-        self._time_storage.append(kwargs["time"])
-        for key, value in out.items():
-            entries = self._value_storage.get(key, [])
-            entries.append(value)
-            self._value_storage[key] = entries
+        if self.sample_time is None or np.ndim(kwargs["time"]) != 0:
+            out = self._calc_output(**kwargs)
+        elif self._sample_due(kwargs["time"], kwargs.get("sample", False)):
+            out = self._calc_output(**kwargs)
+            self._held = out
+            self._last_sample = kwargs["time"]
+        else:
+            out = self._held
+            if not kwargs.get("output_step", False):
+                return out["output"]
+
+        if self.record == "all" or kwargs.get("output_step", False):
+            if np.ndim(kwargs["time"]) == 0:
+                self._record_count += 1
+                if (self._record_count - 1) % self.decimation == 0:
+                    self._store(kwargs["time"], out)
 
         return out["output"]
 
+    @property
+    def records_steps(self):
+        """
+        whether this input has to be called with ``output_step=True`` at the output steps of the simulation
+        """
+        return self.record == "steps"
+
+    def _sample_due(self, t, sample):
+        if self._held is None or t < self._last_sample:
+            # first call or a new simulation run
+            return True
+        if not sample:
+            return False
+        return t >= (np.round(self._last_sample / self.sample_time) + 1 - 1e-9) * self.sample_time
+
+    def get_sample_times(self, start, end):
+        """
+        sample instants :math:`kT` of this input in the interval (*start*, *end*]
+
+        :param start: start of the interval
+        :param end: end of the interval
+        :return: 1d ndarray of sample instants, empty for continuous inputs
+        """
+        if self.sample_time is None:
+            return np.empty((0, ))
+
+        first = np.floor(start / self.sample_time + 1e-9) + 1
+        last = np.floor(end / self.sample_time + 1e-9)
+        return np.arange(first, last + 1) * self.sample_time
+
+    def _store(self, t, out):
+        self._time_storage.append(t)
+        for key, value in out.items():
+            self._value_storage.setdefault(key, _GrowingArray()).append(value)
+
     @abstractmethod
     def _calc_output(self, **kwargs):
         """
@@ -104,6 +227,7 @@ class SimulationInput(object, metaclass=ABCMeta):
             -"time": the current simulation time
             -"weights": the current weight vector
             -"weight_lbl": the label of the weights used
+            -"output_step": (optional) flag that is set if the call belongs to an output step of the simulation
         :returns: dict with mandatory key ``output``
         """
         return dict(output=0)
@@ -119,14 +243,69 @@ class SimulationInput(object, metaclass=ABCMeta):
             see :func:`scipy.interpolate.interp1d` for all possibilities
         :param as_eval_data: return results as EvalData object for straightforward display
         """
-        func = interp1d(np.array(self._time_storage), np.array(self._value_storage[result_key]),
-                        kind=interpolation, assume_sorted=True, axis=0)
-        values = func(time_steps)
+        times = self._time_storage.data
+        if times.size == 0:
+            raise ValueError("no values have been recorded, check the record mode and the decimation.")
+        values = self._value_storage[result_key].data
+
+        # adaptive integrators evaluate the input in non-monotonic order
+        if np.any(np.diff(times) < 0):
+            order = np.argsort(times, kind="mergesort")
+            times = times[order]
+            values = values[order]
+
+        steps = np.asarray(time_steps[:] if isinstance(time_steps, Domain) else time_steps)
+        if np.any(steps < times[0]) or np.any(steps > times[-1]):
+            raise ValueError("demanded time steps are not covered by the storage.")
+
+        if times.size == 1:
+            # a single record can only be demanded at its own time
+            results = values[np.zeros(steps.shape, dtype=int)]
+        elif interpolation == "nearest":
+            idx = np.clip(np.searchsorted(times, steps), 1, times.size - 1)
+            idx -= steps - times[idx - 1] <= times[idx] - steps
+            results = values[idx]
+        elif interpolation == "linear":
+            idx = np.clip(np.searchsorted(times, steps), 1, times.size - 1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frac = np.nan_to_num((steps - times[idx - 1]) / (times[idx] - times[idx - 1]))
+            frac = frac.reshape(frac.shape + (1, ) * (values.ndim - 1))
+            results = (1 - frac) * values[idx - 1] + frac * values[idx]
+        else:
+            # repeated evaluations at the same time would break the spline interpolation
+            times, idx = np.unique(times, return_index=True)
+            func = interp1d(times, values[idx], kind=interpolation, assume_sorted=True, axis=0)
+            results = func(steps)
 
         if as_eval_data:
-            return EvalData([time_steps], values, name=".".join([self.name, result_key]))
+            return EvalData([time_steps], results, name=".".join([self.name, result_key]))
+
+        return results
 
-        return values
+    def _get_storage(self, until=None):
+        """
+        :param until: only the records up to this time are returned, e.g. to drop the evaluations of an adaptive
+            integrator beyond its last accepted step
+        :return: the recorded values, see :py:class:`Checkpoint`
+        """
+        keep = slice(None) if until is None else self._time_storage.data <= until
+        return dict(count=self._record_count,
+                    time=self._time_storage.data[keep],
+                    values={key: value.data[keep] for key, value in self._value_storage.items()},
+                    sample=(self._held, self._last_sample))
+
+    def _set_storage(self, storage):
+        """
+        restore the recorded values from *storage*, see :py:func:`_get_storage`
+        """
+        self._record_count = storage["count"]
+        self._held, self._last_sample = storage.get("sample", (None, None))
+        self._time_storage = _GrowingArray()
+        self._time_storage.extend(storage["time"])
+        self._value_storage = {}
+        for key, values in storage["values"].items():
+            self._value_storage[key] = _GrowingArray()
+            self._value_storage[key].extend(values)
 
 
 class EmptyInput(SimulationInput):
@@ -135,7 +314,7 @@ class EmptyInput(SimulationInput):
         self.dim = dim
 
     def _calc_output(self, **kwargs):
-        return np.zeros((self.dim, ))
+        return dict(output=np.zeros((self.dim, )))
 
 
 class SimulationInputSum(SimulationInput):
@@ -143,14 +322,34 @@ class SimulationInputSum(SimulationInput):
     helper that represents a signal mixer
     """
 
-    def __init__(self, inputs):
-        SimulationInput.__init__(self)
+    def __init__(self, inputs, record="all", decimation=1):
+        SimulationInput.__init__(self, record=record, decimation=decimation)
         self.inputs = inputs
 
+    @property
+    def records_steps(self):
+        return self.record == "steps" or any([getattr(handle, "records_steps", False) for handle in self.inputs])
+
+    def get_sample_times(self, start, end):
+        times = [handle.get_sample_times(start, end) for handle in self.inputs if isinstance(handle, SimulationInput)]
+        return np.unique(np.hstack([np.empty((0, ))] + times))
+
     def _calc_output(self, **kwargs):
         outs = np.array([handle(**kwargs) for handle in self.inputs])
         return dict(output=np.sum(outs, axis=0))
 
+    def _get_storage(self, until=None):
+        storage = SimulationInput._get_storage(self, until)
+        storage["inputs"] = [handle._get_storage(until) if isinstance(handle, SimulationInput) else None
+                             for handle in self.inputs]
+        return storage
+
+    def _set_storage(self, storage):
+        SimulationInput._set_storage(self, storage)
+        for handle, _storage in zip(self.inputs, storage["inputs"]):
+            if _storage is not None:
+                handle._set_storage(_storage)
+
 
 class WeakFormulation(object):
     """
@@ -209,17 +408,19 @@ class StateSpace(object):
         else:
             self.B = b_matrices
         if self.B is None:
-            self.B = {1: np.zeros((self.A[1].shape[0], ))}
+            self.B = {1: np.zeros((self.A[1].shape[0], 1))}
+        # vectorial input matrices are treated as column
+        input_dim = self.B[1].shape[1] if len(self.B[1].shape) == 2 else 1
 
         if self.f is None:
             self.f = np.zeros((self.A[1].shape[0], ))
         if self.C is None:
             self.C = np.zeros((1, self.A[1].shape[1]))
         if self.D is None:
-            self.D = np.zeros((1, np.atleast_2d(self.B[1]).T.shape[1]))
+            self.D = np.zeros((1, input_dim))
 
         if input_handle is None:
-            self.input = EmptyInput(self.B[1].shape[0])
+            self.input = EmptyInput(input_dim)
         else:
             self.input = input_handle
         if not callable(self.input):
@@ -699,7 +900,232 @@ def _compute_product_of_scalars(scalars):
     return res
 
 
-def simulate_state_space(state_space, initial_state, temp_domain, settings=None):
+class FixedStepIntegrator(object):
+    """
+    fixed step integrator for systems given in state space form, that mimics the interface of
+    :py:class:`scipy.integrate.ode` .
+
+    The linear part :math:`A_1q` is treated implicitly, whereas the input terms and, in case of the ``imex`` method,
+    all other powers of the weights are treated explicitly. Therefore the iteration matrix
+    :math:`(I - \\theta h A_1)` only has to be factorized once (sparse LU) per step size and is reused for every step.
+
+    Available methods are:
+
+        - ``implicit_euler``: :math:`\\theta = 1` , the explicit terms are evaluated at the start of the step. This
+          is the same update as ``imex`` , but nonlinear systems are rejected.
+        - ``crank_nicolson``: :math:`\\theta = 1/2` , the explicit terms are averaged over both ends of the step,
+          where the weights at the end are predicted by a step with the start values. Thereby the method stays of
+          second order for time varying inputs and feedback, at the cost of a second solve per step.
+        - ``imex``: implicit euler for :math:`A_1q` and explicit euler for all other terms
+
+    :param state_space: :py:class:`StateSpace` to integrate
+    :param method: name of the method to use
+    :param step: desired step size, if omitted every call of :py:func:`integrate` performs exactly one step
+    :param input_handle: callable that replaces the input of the state space system
+    """
+    methods = {"implicit_euler": 1, "crank_nicolson": .5, "imex": 1}
+
+    def __init__(self, state_space, method="crank_nicolson", step=None, input_handle=None):
+        if method not in self.methods:
+            raise ValueError("unknown method '{}', choose one of {}".format(method, list(self.methods.keys())))
+        if method != "imex" and any([p != 1 for p in state_space.A]):
+            raise ValueError("method '{}' can only handle linear systems, use 'imex' instead.".format(method))
+
+        self._ss = state_space
+        self._explicit_terms = _StateSpaceRhs(state_space, input_handle, explicit_only=True)
+        self._theta = self.methods[method]
+        self._step = step
+        self._a_mat = csc_matrix(state_space.A.get(1, np.zeros_like(next(iter(state_space.A.values())))))
+        self._identity = identity(self._a_mat.shape[0], dtype=self._a_mat.dtype, format="csc")
+        self._factorizations = {}
+        self.t = None
+        self.y = None
+
+    def set_initial_value(self, y, t=0.):
+        self.y = np.array(y).flatten()
+        self.y = self.y.astype(np.result_type(self.y, self._a_mat.dtype, float))
+        self.t = t
+        return self
+
+    def successful(self):
+        return True
+
+    def _get_solver(self, h):
+        key = np.round(h, 12)
+        if key not in self._factorizations:
+            self._factorizations[key] = splu(self._identity - self._theta * h * self._a_mat).solve
+        return self._factorizations[key]
+
+    def integrate(self, t):
+        """
+        integrate from the current time to *t*
+
+        :param t: target time
+        :return: weights at *t*
+        """
+        if self._step is None:
+            n_steps = 1
+        else:
+            n_steps = max(1, int(np.round((t - self.t) / self._step)))
+        h = (t - self.t) / n_steps
+        solve = self._get_solver(h)
+
+        t0 = self.t
+        for idx in range(n_steps):
+            t_k = t0 + idx * h
+            explicit_terms = np.array(self._explicit_terms(t_k, self.y))
+            if self._theta == 1:
+                self.y = solve(self.y + h * explicit_terms)
+                continue
+
+            rhs = self.y + (1 - self._theta) * h * self._a_mat.dot(self.y)
+            prediction = solve(rhs + h * explicit_terms)
+            explicit_terms *= 1 - self._theta
+            explicit_terms += self._theta * self._explicit_terms(t_k + h, prediction)
+            self.y = solve(rhs + h * explicit_terms)
+
+        self.t = t
+        return self.y
+
+
+class _StateSpaceRhs(object):
+    """
+    compiled right hand side of a system given in state space form.
+
+    All matrices that belong to the same power are stacked into one operator :math:`[A_p | B_p]` which is applied to
+    the stacked vector :math:`(q^p, u^p)^T` , hence every power of the weights and the input is only computed once
+    and every power costs a single matrix product. The stacked vectors and the result are written into preallocated
+    buffers. Large and sparsely populated operators are converted to the CSR format, all others are applied by
+    the dense kernel.
+
+    :param state_space: :py:class:`StateSpace` to evaluate
+    :param input_handle: callable that replaces the input of the state space system
+    :param explicit_only: omit the linear part :math:`A_1q` , e.g. if it is treated implicitly by the integrator
+    """
+    sparse_density = .1
+    sparse_size = 1e4
+
+    def __init__(self, state_space, input_handle=None, explicit_only=False):
+        self._ss = state_space
+        self.input_handle = state_space.input if input_handle is None else input_handle
+        self._f = np.asarray(state_space.f).flatten()
+
+        a_mats = dict(state_space.A)
+        if explicit_only:
+            a_mats.pop(1, None)
+        b_mats = {p: np.atleast_2d(b_mat.T).T if isinstance(b_mat, np.ndarray) else b_mat
+                  for p, b_mat in state_space.B.items()}
+        self._input_dim = next(iter(b_mats.values())).shape[1]
+
+        self._terms = []
+        for p in sorted(set(a_mats) | set(b_mats)):
+            blocks = [mat for mat in (a_mats.get(p), b_mats.get(p)) if mat is not None]
+            if any([issparse(mat) for mat in blocks]):
+                operator = sparse_hstack(blocks, format="csr")
+            else:
+                operator = np.hstack(blocks)
+                if operator.size > self.sparse_size \
+                        and np.count_nonzero(operator) < self.sparse_density * operator.size:
+                    operator = csr_matrix(operator)
+            self._terms.append((p, p in a_mats, p in b_mats, operator))
+
+        self._dtype = None
+        self._buffers = None
+
+    def _allocate(self, dtype):
+        self._dtype = dtype
+        self._buffers = (np.empty(self._f.shape, dtype=dtype),
+                         [np.empty((operator.shape[1], ), dtype=dtype) for _, _, _, operator in self._terms],
+                         np.empty(self._f.shape, dtype=dtype))
+
+    def __call__(self, _t, _q):
+        u = np.asarray(self.input_handle(time=_t, weights=_q, weight_lbl=self._ss.weight_lbl)).flatten()
+        if u.size != self._input_dim:
+            raise ValueError("the input has {} entries but the input matrices have {} columns."
+                             "".format(u.size, self._input_dim))
+
+        dtype = np.result_type(self._f, _q, u, *[operator.dtype for _, _, _, operator in self._terms])
+        if self._buffers is None or dtype != self._dtype:
+            self._allocate(dtype)
+        q_t, stacks, tmp = self._buffers
+
+        q_t[...] = self._f
+        n = _q.size
+        for (p, use_q, use_u, operator), stack in zip(self._terms, stacks):
+            if use_q:
+                np.power(_q, p, out=stack[:n])
+            if use_u:
+                np.power(u, p, out=stack[-self._input_dim:])
+
+            if issparse(operator):
+                q_t += operator.dot(stack)
+            else:
+                np.dot(operator, stack, out=tmp)
+                q_t += tmp
+
+        return q_t
+
+
+def _create_integrator(state_space, settings, step, input_handle=None, first_step=None):
+    """
+    create the integrator for the given system, see :py:func:`simulate_state_space` for the settings
+
+    :param state_space: :py:class:`StateSpace` to integrate
+    :param settings: integrator settings
+    :param step: default (maximum) step size
+    :param input_handle: callable that replaces the input of the state space system
+    :param first_step: initial step size of adaptive integrators that support it, see
+        :py:attr:`Checkpoint.restored_integrators`
+    :return: integrator object that provides the interface of :py:class:`scipy.integrate.ode`
+    """
+    if input_handle is None:
+        input_handle = state_space.input
+
+    if settings and settings.get("name") in FixedStepIntegrator.methods:
+        return FixedStepIntegrator(state_space, settings["name"], step=settings.get("step", step),
+                                   input_handle=input_handle)
+
+    r = ode(_StateSpaceRhs(state_space, input_handle))
+
+    # TODO check for complex-valued matrices and use 'zvode'
+    if settings:
+        settings = settings.copy()
+        name = settings.pop("name")
+    else:
+        # use some sane defaults
+        name = "vode"
+        settings = dict(max_step=step, method="adams", nsteps=1e3)
+
+    if first_step is not None and name in Checkpoint.restored_integrators:
+        settings["first_step"] = first_step
+
+    r.set_integrator(name, **settings)
+
+    return r
+
+
+def _integrate_sampled(r, t, state_space, input_handle):
+    """
+    integrate up to *t* and update the sampled inputs at their sample instants on the way. Since the held inputs
+    jump at these instants, the integrator is restarted there.
+
+    :return: weights at *t*
+    """
+    for t_s in input_handle.get_sample_times(r.t, t):
+        t_s = min(t_s, t)
+        if t_s > r.t:
+            r.integrate(t_s)
+            if not r.successful():
+                return r.y
+        input_handle(time=t_s, weights=r.y, weight_lbl=state_space.weight_lbl, sample=True)
+        r.set_initial_value(r.y, t_s)
+
+    if t > r.t:
+        return r.integrate(t)
+    return r.y
+
+
+def simulate_state_space(state_space, initial_state, temp_domain, settings=None, checkpoint=None):
     """
     wrapper to simulate a system given in state space form:
     :math:`\\dot{q} = A_pq^p + A_{p-1}q^{p-1} + \\dotsb + A_0q + Bu`
@@ -708,8 +1134,15 @@ def simulate_state_space(state_space, initial_state, temp_domain, settings=None)
     :param initial_state: initial state vector of the system
     :param temp_domain: tuple of t_start and t_end
     :param settings: parameters to pass to the `set_integrator` method of the `scipy.ode` class, with the integrator
-        name included under the key ``name``
+        name included under the key ``name``. If the name is one of :py:attr:`FixedStepIntegrator.methods` the
+        corresponding :py:class:`FixedStepIntegrator` is used instead, which accepts the step size under the key
+        ``step`` (defaults to the step of *temp_domain*).
     :type settings: dict
+    :param checkpoint: if given, the state of the simulation is saved periodically so that an aborted run can be
+        continued via :py:func:`resume_simulation`. Dict with the mandatory key ``path`` and one of the keys
+        ``wall_time`` or ``sim_time`` which give the interval between two checkpoints in seconds of wall time or
+        simulation time. The weights are written to a memory-mapped array, see :py:class:`Checkpoint`.
+    :type checkpoint: dict
     :return:
     """
     if not isinstance(state_space, StateSpace):
@@ -720,52 +1153,305 @@ def simulate_state_space(state_space, initial_state, temp_domain, settings=None)
     if not isinstance(input_handle, SimulationInput):
         raise TypeError("only simulation.SimulationInput supported.")
 
-    q = [initial_state]
-    t = [temp_domain[0]]
+    initial_state = np.asarray(initial_state)
+    shape = (len(temp_domain), initial_state.size)
+    dtype = _state_dtype(state_space, initial_state)
 
-    # TODO export cython code?
-    def _rhs(_t, _q, ss):
-        q_t = ss.f
-        for p, a_mat in ss.A.items():
-            # np.add(q_t, np.dot(a_mat, np.power(_q, p)))
-            q_t = q_t + np.dot(a_mat, np.power(_q, p))
+    if checkpoint is None:
+        q = np.empty(shape, dtype=dtype)
+    else:
+        checkpoint = Checkpoint(**checkpoint)
+        q = checkpoint.create_storage(shape, dtype)
+    q[0] = initial_state.flatten()
 
-        u = ss.input(time=_t, weights=_q, weight_lbl=ss.weight_lbl)
-        for p, b_mat in ss.B.items():
-            q_t = q_t + np.dot(b_mat, np.power(u, p)).flatten()
+    r = _create_integrator(state_space, settings, temp_domain.step)
+    r.set_initial_value(q[0], temp_domain[0])
 
-        return q_t
+    return _integrate(r, state_space, temp_domain, q, 0, settings, checkpoint)
 
-    r = ode(_rhs)
 
-    # TODO check for complex-valued matrices and use 'zvode'
-    if settings:
-        r.set_integrator(settings.pop("name"), **settings)
-    else:
-        # use some sane defaults
-        r.set_integrator(
-            "vode",
-            max_step=temp_domain.step,
-            method="adams",
-            nsteps=1e3
-            )
-
-    r.set_f_params(state_space)
-    r.set_initial_value(q[0], t[0])
-
-    for t_step in temp_domain[1:]:
-        qn = r.integrate(t_step)
+def _state_dtype(state_space, initial_state):
+    """
+    dtype of the weights of :py:func:`simulate_state_space` , complex if the initial state or the system is complex
+    """
+    matrices = list(state_space.A.values()) + list(state_space.B.values()) + [state_space.f]
+    return np.result_type(initial_state, float, *[np.asarray(mat).dtype if not hasattr(mat, "dtype") else mat.dtype
+                                                  for mat in matrices])
+
+
+def resume_simulation(state_space, path, settings=None):
+    """
+    continue a simulation of :py:func:`simulate_state_space` from its last checkpoint. The results are written to
+    the same memory-mapped array.
+
+    :param state_space: state space formulation of the system, has to be equal to the one used for the initial run
+    :param path: path of the checkpoint, as given to :py:func:`simulate_state_space`
+    :param settings: integrator settings, defaults to the settings of the initial run
+    :return: see :py:func:`simulate_state_space`
+    """
+    if not isinstance(state_space, StateSpace):
+        raise TypeError
+
+    checkpoint, state = Checkpoint.load(path)
+    q = checkpoint.open_storage()
+    temp_domain = Domain(points=state["points"], step=state["step"])
+
+    if settings is None:
+        settings = state["settings"]
+
+    state_space.input._set_storage(state["input_storage"])
+
+    r = _create_integrator(state_space, settings, temp_domain.step, first_step=state["first_step"])
+    r.set_initial_value(q[state["index"]], state["time"])
+
+    return _integrate(r, state_space, temp_domain, q, state["index"], settings, checkpoint)
+
+
+def _integrate(r, state_space, temp_domain, q, start, settings, checkpoint):
+    """
+    integration loop of :py:func:`simulate_state_space`, writing into the preallocated array *q*
+    """
+    input_handle = state_space.input
+    records_steps = input_handle.records_steps
+    sampled = input_handle.get_sample_times(temp_domain[0], temp_domain[-1]).size > 0
+    if sampled and start == 0:
+        input_handle(time=temp_domain[0], weights=q[0], weight_lbl=state_space.weight_lbl, sample=True)
+    if records_steps and start == 0:
+        input_handle(time=temp_domain[0], weights=q[0], weight_lbl=state_space.weight_lbl, output_step=True)
+
+    if checkpoint is not None:
+        checkpoint.start(temp_domain[start])
+
+    end = len(temp_domain)
+    for idx in range(start + 1, len(temp_domain)):
+        if sampled:
+            qn = _integrate_sampled(r, temp_domain[idx], state_space, input_handle)
+        else:
+            qn = r.integrate(temp_domain[idx])
         if not r.successful():
             warnings.warn("*** Error: Simulation aborted at t={} ***".format(r.t))
+            end = idx
             break
 
-        t.append(r.t)
-        q.append(qn)
+        if np.iscomplexobj(qn) and not np.iscomplexobj(q):
+            # complex inputs of a real system
+            if checkpoint is not None:
+                raise ValueError("the weights became complex at t={}, provide a complex initial state to store "
+                                 "them in a checkpoint.".format(temp_domain[idx]))
+            q = q.astype(np.result_type(q, qn))
+        q[idx] = qn
+        if records_steps:
+            input_handle(time=temp_domain[idx], weights=qn, weight_lbl=state_space.weight_lbl, output_step=True)
+
+        if checkpoint is not None and checkpoint.due(temp_domain[idx]):
+            checkpoint.save(r, state_space, temp_domain, q, idx, settings)
+
+    if checkpoint is not None and end == len(temp_domain) and end - 1 > start:
+        checkpoint.save(r, state_space, temp_domain, q, end - 1, settings)
+
+    return Domain(points=np.array(temp_domain[:end]), step=temp_domain.step), q[:end]
+
+
+class Checkpoint(object):
+    """
+    periodic checkpoints of :py:func:`simulate_state_space`.
+
+    The weights are stored in a memory-mapped array at ``path + ".npy"`` while the state of the simulation (current
+    time and index, the step size of the integrator and the histories of the simulation input up to the current
+    time) is pickled to ``path + ".chk"``. The latter file is replaced atomically, so an abort while writing a
+    checkpoint leaves the previous one intact.
+
+    :param path: base path of the checkpoint files
+    :param wall_time: interval between two checkpoints in seconds of wall time
+    :param sim_time: interval between two checkpoints in seconds of simulation time
+    """
+    restored_integrators = ["vode", "lsoda"]
+
+    def __init__(self, path, wall_time=None, sim_time=None):
+        if (wall_time is None) == (sim_time is None):
+            raise ValueError("exactly one of 'wall_time' or 'sim_time' has to be given.")
+
+        self.path = path
+        self.wall_time = wall_time
+        self.sim_time = sim_time
+        self._last = None
+
+    @property
+    def storage_path(self):
+        return self.path + ".npy"
+
+    @property
+    def state_path(self):
+        return self.path + ".chk"
+
+    def create_storage(self, shape, dtype):
+        return np.lib.format.open_memmap(self.storage_path, mode="w+", dtype=dtype, shape=shape)
 
-    # create results
-    q = np.array(q)
+    def open_storage(self):
+        return np.lib.format.open_memmap(self.storage_path, mode="r+")
 
-    return Domain(points=np.array(t), step=temp_domain.step), q
+    def start(self, t):
+        self._last = time.perf_counter() if self.sim_time is None else t
+
+    def due(self, t):
+        if self.sim_time is None:
+            return time.perf_counter() - self._last >= self.wall_time
+        return t - self._last >= self.sim_time
+
+    def save(self, r, state_space, temp_domain, q, idx, settings):
+        """
+        write a checkpoint of the simulation state after the step *idx*
+        """
+        q.flush()
+
+        # the step size is the only part of the integrator state that can be handed back to scipy's solvers
+        rwork = getattr(getattr(r, "_integrator", None), "rwork", None)
+        state = dict(index=idx,
+                     time=temp_domain[idx],
+                     points=np.array(temp_domain[:]),
+                     step=temp_domain.step,
+                     settings=settings,
+                     first_step=rwork[11] if rwork is not None and rwork[11] > 0 else None,
+                     input_storage=state_space.input._get_storage(until=temp_domain[idx]),
+                     wall_time=self.wall_time,
+                     sim_time=self.sim_time)
+
+        with open(self.state_path + ".tmp", "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+        self.start(temp_domain[idx])
+
+    @classmethod
+    def load(cls, path):
+        """
+        load the checkpoint at *path*
+
+        :return: tuple of :py:class:`Checkpoint` and dict holding the simulation state
+        """
+        with open(path + ".chk", "rb") as f:
+            state = pickle.load(f)
+
+        return cls(path, wall_time=state["wall_time"], sim_time=state["sim_time"]), state
+
+
+class SimulationStepper(object):
+    """
+    step-wise simulation of a system given in state space form, e.g. for hardware in the loop applications where the
+    plant is advanced one sample at a time.
+
+    The stepper owns the integrator state and writes the current weights into a preallocated buffer. The duration
+    of every call to :py:func:`step` is tracked to provide latency statistics. A :py:class:`SimulationInput` that
+    records the output steps only is called with ``output_step=True`` at the initial time and after every step.
+
+    :param state_space: state space formulation of the system
+    :param initial_state: initial state vector of the system
+    :param step: default step size
+    :param t0: initial time
+    :param settings: integrator settings, see :py:func:`simulate_state_space`
+    :param input_handle: callable that replaces the input of the state space system. It is called with the same
+        keyword arguments as a :py:class:`SimulationInput` but nothing is stored, e.g. for an external controller.
+    :param latency_window: number of recent steps that are regarded for the latency statistics
+    """
+
+    def __init__(self, state_space, initial_state, step, t0=0., settings=None, input_handle=None,
+                 latency_window=1000):
+        if not isinstance(state_space, StateSpace):
+            raise TypeError("only StateSpace supported.")
+        if step <= 0:
+            raise ValueError("step size has to be positive.")
+
+        self._ss = state_space
+        self._step = step
+        self._input_handle = state_space.input if input_handle is None else input_handle
+        if not callable(self._input_handle):
+            raise TypeError("input must be callable!")
+
+        self._held_input = None
+        self._integrator = _create_integrator(state_space, settings, step, input_handle=self._input)
+
+        initial_state = np.asarray(initial_state)
+        self._q = np.asarray(initial_state, dtype=_state_dtype(state_space, initial_state)).flatten()
+        self._t = t0
+        self._integrator.set_initial_value(self._q, self._t)
+        self._records_steps = (isinstance(self._input_handle, SimulationInput)
+                               and self._input_handle.records_steps)
+        if self._records_steps:
+            self._record_step()
+
+        self._latencies = np.zeros((latency_window, ))
+        self._step_count = 0
+
+    def _input(self, **kwargs):
+        if self._held_input is not None:
+            return self._held_input
+        return self._input_handle(**kwargs)
+
+    def _record_step(self):
+        self._input_handle(time=self._t, weights=self._q, weight_lbl=self._ss.weight_lbl, output_step=True)
+
+    @property
+    def time(self):
+        return self._t
+
+    @property
+    def weights(self):
+        """
+        current weights, the returned array is reused by the next step so copy it if it has to be kept.
+        """
+        return self._q
+
+    def step(self, dt=None, u=None):
+        """
+        advance the simulation by one step
+
+        :param dt: step size, defaults to the step size given on initialization
+        :param u: if given, this input is applied (held constant) during the step instead of evaluating the input
+            handle. Since the input may jump between steps, the integrator is restarted in this case.
+        :return: current weights, see :py:attr:`weights`
+        """
+        start = time.perf_counter()
+
+        if dt is None:
+            dt = self._step
+        if u is not None:
+            self._held_input = np.atleast_1d(u)
+            self._integrator.set_initial_value(self._q, self._t)
+        else:
+            self._held_input = None
+
+        if u is None and isinstance(self._input_handle, SimulationInput):
+            q = _integrate_sampled(self._integrator, self._t + dt, self._ss, self._input_handle)
+        else:
+            q = self._integrator.integrate(self._t + dt)
+        if not self._integrator.successful():
+            raise RuntimeError("Integration failed at t={}".format(self._integrator.t))
+
+        self._t = self._integrator.t
+        self._q[...] = q
+        if self._records_steps and u is None:
+            self._record_step()
+
+        self._latencies[self._step_count % self._latencies.size] = time.perf_counter() - start
+        self._step_count += 1
+        return self._q
+
+    def get_latency_statistics(self):
+        """
+        statistics of the wall time consumed by the recent calls to :py:func:`step`
+
+        :return: dict with keys ``count``, ``last``, ``min``, ``max``, ``mean`` and ``std`` (in seconds)
+        """
+        if self._step_count == 0:
+            raise ValueError("no steps performed yet.")
+
+        window = self._latencies[:min(self._step_count, self._latencies.size)]
+        return dict(count=self._step_count,
+                    last=self._latencies[(self._step_count - 1) % self._latencies.size],
+                    min=window.min(),
+                    max=window.max(),
+                    mean=window.mean(),
+                    std=window.std())
 
 
 def evaluate_approximation(base_label, weights, temp_domain, spat_domain, spat_order=0, name=""):
@@ -1,12 +1,14 @@
 
-import sympy as sp
+from abc import abstractmethod
+from collections import OrderedDict
+import hashlib
+import os
 import numpy as np
-import pyqtgraph as pg
 
-from .simulation import SimulationInput
+from .simulation import SimulationInput, Domain
 from numbers import Number
 from . import eigenfunctions as ef
-import scipy.misc as sm
+import scipy.special as ss
 
 
 # TODO move this to a more feasible location
@@ -14,21 +16,116 @@ sigma_tanh = 1.1
 K_tanh = 2.
 
 
-class ConstantTrajectory(SimulationInput):
+class _Cursor(object):
+    """
+    locates scalar time steps in a sorted grid.
+
+    On uniform grids the interval is computed directly and only checked against the grid. Otherwise, the last
+    interval is cached since the integrator time mostly increases monotonically. Only if the time leaves the cached
+    interval or its successor, e.g. because the integrator rejected a step, a binary search is performed.
+
+    :param grid: sorted array with at least two entries
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.idx = 0
+        steps = np.diff(grid)
+        self._uniform_step = steps[0] if np.ptp(steps) <= 1e-12 * abs(steps[0]) else None
+
+    def locate(self, t):
+        """
+        :param t: time step inside the grid
+        :return: index *i* of the interval with grid[i] <= t < grid[i+1]
+        """
+        grid = self.grid
+        if self._uniform_step is not None:
+            idx = min(int((t - grid[0]) / self._uniform_step), grid.size - 2)
+            # rounding may hit the neighbouring interval
+            if 0 <= idx and grid[idx] <= t and (t < grid[idx + 1] or idx == grid.size - 2):
+                return idx
+
+        idx = self.idx
+        if not grid[idx] <= t < grid[idx + 1]:
+            if idx + 2 < grid.size and grid[idx + 1] <= t < grid[idx + 2]:
+                idx += 1
+            else:
+                idx = min(np.searchsorted(grid, t, side="right") - 1, grid.size - 2)
+            self.idx = idx
+
+        return idx
+
+
+class Trajectory(SimulationInput):
+    """
+    base class for simulation inputs that only depend on time.
+
+    Trajectories can be evaluated for whole arrays of time steps at once. Furthermore, the signal can be tabulated
+    on a (fine) time grid by :py:func:`precompile`, after which the evaluation for scalar times, as done by the
+    integrator, is a table lookup with linear interpolation.
+    """
+
+    def __init__(self, name=""):
+        SimulationInput.__init__(self, name=name)
+        self._table = None
+
+    @abstractmethod
+    def _signal(self, t):
+        """
+        calculate the signal
+
+        :param t: time step or array of time steps
+        :return: signal values with the time steps along the first axis
+        """
+
+    def precompile(self, domain):
+        """
+        tabulate the signal on the given time grid. Outside of the grid, the signal is held at the boundary values.
+
+        :param domain: :py:class:`pyinduct.simulation.Domain` or array of time steps
+        """
+        t = np.unique(domain[:])
+        if t.size < 2:
+            raise ValueError("at least two time steps needed to tabulate the signal.")
+
+        values = np.asarray(self._signal(t), dtype=float)
+        slopes = np.diff(values, axis=0) / np.diff(t).reshape((-1, ) + (1, ) * (values.ndim - 1))
+
+        self._table = (_Cursor(t), values, slopes)
+
+    def _lookup(self, t):
+        """
+        look up the signal for the time step *t* in the table created by :py:func:`precompile`
+        """
+        cursor, values, slopes = self._table
+        if t <= cursor.grid[0]:
+            return values[0]
+        if t >= cursor.grid[-1]:
+            return values[-1]
+
+        idx = cursor.locate(t)
+        return values[idx] + (t - cursor.grid[idx]) * slopes[idx]
+
+    def _calc_output(self, **kwargs):
+        t = kwargs["time"]
+        if self._table is not None and np.ndim(t) == 0:
+            return dict(output=self._lookup(t))
+
+        return dict(output=self._signal(t))
+
+
+class ConstantTrajectory(Trajectory):
     """
     trivial trajectory generator for a constant value as simulation input signal
     """
     def __init__(self, const=0):
-        SimulationInput.__init__(self)
+        Trajectory.__init__(self)
         self._const = const
 
-    def _calc_output(self, **kwargs):
-        if isinstance(kwargs["time"], (list, np.ndarray)):
-            return np.ones(len(kwargs["time"]))*self._const
-        elif isinstance(kwargs["time"], Number):
+    def _signal(self, t):
+        if isinstance(t, Number):
             return self._const
-        else:
-            raise NotImplementedError
+        return np.ones(np.shape(t)) * self._const
 
 
 class SmoothTransition:
@@ -52,6 +149,9 @@ class SmoothTransition:
         self.t1 = interval[1]
         self.dt = interval[1] - interval[0]
 
+        # sympy is only needed here, so don't load it on package import
+        import sympy as sp
+
         # setup symbolic expressions
         if method == "tanh":
             tau, sigma = sp.symbols('tau, sigma')
@@ -87,35 +187,38 @@ class SmoothTransition:
         """
         calculates the desired trajectory and its derivatives for time-step *t*
 
-        :param t: time-step for which trajectory and derivatives are needed
+        :param t: time-step (or array of time-steps) for which trajectory and derivatives are needed
         :returns np.ndarray
         :math:`\\boldsymbol{y}_d = \\left(y_d, \\dot{y}_d, \\ddot{y}_d, \\dotsc, \\y_d^{(\\gamma)}\\right)`
+            with the shape of *t* appended
         """
-        y = np.zeros((len(self.dphi_num)))
-        if t <= self.t0:
-            y[0] = self.yd[0]
-        elif t >= self.t1:
-            y[0] = self.yd[1]
-        else:
-            for order, dphi in enumerate(self.dphi_num):
-                if order == 0:
-                    ya = self.yd[0]
-                else:
-                    ya = 0
+        t = np.asarray(t, dtype=float)
+        t_flat = np.atleast_1d(t).flatten()
+        y = np.zeros((len(self.dphi_num), t_flat.size))
+        y[0] = np.where(t_flat <= self.t0, self.yd[0], self.yd[1])
 
-                y[order] = ya + (self.yd[1] - self.yd[0])*dphi((t - self.t0)/self.dt)*1/self.dt**order
+        inside = (t_flat > self.t0) & (t_flat < self.t1)
+        tau = (t_flat[inside] - self.t0) / self.dt
+        for order, dphi in enumerate(self.dphi_num):
+            if order == 0:
+                ya = self.yd[0]
+            else:
+                ya = 0
 
-        return y
+            # derivatives may be constant, so broadcast the result
+            y[order, inside] = ya + (self.yd[1] - self.yd[0]) * dphi(tau) * np.ones_like(tau) / self.dt**order
 
+        return y.reshape((len(self.dphi_num), ) + t.shape)
 
-class FlatString(SimulationInput):
+
+class FlatString(Trajectory):
     """
     class that implements a flatness based control approach
     for the "string with mass" model
     """
 
     def __init__(self, y0, y1, z0, z1, t0, dt, params):
-        SimulationInput.__init__(self)
+        Trajectory.__init__(self)
 
         # store params
         self._tA = t0
@@ -129,16 +232,12 @@ class FlatString(SimulationInput):
         ts = max(t0, self._dz * self._tau)  # never too early
         self.trajectory_gen = SmoothTransition((y0, y1), (ts, ts + dt), method="poly", differential_order=2)
 
-        # create vectorized functions
-        self.control_input = np.vectorize(self._control_input, otypes=[np.float])
-        self.system_state = np.vectorize(self._system_sate, otypes=[np.float])
-
-    def _control_input(self, t):
+    def control_input(self, t):
         """
         control input for system gained through flatness based approach that will
         satisfy the target trajectory for y
 
-        :param t: time
+        :param t: time (or array of times)
         :return: input force f
         """
         yd1 = self.trajectory_gen(t - self._dz * self._tau)
@@ -146,11 +245,11 @@ class FlatString(SimulationInput):
 
         return 0.5*self._m*(yd2[2] + yd1[2]) + self._sigma * self._tau/2 * (yd2[1] - yd1[1])
 
-    def _system_sate(self, z, t):
+    def system_state(self, z, t):
         """
         x(z, t) of string-mass system for given flat output y
-        :param z: location
-        :param t: time
+        :param z: location (or array of locations)
+        :param t: time (or array of times, broadcastable to *z*)
         :return: state (deflection of string)
         """
         yd1 = self.trajectory_gen(t - z * self._tau)
@@ -158,77 +257,92 @@ class FlatString(SimulationInput):
 
         return self._m / (2 * self._sigma * self._tau) * (yd2[1] - yd1[1]) + .5 * (yd1[0] + yd2[0])
 
-    def _calc_output(self, **kwargs):
+    def _signal(self, t):
         """
         use time to calculate system input and return force
-        :param t:
-        :param q:
-        :param kwargs:
-        :return:
         """
-        return dict(output=self._control_input(kwargs["time"]))
+        return self.control_input(t)
 
 
-# TODO: kwarg: t_step
-def gevrey_tanh(T, n, sigma=sigma_tanh, K=K_tanh):
+def gevrey_tanh(T, n, sigma=sigma_tanh, K=K_tanh, num=None, step=None):
     """
     Provide the flat output y(t) = phi(t), with the gevrey-order
     1+1/sigma, and the derivatives up to order n.
-    :param t: [0, ... , t_end]  (numpy array)
+    :param T: transition time, the flat output is evaluated on [0, ... , T]
     :param n: (integer)
     :param sigma: (float)
     :param K: (float)
-    :return: np.array([[phi], ... ,[phi^(n)]])
+    :param num: number of time steps
+    :param step: time step size, see :py:class:`pyinduct.simulation.Domain` for the interplay with *num*. If neither
+        is given, 50 time steps per second are used.
+    :return: np.array([[phi], ... ,[phi^(n)]]) and the time steps
     """
+    if num is None and step is None:
+        num = int(0.5*10**(2+np.log10(T)))
+    t_init = Domain(bounds=(0., T), num=num, step=step)[:]
 
-    t_init = t = np.linspace(0., T, int(0.5*10**(2+np.log10(T))))
+    # the boundaries are handled separately
+    tau = t_init[1:-1]/T
 
-    # pop
-    t = np.delete(t, 0, 0)
-    t = np.delete(t, -1, 0)
-
-    # main
-    tau = t/T
-
-    a = dict()
+    a = np.zeros((n+2, tau.size))
     a[0] = K*(4*tau*(1-tau))**(1-sigma)/(2*(sigma-1))
     a[1] = (2*tau - 1)*(sigma-1)/(tau*(1-tau))*a[0]
     for k in range(2, n+2):
         a[k] = (tau*(1-tau))**-1 * ((sigma-2+k)*(2*tau-1)*a[k-1]+(k-1)*(2*sigma-4+k)*a[k-2])
 
-    yy = dict()
+    # derivatives of yy = tanh(a_1) and z = 1 - yy**2 by the leibniz rule
+    binomials = _binomial_table(n, 1)
+    yy = np.zeros((n+1, tau.size))
+    z = np.zeros((n, tau.size))
     yy[0] = np.tanh(a[1])
     if n > 0:
-        yy[1] = a[2]*(1-yy[0]**2)
-    z = dict()
-    z[0] = (1-yy[0]**2)
+        z[0] = 1 - yy[0]**2
+        yy[1] = a[2]*z[0]
     for i in range(2, n+1):
-        sum_yy = np.zeros(len(t))
-        for k in range(i):
-            if k == 0:
-                sum_z = np.zeros(len(t))
-                for j in range(i):
-                    sum_z += -sm.comb(i-1, j)*yy[j]*yy[i-1-j]
-                z[i-1] = sum_z
-            sum_yy += sm.comb(i-1, k)*a[k+2]*z[i-1-k]
-        yy[i] = sum_yy
-
-    # push
-    phi = np.nan*np.zeros((n+1, len(t)+2))
-    for i in range(n+1):
-        phi_temp = 0.5*yy[i]
-        if i == 0:
-            phi_temp += 0.5
-            phi_temp = np.insert(phi_temp, 0, [0.], axis=0)
-            phi[i, :] = np.append(phi_temp, [1.])
-        else:
-            phi_temp = np.insert(phi_temp, 0, [0.], axis=0)
-            # attention divide by T^i
-            phi[i, :] = np.append(phi_temp, [0.])/T**i
+        b = binomials[i-1, :i, np.newaxis]
+        z[i-1] = -np.sum(b*yy[:i]*yy[i-1::-1], axis=0)
+        yy[i] = np.sum(b*a[2:i+2]*z[i-1::-1], axis=0)
+
+    # boundary values: phi rises from 0 to 1 and all its derivatives vanish
+    phi = np.zeros((n+1, t_init.size))
+    phi[0, -1] = 1.
+    phi[:, 1:-1] = 0.5*yy
+    phi[0, 1:-1] += 0.5
+    # attention divide by T^i
+    phi /= float(T)**np.arange(n+1)[:, np.newaxis]
 
     return phi, t_init
 
 
+def _binomial_table(n, a):
+    """
+    lower triangular matrix M with :math:`M_{jk} = \\binom{j}{k} a^{j-k}` for :math:`0 \\leq k \\leq j < n`
+    """
+    j, k = np.tril_indices(n)
+    table = np.zeros((n, n))
+    table[j, k] = ss.comb(j, k) * float(a)**(j - k)
+    return table
+
+
+def _taylor_table(z, n, offset=0, scale=1.):
+    """
+    table of the scaled taylor monomials :math:`T_{jk} = s^j z_k^{2j + o} / (2j + o)!` for :math:`0 \\leq j < n`,
+    built by recursion to avoid the large factorials
+
+    :param z: array of evaluation points
+    :param n: number of rows
+    :param offset: offset *o* of the exponents (0 or 1)
+    :param scale: scale *s* of the argument
+    :return: table with shape (n, len(z))
+    """
+    table = np.empty((n, len(z)))
+    table[0] = z**offset
+    for j in range(1, n):
+        exponent = 2*j + offset
+        table[j] = table[j - 1] * z**2 * scale / ((exponent - 1) * exponent)
+    return table
+
+
 def _power_series_flat_out(z, t, n, param, y, bound_cond_type):
     """ Provide the power series approximation for x(z,t) and x'(z,t).
     :param z: [0, ..., l] (numpy array)
@@ -240,9 +354,7 @@ def _power_series_flat_out(z, t, n, param, y, bound_cond_type):
     """
     # TODO: documentation
     a2, a1, a0, alpha, beta = param
-    shape = (len(t), len(z))
-    x = np.nan*np.ones(shape)
-    d_x = np.nan*np.ones(shape)
+    z = np.atleast_1d(z)
 
     # Actually power_series() is designed for robin boundary condition by z=0.
     # With the following modification it can also used for dirichlet boundary condition by z=0.
@@ -255,26 +367,16 @@ def _power_series_flat_out(z, t, n, param, y, bound_cond_type):
         raise ValueError("Selected Boundary condition {0} not supported! Use 'robin' or 'dirichlet'".format(
             bound_cond_type))
 
-    # TODO: flip iteration order: z <--> t, result: one or two instead len(t) call's
-    for i in range(len(t)):
-        sum_x = np.zeros(len(z))
-        for j in range(n):
-            sum_b = np.zeros(len(z))
-            for k in range(j+1):
-                sum_b += sm.comb(j, k)*(-a0)**(j-k)*y[k, i]
-            sum_x += (is_robin+alpha*z/(2.*j+1.))*z**(2*j)/sm.factorial(2*j)/a2**j*sum_b
-        x[i, :] = sum_x
-
-    for i in range(len(t)):
-        sum_x = np.zeros(len(z))
-        for j in range(n):
-            sum_b = np.zeros(len(z))
-            for k in range(j+2):
-                sum_b += sm.comb(j+1, k)*(-a0)**(j-k+1)*y[k, i]
-            if j == 0:
-                sum_x += alpha*y[0, i]
-            sum_x += (is_robin+alpha*z/(2.*(j+1)))*z**(2*j+1)/sm.factorial(2*j+1)/a2**(j+1)*sum_b
-        d_x[i, :] = sum_x
+    # b_j(t) = sum_k binom(j, k) (-a0)^(j-k) y^(k)(t) for all times at once
+    b = np.dot(_binomial_table(n + 1, -a0), y[:n + 1, :len(t)])
+
+    # spatial part, including the factor a2^-j
+    j = np.arange(n)[:, np.newaxis]
+    z_even = _taylor_table(z, n, scale=1/a2) * (is_robin + alpha*z/(2.*j + 1.))
+    z_odd = _taylor_table(z, n, offset=1, scale=1/a2) * (is_robin + alpha*z/(2.*(j + 1))) / a2
+
+    x = np.dot(b[:n].T, z_even)
+    d_x = np.dot(b[1:].T, z_odd) + alpha*y[0, :len(t), np.newaxis]
 
     return x, d_x
 
@@ -309,10 +411,8 @@ def coefficient_recursion(c0, c1, param):
     C[1] = c1
 
     for i in range(2, 2*N):
-        reduced_derivative_order = int(i/2.)
-        C[i] = np.nan*np.zeros((N-reduced_derivative_order, c0.shape[1]))
-        for j in range(N-reduced_derivative_order):
-            C[i][j, :] = (C[i-2][j+1, :] - a1*C[i-1][j, :] - a0*C[i-2][j, :])/a2
+        rows = N - int(i/2.)
+        C[i] = (C[i-2][1:rows+1] - a1*C[i-1][:rows] - a0*C[i-2][:rows])/a2
 
     return C
 
@@ -335,14 +435,11 @@ def temporal_derived_power_series(z, C, up_to_order, series_termination_index, s
     if any([C[i].shape[0] - 1 < up_to_order for i in range(series_termination_index+1)]):
         raise ValueError
 
-    len_t = C[0].shape[1]
-    Q = np.nan*np.zeros((up_to_order+1, len_t))
-
-    for i in range(up_to_order+1):
-        sum_Q = np.zeros(len_t)
-        for j in range(series_termination_index+1-spatial_der_order):
-            sum_Q += C[j+spatial_der_order][i, :]*z**(j)/sm.factorial(j)
-        Q[i, :] = sum_Q
+    # horner scheme: c_0 + z/1 (c_1 + z/2 (c_2 + ...))
+    last = series_termination_index - spatial_der_order
+    Q = np.array(C[last + spatial_der_order][:up_to_order+1], dtype=float)
+    for j in range(last - 1, -1, -1):
+        Q = C[j + spatial_der_order][:up_to_order+1] + Q*z/(j + 1)
 
     return Q
 
@@ -356,12 +453,13 @@ def power_series(z, t, C, spatial_der_order=0):
     if not all([len(item.shape) == 1 for item in [z, t]]):
         raise ValueError
 
-    x = np.nan*np.zeros((len(t), len(z)))
-    for i in range(len(z)):
-        sum_x = np.zeros(t.shape[0])
-        for j in range(len(C)-spatial_der_order):
-            sum_x += C[j+spatial_der_order][0, :]*z[i]**j/sm.factorial(j)
-        x[:, i] = sum_x
+    # x(z, t) = sum_j C_j(t) z^j / j! as a single matrix product
+    orders = range(len(C) - spatial_der_order)
+    coefficients = np.array([C[j + spatial_der_order][0, :] for j in orders])
+    monomials = np.ones((len(orders), len(z)))
+    for j in orders[1:]:
+        monomials[j] = monomials[j - 1] * z / j
+    x = np.dot(coefficients.T, monomials)
 
     if any([dim == 1 for dim in x.shape]):
         x = x.flatten()
@@ -369,29 +467,67 @@ def power_series(z, t, C, spatial_der_order=0):
     return x
 
 
-class InterpTrajectory(SimulationInput):
+class InterpTrajectory(Trajectory):
+    """
+    trajectory that interpolates the given samples. If the temporal derivatives of the samples are given, cubic
+    hermite interpolation is used which allows a much coarser sampling. Otherwise, the samples are interpolated
+    linearly.
+
+    :param t: sorted array of time steps
+    :param u: samples of the trajectory
+    :param du: temporal derivatives of the samples
+    :param show_plot: plot the trajectory
+    """
 
-    def __init__(self, t, u, show_plot=False):
-        SimulationInput.__init__(self)
+    def __init__(self, t, u, du=None, show_plot=False):
+        Trajectory.__init__(self)
 
-        self._t = t
-        self._T = t[-1]
-        self._u = u
+        self._t = np.asarray(t)
+        self._T = self._t[-1]
+        self._u = np.asarray(u)
+        self._du = None if du is None else np.asarray(du)
+        self._cursor = _Cursor(self._t)
         self.scale = 1
 
+        if self._du is not None and self._du.shape != self._u.shape:
+            raise ValueError("derivatives have to be given for every sample.")
+
         if show_plot:
+            import pyqtgraph as pg
             pw = pg.plot(title="InterpTrajectory")
             pw.plot(self._t, self.__call__(time=self._t))
             pw.plot([0, self._T], self.__call__(time=[0, self._T]), pen=None, symbolPen=pg.mkPen("g"))
             pg.QtGui.QApplication.instance().exec_()
 
-    def _calc_output(self, **kwargs):
+    def _signal(self, t):
         """
         use time to calculate system input and return force
-        :param kwargs:
-        :return:
         """
-        return dict(output=np.interp(kwargs["time"], self._t, self._u)*self.scale)
+        if np.ndim(t) == 0:
+            if t <= self._t[0]:
+                return self._u[0]*self.scale
+            if t >= self._t[-1]:
+                return self._u[-1]*self.scale
+            idx = self._cursor.locate(t)
+        else:
+            if self._du is None:
+                return np.interp(t, self._t, self._u)*self.scale
+            t = np.clip(t, self._t[0], self._t[-1])
+            idx = np.clip(np.searchsorted(self._t, t, side="right") - 1, 0, self._t.size - 2)
+
+        t0 = self._t[idx]
+        h = self._t[idx + 1] - t0
+        s = (t - t0) / h
+        if self._du is None:
+            return (self._u[idx] + s*(self._u[idx + 1] - self._u[idx]))*self.scale
+
+        # cubic hermite basis
+        s2 = s*s
+        s3 = s2*s
+        return (self._u[idx]*(2*s3 - 3*s2 + 1)
+                + self._du[idx]*h*(s3 - 2*s2 + s)
+                + self._u[idx + 1]*(3*s2 - 2*s3)
+                + self._du[idx + 1]*h*(s3 - s2))*self.scale
 
 
 class RadTrajectory(InterpTrajectory):
@@ -413,10 +549,11 @@ class RadTrajectory(InterpTrajectory):
     actuation_type
     case 1: x(l,t)=u(t)  (Dirichlet)
     case 2: x'(l,t) = -beta x(l,t) + u(t)  (Robin).
+
+    The resolution of the trajectory can be chosen by *num* or *step*, see :py:func:`gevrey_tanh`.
     """
-    # TODO: kwarg: t_step
     def __init__(self, l, T, param_original, bound_cond_type, actuation_type, n=80, sigma=sigma_tanh, K=K_tanh,
-                 show_plot=False):
+                 show_plot=False, num=None, step=None):
 
         cases = {'dirichlet', 'robin'}
         if bound_cond_type not in cases:
@@ -435,22 +572,153 @@ class RadTrajectory(InterpTrajectory):
         self._K = K
 
         self._z = np.array([self._l])
-        y, t = gevrey_tanh(self._T, self._n+2, self._sigma, self._K)
-        x, d_x = _power_series_flat_out(self._z, t, self._n, self._param, y, bound_cond_type)
 
+        key = _rad_trajectory_key(l, T, param_original, bound_cond_type, actuation_type, n, sigma, K, num, step)
+        table = _load_rad_trajectory(key)
+        if table is None:
+            table = self._calc_table(num, step)
+            _store_rad_trajectory(key, table)
+        t, u, du = table
+
+        InterpTrajectory.__init__(self, t, u, du=du, show_plot=show_plot)
+
+    def _calc_table(self, num, step):
+        """
+        calculate the samples of the trajectory and their temporal derivatives
+
+        :return: tuple of time steps, samples and derivatives
+        """
+        y, t = gevrey_tanh(self._T, self._n+2, self._sigma, self._K, num=num, step=step)
+
+        # since the series is linear in y, the temporal derivative of the input (used for the hermite
+        # interpolation) follows from the derivatives of the flat output
         a2, a1, a0, alpha, beta = self._param
-        if self._actuation_type is 'dirichlet':
-            u = x[:, -1]
-        elif self._actuation_type is 'robin':
-            u = d_x[:, -1] + beta*x[:, -1]
-        else:
-            raise NotImplementedError
+        u = []
+        for y_der in [y, y[1:]]:
+            x, d_x = _power_series_flat_out(self._z, t, self._n, self._param, y_der, self._bound_cond_type)
+            if self._actuation_type is 'dirichlet':
+                u.append(x[:, -1])
+            elif self._actuation_type is 'robin':
+                u.append(d_x[:, -1] + beta*x[:, -1])
+            else:
+                raise NotImplementedError
 
         # actually the algorithm consider the pde
         # d/dt x(z,t) = a_2 x''(z,t) + a_0 x(z,t)
         # with the following back transformation are also
         # pde's with advection term a_1 x'(z,t) considered
-        u *= np.exp(-self._a1_original/2./a2*l)
+        u, du = np.array(u)*np.exp(-self._a1_original/2./a2*self._l)
+
+        return t, u, du
+
+
+_rad_trajectory_cache = OrderedDict()
+_rad_trajectory_cache_size = 32
+_rad_trajectory_cache_dir = None
+_rad_trajectory_cache_stats = dict(hits=0, disk_hits=0, misses=0)
+
+
+def _rad_trajectory_key(*args):
+    """
+    content based key for the given :py:class:`RadTrajectory` arguments
+    """
+    content = [tuple(np.asarray(arg, dtype=float).flatten()) if isinstance(arg, (list, tuple, np.ndarray))
+               else arg for arg in args]
+    return hashlib.sha1(repr(content).encode()).hexdigest()
+
+
+def _load_rad_trajectory(key):
+    """
+    look up the table for *key* in memory and in the cache directory
+    """
+    if key in _rad_trajectory_cache:
+        _rad_trajectory_cache_stats["hits"] += 1
+        _rad_trajectory_cache.move_to_end(key)
+        return _rad_trajectory_cache[key]
+
+    if _rad_trajectory_cache_dir is not None:
+        path = os.path.join(_rad_trajectory_cache_dir, key + ".npz")
+        if os.path.isfile(path):
+            with np.load(path) as data:
+                table = data["t"], data["u"], data["du"]
+            _rad_trajectory_cache_stats["disk_hits"] += 1
+            _remember_rad_trajectory(key, table)
+            return table
+
+    _rad_trajectory_cache_stats["misses"] += 1
+    return None
 
-        InterpTrajectory.__init__(self, t, u, show_plot=show_plot)
+
+def _remember_rad_trajectory(key, table):
+    """
+    put the table for *key* into the memory cache, the least recently used tables are dropped if it is full
+    """
+    _rad_trajectory_cache[key] = table
+    _rad_trajectory_cache.move_to_end(key)
+    while len(_rad_trajectory_cache) > _rad_trajectory_cache_size:
+        _rad_trajectory_cache.popitem(last=False)
+
+
+def _store_rad_trajectory(key, table):
+    """
+    store the table for *key* in memory and in the cache directory
+    """
+    for array in table:
+        array.setflags(write=False)
+    _remember_rad_trajectory(key, table)
+
+    if _rad_trajectory_cache_dir is not None:
+        path = os.path.join(_rad_trajectory_cache_dir, key + ".npz")
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, t=table[0], u=table[1], du=table[2])
+        os.replace(path + ".tmp", path)
+
+
+def set_rad_trajectory_cache_dir(directory):
+    """
+    set the directory where the tables of :py:class:`RadTrajectory` are stored additionally to the memory cache
+
+    :param directory: path of the directory, which is created if necessary, or None to disable the disk cache
+    """
+    global _rad_trajectory_cache_dir
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    _rad_trajectory_cache_dir = directory
+
+
+def set_rad_trajectory_cache_size(size):
+    """
+    set the number of :py:class:`RadTrajectory` tables that are kept in memory, the least recently used tables are
+    dropped first
+
+    :param size: maximum number of tables (default: 32)
+    """
+    global _rad_trajectory_cache_size
+    if size < 0:
+        raise ValueError("the cache size must not be negative.")
+    _rad_trajectory_cache_size = size
+    while len(_rad_trajectory_cache) > size:
+        _rad_trajectory_cache.popitem(last=False)
+
+
+def clear_rad_trajectory_cache():
+    """
+    clear the memory cache of :py:class:`RadTrajectory` and reset its statistics. The cache directory is kept.
+    """
+    _rad_trajectory_cache.clear()
+    for key in _rad_trajectory_cache_stats:
+        _rad_trajectory_cache_stats[key] = 0
+
+
+def get_rad_trajectory_cache_info():
+    """
+    statistics of the :py:class:`RadTrajectory` cache
+
+    :return: dict with the number of ``hits`` (memory), ``disk_hits`` and ``misses`` as well as the number of
+        tables in memory (``size``), their maximum number (``max_size``) and the cache ``directory``
+    """
+    info = dict(_rad_trajectory_cache_stats)
+    info.update(size=len(_rad_trajectory_cache), max_size=_rad_trajectory_cache_size,
+                directory=_rad_trajectory_cache_dir)
+    return info
 
@@ -2,9 +2,9 @@ import copy as cp
 import warnings
 from numbers import Number
 import collections
+import multiprocessing
 import numpy as np
-import pyqtgraph as pg
-from scipy.optimize import root
+from scipy.optimize import root, brentq
 
 from .registry import get_base, register_base
 from . import placeholder as ph
@@ -28,14 +28,25 @@ def complex_wrapper(func):
     :return: 2dim function handle, taking x = (re(x), im(x) and returning [re(func(x), im(func(x)]
     """
 
-    def wrapper(x):
-        return np.array([np.real(func(np.complex(x[0], x[1]))),
-                         np.imag(func(np.complex(x[0], x[1])))])
+    return _ComplexWrapper(func)
 
-    return wrapper
 
+class _ComplexWrapper(object):
+    """
+    picklable handle returned by :py:func:`complex_wrapper`, so that wrapped functions can be shipped to worker
+    processes that are spawned instead of forked
+    """
+
+    def __init__(self, func):
+        self._func = func
+
+    def __call__(self, x):
+        return np.array([np.real(self._func(np.complex(x[0], x[1]))),
+                         np.imag(self._func(np.complex(x[0], x[1])))])
 
-def find_roots(function, n_roots, grid, rtol=0, atol=1e-7, show_plot=False, complex=False):
+
+def find_roots(function, n_roots, grid, rtol=0, atol=1e-7, show_plot=False, complex=False, bracket=False,
+               processes=None):
     """
     Searches roots of the given function in the interval [0, area_end] and checks them with aid of rtol for uniqueness.
     It will return the exact amount of roots given by n_roots or raise ValueError.
@@ -47,6 +58,16 @@ def find_roots(function, n_roots, grid, rtol=0, atol=1e-7, show_plot=False, comp
     entries error and the current error is performed. If the newly calculated root comes with a smaller error it
     supersedes the present entry.
 
+    For real functions of one variable, *bracket* switches to a bracketing search: The function is evaluated on the
+    whole grid at once (pointwise, if it does not accept arrays), every sign change between two neighbouring grid
+    points is refined by :py:func:`scipy.optimize.brentq` and the n_roots smallest roots are returned (all of them if
+    n_roots is None). Roots of even multiplicity and pairs of roots within one grid cell are not detected in this mode.
+
+    Given *processes*, the local searches are distributed in chunks of start values over a pool of worker processes.
+    The results are processed in the order of the start values, hence the roots are the same as for the serial search.
+    As soon as enough roots are found, the remaining searches are cancelled. If the platform does not support forking
+    new processes, the function handle has to be picklable.
+
     :param function: function handle for f(x) whose roots shall be found
     :param n_roots: number of roots to find
     :param grid: np.ndarray (first dimension should fit the input dimension of the provided func) of values where to
@@ -54,6 +75,9 @@ def find_roots(function, n_roots, grid, rtol=0, atol=1e-7, show_plot=False, comp
     :param rtol: magnitude to be exceeded for the difference of two roots to be unique f(r1) - f(r2) > 10^rtol
     :param atol: absolute tolerance to zero  f(root) < atol
     :param show_plot: shows a debug plot containing the given functions behavior completed by the extracted roots
+    :param complex: search for complex roots, the grid has to contain a real and an imaginary row
+    :param bracket: use the bracketing search (only for real functions of one variable)
+    :param processes: number of worker processes for the local searches, None for a serial search
     :return: numpy.ndarray of roots
     """
     # positive_numbers = [n_roots, points_per_root, area, atol]
@@ -71,51 +95,42 @@ def find_roots(function, n_roots, grid, rtol=0, atol=1e-7, show_plot=False, comp
         grid = [grid]
 
     dim = len(grid)
+    if bracket:
+        if dim != 1 or complex:
+            raise ValueError("the bracketing search is only available for real functions of one variable.")
+        return _find_roots_bracketing(function, n_roots, np.asarray(grid[0], dtype=float), rtol, atol, show_plot)
+
     if complex:
         assert dim == 2
         function = complex_wrapper(function)
 
     roots = np.full((n_roots, dim), np.nan)
-    rounded_roots = np.full((n_roots, dim), np.nan)
     errors = np.full((n_roots,), np.nan)
     found_roots = 0
+    # maps the rounded roots to their index
+    root_indices = dict()
 
     grids = np.meshgrid(*[row for row in grid])
     values = np.vstack([arr.flatten() for arr in grids]).T
 
+    limits = (np.array([np.min(row) for row in grid]), np.array([np.max(row) for row in grid]))
+    if processes is None:
+        candidates = (_refine_root(function, val, atol, limits) for val in values)
+    else:
+        candidates = _refine_roots_parallel(function, values, atol, limits, processes)
+
     # iterate over test_values
-    val = iter(values)
-    while found_roots < n_roots:
-        try:
-            res = root(function, next(val), tol=atol)
-            # calculated_root, info, ier, msg = fsolve(function, val.next(), full_output=True)
-        except StopIteration:
+    for candidate in candidates:
+        if found_roots >= n_roots:
             break
-
-        if not res.success:
-            continue
-
-        calculated_root = np.atleast_1d(res.x)
-        error = np.linalg.norm(res.fun)
-
-        # check for absolute tolerance
-        if error > atol:
-            continue
-
-        # check if root lies in expected area
-        abort = False
-        for rt, ar in zip(calculated_root, grid):
-            if ar.min() > rt or ar.max() < rt:
-                abort = True
-                break
-        if abort:
+        if candidate is None:
             continue
+        calculated_root, error = candidate
 
         # check whether root is already present in cache
-        rounded_root = np.round(calculated_root, -rtol)
-        cmp_arr = [all(bools) for bools in rounded_root == rounded_roots[:found_roots]]
-        if any(cmp_arr):
-            idx = cmp_arr.index(True)
+        rounded_root = tuple(np.round(calculated_root, -rtol) + 0.)
+        idx = root_indices.get(rounded_root, None)
+        if idx is not None:
             if errors[idx] > error:
                 roots[idx] = calculated_root
                 errors[idx] = error
@@ -123,16 +138,20 @@ def find_roots(function, n_roots, grid, rtol=0, atol=1e-7, show_plot=False, comp
             continue
 
         roots[found_roots] = calculated_root
-        rounded_roots[found_roots] = rounded_root
+        root_indices[rounded_root] = found_roots
         errors[found_roots] = error
 
         found_roots += 1
 
+    # cancel the remaining searches
+    candidates.close()
+
     # sort roots
     valid_roots = roots[:found_roots]
-    good_roots = np.sort(valid_roots, 0)
+    good_roots = valid_roots[np.lexsort(np.round(valid_roots, -rtol).T[::-1])]
 
     if show_plot:
+        import pyqtgraph as pg
         pw = pg.plot(title="function + roots")
         if complex:
             pw.plot(good_roots[:, 0], good_roots[:, 1], pen=None, symbolPen=pg.mkPen("g"))
@@ -165,6 +184,99 @@ def find_roots(function, n_roots, grid, rtol=0, atol=1e-7, show_plot=False, comp
     return good_roots
 
 
+def _refine_root(function, start_value, atol, limits):
+    """
+    local search of :py:func:`find_roots` , starting at *start_value*
+
+    :return: root and its error or None if the search failed or left the area given by *limits*
+    """
+    res = root(function, start_value, tol=atol)
+    # calculated_root, info, ier, msg = fsolve(function, val.next(), full_output=True)
+    if not res.success:
+        return None
+
+    calculated_root = np.atleast_1d(res.x)
+    error = np.linalg.norm(res.fun)
+
+    # check for absolute tolerance
+    if error > atol:
+        return None
+
+    # check if root lies in expected area
+    if np.any(calculated_root < limits[0]) or np.any(calculated_root > limits[1]):
+        return None
+
+    return calculated_root, error
+
+
+_worker_problem = None
+
+
+def _init_root_worker(function, atol, limits):
+    global _worker_problem
+    _worker_problem = function, atol, limits
+
+
+def _refine_root_chunk(start_values):
+    function, atol, limits = _worker_problem
+    return [_refine_root(function, val, atol, limits) for val in start_values]
+
+
+def _refine_roots_parallel(function, values, atol, limits, processes):
+    """
+    generator of the local search results of :py:func:`find_roots` for the start *values*, computed by a pool of
+    *processes* workers. Closing the generator terminates the pool.
+    """
+    chunk_size = max(1, int(np.ceil(len(values) / (16 * processes))))
+    chunks = [values[idx:idx + chunk_size] for idx in range(0, len(values), chunk_size)]
+    with multiprocessing.Pool(processes, initializer=_init_root_worker, initargs=(function, atol, limits)) as pool:
+        for results in pool.imap(_refine_root_chunk, chunks):
+            for result in results:
+                yield result
+
+
+def _find_roots_bracketing(function, n_roots, grid, rtol, atol, show_plot):
+    """
+    bracketing search of :py:func:`find_roots`
+    """
+    from . import core as cr
+    grid = np.sort(grid)
+    values = cr._evaluate_vectorized(function, grid, dtype=float)
+
+    roots = grid[values == 0].tolist()
+    brackets = np.flatnonzero(values[:-1] * values[1:] < 0)
+    for idx in brackets:
+        calculated_root = brentq(function, grid[idx], grid[idx + 1])
+        error = np.abs(function(calculated_root))
+
+        # sign changes at poles are no roots
+        if error > max(atol, min(np.abs(values[idx]), np.abs(values[idx + 1]))):
+            continue
+        roots.append(calculated_root)
+
+    # roots that coincide with respect to rtol are only taken once
+    roots = np.sort(roots)
+    rounded_roots = np.round(roots, -rtol)
+    unique = np.hstack(([True], rounded_roots[1:] != rounded_roots[:-1])) if roots.size else []
+    roots = roots[unique]
+
+    if show_plot:
+        import pyqtgraph as pg
+        pw = pg.plot(title="function + roots")
+        pw.plot(grid, values, pen=pg.mkPen("b"))
+        pw.plot(roots, np.zeros(roots.shape), pen=None, symbolPen=pg.mkPen("g"))
+        pg.QtGui.QApplication.instance().exec_()
+
+    if n_roots is None:
+        return roots
+
+    if roots.size < n_roots:
+        raise ValueError("Insufficient number of roots detected. ({0} < {1}) "
+                         "Try to increase the area to search in.".format(roots.size, n_roots))
+
+    return roots[:n_roots]
+
+
 def evaluate_placeholder_function(placeholder, input_values):
     """
     evaluate a given placeholder object, that contains functions
@@ -1,15 +1,31 @@
+import importlib
 import numpy as np
-import pyqtgraph as pg
-import pyqtgraph.opengl as gl
-import matplotlib.pyplot as plt
 from numbers import Number
 import time
 import scipy.interpolate as si
-# axes3d not explicit used but needed
-from mpl_toolkits.mplot3d import axes3d
 
 from . import utils as ut
 
+
+class _LazyModule(object):
+    """
+    stand-in for a module that is imported on first attribute access. This way, importing pyinduct does not load
+    the gui toolkits.
+
+    :param name: name of the module
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, item):
+        return getattr(importlib.import_module(self._name), item)
+
+
+pg = _LazyModule("pyqtgraph")
+gl = _LazyModule("pyqtgraph.opengl")
+plt = _LazyModule("matplotlib.pyplot")
+
 colors = ["g", "c", "m", "b", "y", "k", "w", "r"]
 
 
@@ -80,13 +96,12 @@ class DataPlot:
         self._dt = data[0].input_data[0][1] - data[0].input_data[0][0]
 
 
-class PgDataPlot(DataPlot, pg.QtCore.QObject):
+class PgDataPlot(DataPlot):
     """
     base class for all pyqtgraph plotting related classes
     """
 
     def __init__(self, data):
-        pg.QtCore.QObject.__init__(self)
         DataPlot.__init__(self, data)
 
 
@@ -301,6 +316,9 @@ class MplSurfacePlot(DataPlot):
     def __init__(self, data, keep_aspect=False, fig_size=(12, 8), zlabel='$\quad x(z,t)$'):
         DataPlot.__init__(self, data)
 
+        # axes3d not explicit used but needed
+        from mpl_toolkits.mplot3d import axes3d
+
         for i in range(len(self._data)):
 
             # data
@@ -3,7 +3,7 @@ import numpy as np
 from scipy import integrate
 import unittest
 
-from pyinduct import register_base
+from pyinduct import register_base, get_base
 from pyinduct import core as cr
 from pyinduct import control as ct
 from pyinduct import placeholder as ph
@@ -27,6 +27,18 @@ if show_plots:
 # TODO Test for ControlLaw and LawEvaluator
 
 
+class AssistedFunction(cr.Function):
+    """
+    function, whose weights are given by the weights of the assistant base 'assistant_funcs'
+    """
+    def transformation_hint(self, info, target):
+        hint = cr.TransformationInfo()
+        hint.__dict__.update(info.__dict__)
+        hint.dst_lbl = "assistant_funcs"
+        hint.dst_base = get_base("assistant_funcs", 0)
+        return cr.LinearTransformation(np.eye(hint.dst_base.size * (info.dst_order + 1))), hint
+
+
 class CollocatedTestCase(unittest.TestCase):
     def setUp(self):
         interval = (0, 1)
@@ -63,6 +75,67 @@ class CollocatedTestCase(unittest.TestCase):
         res = law(self.weights, self.weight_label)["output"]
         self.assertAlmostEqual(res, 1 * np.exp(1))
 
+    def test_batch(self):
+        cfs = ct.approximate_control_law(ct.ControlLaw([self.term1, self.term2, self.term3]))
+        law = ct.LawEvaluator(cfs)
+        weights = np.array([self.weights, 2 * self.weights, np.arange(6)])
+        single = np.ravel([law(w, self.weight_label)["output"] for w in weights])
+        self.assertEqual(len(law._compiled), 1)
+        self.assertTrue(np.allclose(law.evaluate_batch(weights, self.weight_label), single))
+
+        # controller evaluates without recording
+        controller = ct.Controller(ct.ControlLaw([self.term1, self.term2, self.term3]))
+        self.assertTrue(np.allclose(controller.evaluate_batch(weights, self.weight_label), single))
+        self.assertEqual(len(controller._time_storage), 0)
+
+    def test_transformed_weights(self):
+        law = ct.LawEvaluator(ct.approximate_control_law(ct.ControlLaw([self.term1, self.term2])))
+        nodes, funcs = sf.cure_interval(sf.LagrangeFirstOrder, (0, 1), 5)
+        register_base("fine_funcs", funcs, overwrite=True)
+        weights = np.hstack((np.linspace(0, 1, 5), np.ones(5)))
+
+        # the weights are also returned in the base of the law, they are only transformed when they are read
+        res = law(weights, "fine_funcs")
+        self.assertEqual(set(res), {self.weight_label, "output"})
+        self.assertTrue(np.allclose(res["output"], 5))
+        self.assertEqual(res._values, {})
+        self.assertTrue(np.allclose(res[self.weight_label], [0, .5, 1, 1, 1, 1]))
+
+        controller = ct.Controller(ct.ControlLaw([self.term1, self.term2]))
+        controller(time=0, weights=weights, weight_lbl="fine_funcs")
+        controller(time=1, weights=2 * weights, weight_lbl="fine_funcs")
+        self.assertTrue(np.allclose(controller.get_results([0, 1], result_key=self.weight_label),
+                                    [res[self.weight_label], 2 * np.array(res[self.weight_label])]))
+        self.assertTrue(np.allclose(np.ravel(controller.get_results([0, 1])), [5, 10]))
+
+        # the law is compiled again for a base that has been registered anew
+        nodes, funcs = sf.cure_interval(sf.LagrangeFirstOrder, (0, 2), 5)
+        register_base("fine_funcs", funcs, overwrite=True)
+        res = law(weights, "fine_funcs")
+        self.assertTrue(np.allclose(res[self.weight_label], [0, .25, .5, 1, 1, 1]))
+        self.assertTrue(np.allclose(res["output"], 4))
+
+    def test_assistant_base(self):
+        nodes, funcs = sf.cure_interval(sf.LagrangeFirstOrder, (0, 1), 3)
+        register_base("assistant_funcs", funcs, overwrite=True)
+        register_base("assisted_funcs", np.array([AssistedFunction(func._function_handle, domain=(0, 1),
+                                                                   vectorial=True) for func in funcs]),
+                      overwrite=True)
+        law = ct.LawEvaluator(ct.approximate_control_law(ct.ControlLaw(
+            [ph.ScalarTerm(ph.FieldVariable("assisted_funcs", location=1))])))
+        weights = np.array([0, 1, 2])
+        self.assertTrue(np.allclose(law(weights, self.weight_label)["output"], 2))
+
+        # the gain is compiled again if the assistant system is registered anew
+        nodes, funcs = sf.cure_interval(sf.LagrangeFirstOrder, (0, 2), 3)
+        register_base("assistant_funcs", funcs, overwrite=True)
+        output = law(weights, self.weight_label)["output"]
+        self.assertFalse(np.allclose(output, 2))
+        cr.clear_transformation_cache()
+        fresh_law = ct.LawEvaluator(ct.approximate_control_law(ct.ControlLaw(
+            [ph.ScalarTerm(ph.FieldVariable("assisted_funcs", location=1))])))
+        self.assertTrue(np.allclose(output, fresh_law(weights, self.weight_label)["output"]))
+
 
 class ContinuousTestCase(unittest.TestCase):
 
@@ -1,9 +1,10 @@
 import sys
 import unittest
+import copy
 from numbers import Number
 import numpy as np
 
-from pyinduct import register_base, get_base, core, shapefunctions
+from pyinduct import register_base, deregister_base, get_base, is_registered, core, shapefunctions
 
 if any([arg == 'discover' for arg in sys.argv]):
     show_plots = False
@@ -134,6 +135,94 @@ class FunctionTestCase(unittest.TestCase):
         self.assertIsInstance(f(list(range(10))), np.ndarray)
         self.assertTrue(np.array_equal(f(list(range(10))), [func(val) for val in range(10)]))
 
+    def test_arithmetic(self):
+        f = core.Function(np.sin, derivative_handles=[np.cos, lambda z: -np.sin(z)], vectorial=True)
+        g = core.Function(np.exp, domain=(0, 5), derivative_handles=[np.exp])
+        z = np.linspace(0, 5, 21)
+
+        # constants are folded and scales merged into one weighted sum
+        expr = 2 * (3 * f) - g / 2 + 1 - np.float64(2)
+        self.assertIsInstance(expr, core.FunctionExpression)
+        self.assertEqual(expr.constant, -1)
+        self.assertEqual([weight for func, weight in expr.operands], [6, -.5])
+        self.assertEqual(expr.domain, [(0, 5)])
+        self.assertTrue(np.allclose(expr(z), 6 * np.sin(z) - np.exp(z) / 2 - 1))
+        self.assertIsInstance(expr(1), Number)
+        self.assertRaises(ValueError, expr, 6)
+        self.assertIs(f * 0 + g, g)
+        self.assertEqual(sum([f, f, -f]), f)
+
+        # equal factors are collected
+        expr = f * g ** 2 / f ** 3
+        self.assertEqual(expr.kind, "product")
+        self.assertEqual([weight for func, weight in expr.operands], [-2, 2])
+        self.assertTrue(np.allclose(expr(z[1:]), np.exp(2 * z[1:]) / np.sin(z[1:]) ** 2))
+
+        # product and chain rule
+        self.assertTrue(np.allclose((f * g).derive(1)(z), np.exp(z) * (np.sin(z) + np.cos(z))))
+        self.assertTrue(np.allclose((f ** 3 + f).derive(2)(z), 6 * np.sin(z) * np.cos(z) ** 2
+                                    - 3 * np.sin(z) ** 3 - np.sin(z)))
+        self.assertRaises(ValueError, (f * g).derive, 2)
+
+        # expressions that fold to a constant have vanishing derivatives
+        for expr in [f * 0, f - f, (2 * f) / f]:
+            self.assertTrue(np.allclose(expr.derive(1)(z), 0))
+            self.assertTrue(np.allclose(expr.derive(2)(z), 0))
+
+        # ... which ends their registration
+        register_base("constant_funcs", np.array([(2 * f) / f, f * 0]), overwrite=True)
+        self.assertTrue(np.allclose(get_base("constant_funcs", 1)[0](z), 0))
+        self.assertRaises(ValueError, get_base, "constant_funcs", 2)
+        deregister_base("constant_funcs")
+
+        # products of polynomials stay exact
+        nodes, funcs = shapefunctions.cure_interval(shapefunctions.LagrangeFirstOrder, (0, 1), node_count=3)
+        self.assertIsInstance(2 * funcs[0] * funcs[1] ** 2, core.PolynomialFunction)
+
+        self.assertRaises(TypeError, lambda: f * "2")
+
+    def test_evaluate_vectorized(self):
+        z = np.linspace(0, 1, 5)
+        self.assertTrue(np.allclose(core._evaluate_vectorized(np.sin, z), np.sin(z)))
+
+        # handles that only accept scalars or do not map z elementwise are evaluated point by point
+        self.assertTrue(np.allclose(core._evaluate_vectorized(lambda val: float(val) ** 2, z, dtype=float), z ** 2))
+        self.assertTrue(np.allclose(core._evaluate_vectorized(lambda val: np.max(val), z), z))
+        self.assertTrue(np.array_equal(core._evaluate_vectorized(lambda val: 2, z), 2 * np.ones(5)))
+
+        # unless they are known to be constant
+        values = core._evaluate_vectorized(lambda val: 2, z, constant=True)
+        self.assertEqual(values.shape, z.shape)
+        self.assertTrue(np.array_equal(values, 2 * np.ones(5)))
+
+    def test_numpy_operands(self):
+        f = core.Function(np.sin, vectorial=True)
+        g = core.Function(np.cos, vectorial=True)
+        z = np.linspace(0, 1, 11)
+
+        # numpy scalars are handled like numbers
+        for expr in [np.float64(2) * f, f * np.float64(2), np.int64(2) * f]:
+            self.assertIsInstance(expr, core.FunctionExpression)
+            self.assertTrue(np.allclose(expr(z), 2 * np.sin(z)))
+
+        # arrays are combined elementwise and yield arrays of functions
+        funcs = np.array([f, g])
+        doubled = [2 * np.sin(z), 2 * np.cos(z)]
+        shifted = [2 * np.sin(z), np.cos(z) + np.sin(z)]
+        for res, desired in [(funcs * 2, doubled), (2 * funcs, doubled), (np.array([2, 2]) * funcs, doubled),
+                             (funcs * np.array([2., 2.]), doubled), (np.array([1., 1.]) * f + funcs, shifted),
+                             (funcs + f * np.array([1, 1]), shifted)]:
+            self.assertIsInstance(res, np.ndarray)
+            self.assertEqual(res.shape, (2, ))
+            self.assertTrue(np.allclose([func(z) for func in res], desired))
+        res = np.dot(funcs, np.array([[1, 2], [3, 4]]))
+        self.assertTrue(np.allclose([func(z) for func in res], [np.sin(z) + 3 * np.cos(z),
+                                                                2 * np.sin(z) + 4 * np.cos(z)]))
+        self.assertTrue(np.allclose(np.sum(funcs)(z), np.sin(z) + np.cos(z)))
+
+        # functions are no arrays
+        self.assertRaises((TypeError, AttributeError), np.sin, f)
+
 
 # class MatrixFunctionTestCase(unittest.TestCase):
 #
@@ -201,6 +290,13 @@ class IntersectionTestCase(unittest.TestCase):
                          [(-10, -5), (3, 5)], (10, 17))
 
 
+def plain_function(func):
+    """
+    copy of *func* as plain :py:class:`pyinduct.core.Function` , hence without closed-form shortcuts
+    """
+    return core.Function(func._function_handle, domain=func.domain, nonzero=func.nonzero)
+
+
 class DotProductL2TestCase(unittest.TestCase):
 
     def setUp(self):
@@ -226,6 +322,40 @@ class DotProductL2TestCase(unittest.TestCase):
         self.assertAlmostEqual(core.dot_product_l2(self.f7, self.f6), 1/6)
         self.assertAlmostEqual(core.dot_product_l2(self.f5, self.f5), 2/3)
 
+    def test_scalar_product_matrix(self):
+        base = np.array([self.f5, self.f6, self.f7, self.f1, self.f4])
+        i, j = np.mgrid[0:base.size, 0:base.size]
+        self.assertTrue(np.allclose(core.calculate_scalar_product_matrix(core.dot_product_l2, base, base),
+                                    core.dot_product_l2(base[i], base[j])))
+
+        # supports of several intervals
+        split = core.Function(lambda z: 1, domain=(0, 3), nonzero=[(2.5, 3), (0, .5)])
+        start = core.Function(lambda z: 1, domain=(0, 3), nonzero=(0, .5))
+        middle = core.Function(lambda z: 1, domain=(0, 3), nonzero=(1, 2))
+        end = core.Function(lambda z: 1, domain=(0, 3), nonzero=(2.5, 3))
+        base = np.array([split, start, middle, end])
+        i, j = np.mgrid[0:base.size, 0:base.size]
+        mat = core.calculate_scalar_product_matrix(core.dot_product_l2, base, base)
+        self.assertTrue(np.allclose(mat, core.dot_product_l2(base[i], base[j])))
+        self.assertAlmostEqual(mat[0, 1], .5)
+        self.assertAlmostEqual(mat[0, 3], .5)
+
+    def test_exponential_sum(self):
+        # sin(2z) and exp(-z) as sums of exponentials
+        sin = core.ExponentialSumFunction(lambda z: np.sin(2*z), [.5j, -.5j], [-2j, 2j], nonzero=(0, 3),
+                                          derivative_handles=[lambda z: 2*np.cos(2*z)])
+        exp = core.ExponentialSumFunction(lambda z: np.exp(-z), 1, -1, domain=(0, 3))
+        const = core.ExponentialSumFunction(lambda z: 1, 1, 0, nonzero=[(0, 1), (2, 3)])
+
+        for first, second in [(sin, exp), (sin, sin), (exp, const), (sin, const), (sin.derive(), exp.scale(3))]:
+            self.assertIsInstance(first, core.ExponentialSumFunction)
+            self.assertIsInstance(second, core.ExponentialSumFunction)
+            self.assertAlmostEqual(core.dot_product_l2(first, second),
+                                   core.dot_product_l2(plain_function(first), plain_function(second)))
+
+        # no shortcut without representation
+        self.assertIsNone(core.ExponentialSumFunction(np.sin, None, None).exponential_terms())
+
 
 class ProjectionTest(unittest.TestCase):
 
@@ -298,6 +428,31 @@ class ProjectionTest(unittest.TestCase):
         pass
 
 
+def get_info(src_lbl, dst_lbl, src_order=0, dst_order=0):
+    """
+    transformation info between the registered bases *src_lbl* and *dst_lbl*
+    """
+    info = core.TransformationInfo()
+    info.src_lbl = src_lbl
+    info.dst_lbl = dst_lbl
+    info.src_base = get_base(src_lbl, 0)
+    info.dst_base = get_base(dst_lbl, 0)
+    info.src_order = src_order
+    info.dst_order = dst_order
+    return info
+
+
+class ScaledFunction(core.Function):
+    """
+    function, whose weights are given by the doubled weights of the assistant base 'trig_funcs'
+    """
+    def transformation_hint(self, info, target):
+        hint = copy.copy(info)
+        hint.dst_lbl = "trig_funcs"
+        hint.dst_base = get_base("trig_funcs", 0)
+        return core.LinearTransformation(2 * np.eye(2)), hint
+
+
 class ChangeProjectionBaseTest(unittest.TestCase):
 
     def setUp(self):
@@ -353,8 +508,254 @@ class ChangeProjectionBaseTest(unittest.TestCase):
         # should fit pretty nice
         self.assertLess(error, 1e-2)
 
+    def test_weight_transformation(self):
+        register_base("trig_funcs", self.trig_test_funcs, overwrite=True)
+        info = core.TransformationInfo()
+        info.src_lbl = "test_funcs"
+        info.dst_lbl = "trig_funcs"
+        info.src_base = self.src_test_funcs
+        info.dst_base = self.trig_test_funcs
+        info.src_order = 0
+        info.dst_order = 0
+
+        handle = core.get_weight_transformation(info)
+        self.assertIsInstance(handle, core.LinearTransformation)
+        self.assertTrue(np.allclose(handle(self.src_weights),
+                                    core.change_projection_base(self.src_weights, self.src_test_funcs,
+                                                                self.trig_test_funcs)))
+
+        # a hint via an assistant system is collapsed into one matrix
+        scaled_funcs = np.array([ScaledFunction(func._function_handle, domain=(0, 1))
+                                 for func in self.trig_test_funcs])
+        register_base("scaled_funcs", scaled_funcs, overwrite=True)
+        info.dst_lbl = "scaled_funcs"
+        info.dst_base = scaled_funcs
+        scaled_handle = core.get_weight_transformation(info)
+        self.assertIsInstance(scaled_handle, core.LinearTransformation)
+        self.assertTrue(np.allclose(scaled_handle.matrix, 2 * handle.matrix))
+
+    def test_transformation_cache(self):
+        register_base("trig_funcs", self.trig_test_funcs, overwrite=True)
+        register_base("scaled_funcs", np.array([ScaledFunction(func._function_handle, domain=(0, 1))
+                                                for func in self.trig_test_funcs]), overwrite=True)
+
+        handle = core.get_weight_transformation(get_info("test_funcs", "trig_funcs"))
+        self.assertIs(core.get_weight_transformation(get_info("test_funcs", "trig_funcs")), handle)
+
+        # the chain via the assistant system collapses into one matrix
+        scaled_handle = core.get_weight_transformation(get_info("trig_funcs", "scaled_funcs"))
+        self.assertTrue(np.allclose(scaled_handle.matrix, 2 * np.eye(2)))
+        composed_handle = core.get_weight_transformation(get_info("test_funcs", "scaled_funcs"))
+        self.assertTrue(np.allclose(composed_handle.matrix, 2 * handle.matrix))
+        self.assertIs(core.get_weight_transformation(get_info("test_funcs", "scaled_funcs")), composed_handle)
+
+        # registering a base anew invalidates its transformations, also if it is only an assistant system
+        register_base("trig_funcs", self.trig_test_funcs[::-1], overwrite=True)
+        new_handle = core.get_weight_transformation(get_info("test_funcs", "trig_funcs"))
+        self.assertTrue(np.allclose(new_handle.matrix, handle.matrix[::-1]))
+        new_composed_handle = core.get_weight_transformation(get_info("test_funcs", "scaled_funcs"))
+        self.assertIsNot(new_composed_handle, composed_handle)
+        self.assertTrue(np.allclose(new_composed_handle.matrix, 2 * new_handle.matrix))
+        core.clear_transformation_cache()
+        self.assertTrue(np.allclose(core.get_weight_transformation(get_info("test_funcs", "scaled_funcs")).matrix,
+                                    new_composed_handle.matrix))
+
+    def test_transformation_hint(self):
+        register_base("trig_funcs", self.trig_test_funcs, overwrite=True)
+        register_base("scaled_funcs", np.array([ScaledFunction(func._function_handle, domain=(0, 1))
+                                                for func in self.trig_test_funcs]), overwrite=True)
+        register_base("cos_funcs", np.array([core.Function(lambda z: np.cos(z), domain=(0, 1)),
+                                             core.Function(lambda z: np.cos(2 * z), domain=(0, 1))]), overwrite=True)
+
+        # the chain test_funcs -> cos_funcs -> scaled_funcs is known, but the hint demands trig_funcs
+        first = core.get_weight_transformation(get_info("test_funcs", "cos_funcs"))
+        second = core.get_weight_transformation(get_info("cos_funcs", "scaled_funcs"))
+        chain = np.dot(second.matrix, first.matrix)
+        handle = core.get_weight_transformation(get_info("test_funcs", "scaled_funcs"))
+        hinted = 2 * core.calculate_expanded_base_transformation_matrix(get_base("test_funcs", 0),
+                                                                        get_base("trig_funcs", 0), 0, 0)
+        self.assertTrue(np.allclose(handle.matrix, hinted))
+        self.assertFalse(np.allclose(chain, hinted))
+
     def tearDown(self):
-        pass
+        core.clear_transformation_cache()
+        for lbl in ["trig_funcs", "scaled_funcs", "cos_funcs"]:
+            if is_registered(lbl):
+                deregister_base(lbl)
+
+
+class TabulatedFunctionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.z = np.linspace(0, 2, 41)
+        self.base = core.tabulate_base(self.z, np.vstack((np.sin(self.z), np.cos(self.z), self.z ** 2)))
+
+    def test_evaluation(self):
+        sin = core.TabulatedFunction(self.z, np.sin(self.z))
+        z = np.linspace(0, 2, 1000)
+        self.assertTrue(np.allclose(sin(z), np.sin(z), atol=1e-6))
+        self.assertIsInstance(sin(.3), Number)
+        self.assertTrue(np.allclose(sin.derive(1)(z), np.cos(z), atol=1e-4))
+        self.assertTrue(np.allclose(sin.derive(2)(z), -np.sin(z), atol=1e-2))
+        self.assertRaises(ValueError, sin.derive, 4)
+        self.assertTrue(np.allclose(sin.scale(3)(z), 3 * sin(z)))
+        self.assertTrue(np.allclose(sin.scale(np.exp)(z), np.exp(z) * sin(z)))
+        self.assertTrue(np.allclose(self.base[0](z), sin(z)))
+        self.assertRaises(ValueError, sin, 3)
+        self.assertRaises(ValueError, core.TabulatedFunction, self.z)
+
+    def test_shared_table(self):
+        table = self.base[0].coefficients.base
+        self.assertEqual(table.shape, (3, 4, self.z.size - 1))
+        self.assertTrue(all([func.coefficients.base is table for func in self.base]))
+
+        # functions work on a given table without copying it
+        func = core.tabulate_base(self.z, coefficients=table)[2]
+        self.assertTrue(np.shares_memory(func.coefficients, table))
+        self.assertAlmostEqual(func(1.5), 2.25)
+
+        register_base("tabulated_funcs", self.base, overwrite=True)
+        self.assertEqual(len(get_base("tabulated_funcs", 3)), 3)
+        self.assertRaises(ValueError, get_base, "tabulated_funcs", 4)
+
+    def test_dot_product(self):
+        # z^2 is reproduced by the spline, hence the product is exact
+        self.assertAlmostEqual(core.dot_product_l2(self.base[2], self.base[2]), 32 / 5, places=12)
+        for first, second in [(self.base[0], self.base[1]), (self.base[1].derive(1), self.base[2].scale(2)),
+                              (self.base[0], core.TabulatedFunction(np.linspace(.5, 3, 7), np.ones(7)))]:
+            self.assertAlmostEqual(core.dot_product_l2(first, second),
+                                   core.dot_product_l2(plain_function(first), plain_function(second)), places=6)
+
+
+class PolynomialFunctionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # hat function and a parabola that only overlap partially
+        self.hat = core.PolynomialFunction([0, 1, 2], [[0, 1], [2, -1]])
+        self.parabola = core.PolynomialFunction([.5, 3], [np.polynomial.Polynomial.fromroots([.5, 3])], domain=(0, 3))
+        self.z = np.linspace(0, 3, 61)
+
+    def test_evaluation(self):
+        self.assertTrue(np.allclose(self.hat(np.array([-1, .5, 1, 1.5, 2.5])), [0, .5, 1, .5, 0]))
+        self.assertIsInstance(self.hat(.3), Number)
+        self.assertTrue(np.allclose(self.hat.derive(1)(np.array([0, .5, 1, 1.5, 2])), [.5, 1, 0, -1, -.5]))
+        self.assertRaises(ValueError, self.hat.derive, 2)
+
+        # the function itself is evaluated one-sided at the ends of its support
+        step = core.PolynomialFunction([0, 1], [[1]])
+        self.assertEqual(step(np.array([0, 1])).tolist(), [1, 1])
+        self.assertEqual(step.scale(2)(1), 2)
+
+        # for derivatives only ends that are borders of the domain are evaluated one-sided
+        self.assertAlmostEqual(self.parabola.derive(1)(.5), -1.25)
+        self.assertAlmostEqual(self.parabola.derive(1)(3), 2.5)
+        self.assertRaises(ValueError, self.parabola, 4)
+
+    def test_arithmetic(self):
+        product = self.hat.multiply(self.parabola)
+        self.assertIsInstance(product, core.PolynomialFunction)
+        self.assertTrue(np.allclose(product.breakpoints, [.5, 1, 2]))
+        self.assertTrue(np.allclose(product(self.z), self.hat(self.z) * self.parabola(self.z)))
+        self.assertTrue(np.allclose(self.hat.scale(self.parabola)(self.z), product(self.z)))
+        self.assertTrue(np.allclose(product.derive(2)(np.array([.7, 1.5])), [-2.8, 2]))
+
+        self.assertIsInstance(self.hat.raise_to(3), core.PolynomialFunction)
+        self.assertTrue(np.allclose(self.hat.raise_to(3)(self.z), self.hat(self.z) ** 3))
+        self.assertTrue(np.allclose(self.hat.raise_to(.5)(self.z), np.sqrt(self.hat(self.z))))
+        self.assertIsInstance(self.hat.scale(2), core.PolynomialFunction)
+        self.assertTrue(np.allclose(self.hat.scale(np.exp)(self.z), np.exp(self.z) * self.hat(self.z)))
+
+    def test_integrals(self):
+        self.assertEqual(core.integrate_function(self.hat, self.hat.nonzero)[0], 1)
+        self.assertAlmostEqual(core.integrate_function(self.hat.raise_to(2), [(.5, 1.5)])[0], 7 / 12)
+        self.assertAlmostEqual(core.dot_product_l2(self.hat, self.hat), 2 / 3, places=15)
+        self.assertAlmostEqual(core.dot_product_l2(self.hat, self.parabola),
+                               core.integrate_function(lambda z: self.hat(z) * self.parabola(z), [(.5, 2)])[0])
+
+
+class PodBasisTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.nodes, self.funcs = shapefunctions.cure_interval(shapefunctions.LagrangeFirstOrder, (0, 1),
+                                                              node_count=11)
+        register_base("pod_fem_funcs", self.funcs, overwrite=True)
+
+        # snapshots that are spanned by two spatial profiles
+        t = np.linspace(0, 1, 50)
+        profile_a = self.nodes[:]
+        profile_b = self.nodes[:] ** 2
+        self.weights = np.outer(np.sin(2 * np.pi * t), profile_a) + np.outer(t, profile_b)
+
+    def test_rank(self):
+        modes, sing_values = core.generate_pod_basis(self.weights, "pod_fem_funcs")
+        self.assertEqual(modes.size, 2)
+
+        # modes have to be orthonormal
+        gram_mat = core.calculate_scalar_product_matrix(core.dot_product_l2, modes, modes)
+        self.assertTrue(np.allclose(gram_mat, np.eye(2)))
+
+        # derivatives are provided
+        self.assertIsInstance(modes[0].derive(1), core.Function)
+
+    def test_selection(self):
+        modes, sing_values = core.generate_pod_basis(self.weights, "pod_fem_funcs", n_modes=1)
+        self.assertEqual(modes.size, 1)
+        modes, _ = core.generate_pod_basis(self.weights, "pod_fem_funcs", energy=.5)
+        self.assertEqual(modes.size, 1)
+        modes, _ = core.generate_pod_basis(self.weights, "pod_fem_funcs", energy=1)
+        self.assertEqual(modes.size, 2)
+        self.assertRaises(ValueError, core.generate_pod_basis, self.weights, "pod_fem_funcs", n_modes=20)
+        self.assertRaises(ValueError, core.generate_pod_basis, self.weights[:, :5], "pod_fem_funcs")
+
+    def test_registration(self):
+        modes, _ = core.generate_pod_basis(self.weights, "pod_fem_funcs", label="pod_funcs")
+        self.assertTrue(is_registered("pod_funcs"))
+        self.assertEqual(get_base("pod_funcs", 1).size, 2)
+
+        # snapshots are reproduced by the reduced basis
+        pod_weights = core.change_projection_base(self.weights.T, self.funcs, modes)
+        fem_weights = core.change_projection_base(pod_weights, modes, self.funcs)
+        self.assertTrue(np.allclose(fem_weights, self.weights.T))
+
+    def test_modes(self):
+        modes, _ = core.generate_pod_basis(self.weights, "pod_fem_funcs")
+        pod_weights = core.change_projection_base(self.weights.T, self.funcs, modes)
+
+        # the modes of a lagrangian base are exact linear combinations of the shape functions
+        z = np.linspace(0, 1, 137)
+        self.assertTrue(all([isinstance(mode, core.PolynomialFunction) for mode in modes]))
+        base_values = np.array([func(z) for func in self.funcs])
+        mode_values = np.array([mode(z) for mode in modes])
+        self.assertTrue(np.allclose(np.dot(pod_weights.T, mode_values), np.dot(self.weights, base_values)))
+        for order in range(2):
+            der_values = np.array([func.derive(order)(z) for func in self.funcs])
+            self.assertTrue(np.allclose(modes[0].derive(order)(z), np.dot(der_values.T, np.linalg.lstsq(
+                base_values.T, mode_values[0], rcond=None)[0])))
+
+        # other bases are combined numerically
+        funcs = np.array([core.Function(np.sin, domain=(0, np.pi), nonzero=(0, np.pi), derivative_handles=[np.cos]),
+                          core.Function(np.cos, domain=(0, np.pi), nonzero=(0, np.pi),
+                                        derivative_handles=[lambda z: -np.sin(z)])])
+        register_base("pod_funcs", funcs, overwrite=True)
+        modes, _ = core.generate_pod_basis(np.outer(np.linspace(1, 2, 5), [1, 2]), "pod_funcs")
+        self.assertEqual(modes.size, 1)
+        self.assertEqual(modes[0].nonzero, [(0, np.pi)])
+        z = np.linspace(0, np.pi, 7)
+        self.assertTrue(np.allclose(np.abs(modes[0](z)), np.abs(np.sin(z) + 2 * np.cos(z)) / np.sqrt(5 * np.pi / 2)))
+        self.assertTrue(np.allclose(np.abs(modes[0].derive(1)(z)),
+                                    np.abs(np.cos(z) - 2 * np.sin(z)) / np.sqrt(5 * np.pi / 2)))
+
+    def test_support_hull(self):
+        # the areas may be given in any order
+        func = core.Function(lambda z: 1, domain=(0, 3), nonzero=[(0, .5), (2.5, 3)])
+        func.nonzero = func.nonzero[::-1]
+        self.assertEqual(core._support_hull([func]), (0, 3))
+        self.assertEqual(core._support_hull(self.funcs[2:5]), (self.nodes[1], self.nodes[5]))
+
+    def tearDown(self):
+        deregister_base("pod_fem_funcs")
+        if is_registered("pod_funcs"):
+            deregister_base("pod_funcs")
 
 
 class NormalizeFunctionsTestCase(unittest.TestCase):
@@ -1,4 +1,5 @@
 import sys
+import math
 import unittest
 import numpy as np
 import matplotlib.pyplot as plt
@@ -7,7 +8,11 @@ from pyinduct import get_base, register_base, \
     utils as ut, \
     eigenfunctions as ef, \
     visualization as vt, \
-    placeholder as ph
+    placeholder as ph, \
+    shapefunctions as sh, \
+    trajectory as tr
+
+from tests.test_core import plain_function
 
 if any([arg == 'discover' for arg in sys.argv]):
     show_plots = False
@@ -29,6 +34,23 @@ class TestAddMulFunction(unittest.TestCase):
         x = np.dot(b, A)
         self.assertAlmostEqual([4, 40, 300], [x[0](4), x[1](20), x[2](100)])
 
+    def test_function_checks(self):
+        # the wrapper is a Function on the whole real line
+        func = ef.AddMulFunction(lambda z: z)
+        self.assertIsInstance(func, cr.Function)
+        self.assertEqual(func.domain, [(-np.inf, np.inf)])
+        self.assertEqual(func.nonzero, [(-np.inf, np.inf)])
+        self.assertEqual((func * 2 + func)(3), 9)
+
+        # hence the handle is checked on construction
+        self.assertRaises(TypeError, ef.AddMulFunction, 1)
+        self.assertRaises(TypeError, ef.AddMulFunction, lambda z: "z")
+        self.assertRaises(TypeError, ef.AddMulFunction, lambda z: np.array([z, z]))
+
+        # and only numbers and functions are accepted as factors
+        self.assertRaises(TypeError, lambda: func * [1, 2])
+        self.assertEqual([part(3) for part in func * np.array([1, 2])], [3, 6])
+
 
 class FiniteTransformTest(unittest.TestCase):
 
@@ -89,6 +111,40 @@ class FiniteTransformTest(unittest.TestCase):
                 plt.plot(z, eig_funcs[i](z))
             plt.show()
 
+    def test_vectorized(self):
+        l = 5.
+        k1, k2, b = ut.split_domain(7, 2, l, mode='coprime')[0:3]
+        M = np.linalg.inv(ut.get_inn_domain_transformation_matrix(k1, k2, mode="2n"))
+        n = int(M.shape[0] / 2)
+        l0 = l / n
+        scale_func = lambda z: np.exp(.3 * z)
+        shifted_func = ef.FiniteTransformFunction(np.cos, M, b, l, scale_func=scale_func)
+
+        def reference(z):
+            i = int(z / l0)
+            zz = z % l0
+            if np.isclose(z, l0 * i) and not np.isclose(0, zz):
+                zz = 0
+            args = np.hstack((np.arange(n) * l0 + zz, l - np.arange(n) * l0 - zz))
+            return np.dot(M[i], np.cos(args) * scale_func(args))
+
+        z = np.hstack((np.linspace(0, l, 1001), np.arange(n + 1) * l0))
+        values = shifted_func(z)
+        self.assertEqual(values.shape, z.shape)
+        self.assertTrue(np.allclose(values, [reference(val) for val in z]))
+        self.assertAlmostEqual(shifted_func(2.1), reference(2.1))
+        self.assertRaises(ValueError, shifted_func._call_transformed_func, -1)
+
+        # handles that only accept scalars are evaluated point by point
+        scalar_func = ef.FiniteTransformFunction(lambda z: math.cos(z), M, b, l,
+                                                 scale_func=lambda z: math.exp(.3 * z))
+        self.assertAlmostEqual(scalar_func(2.1), reference(2.1))
+        self.assertTrue(np.allclose(scalar_func(z), values))
+
+        with self.assertWarns(DeprecationWarning):
+            nested_func = ef.FiniteTransformFunction(np.cos, M, b, l, scale_func=scale_func, nested_lambda=True)
+        self.assertTrue(np.allclose(nested_func(z), values))
+
     def test_segmentation_fault(self):
 
         if show_plots:
@@ -152,6 +208,88 @@ class TestSecondOrderRobinEigenvalueProblemFuctions(unittest.TestCase):
         if show_plots:
             plt.show()
 
+    def test_family(self):
+        a2, a1, a0, alpha, beta = self.param
+        eig_freq = np.array([func._om for func in self.eig_funcs])
+        family = ef.SecondOrderRobinEigenfunctionFamily(eig_freq, self.param, (0, 1))
+        self.assertEqual(len(family), self.n)
+
+        for order in range(3):
+            values = family.evaluate(self.z, order)
+            self.assertEqual(values.shape, (self.n, self.z.size))
+            self.assertIs(family.evaluate(self.z, order), values)
+            for idx, eig_f in enumerate(self.eig_funcs):
+                member = family.functions[idx].derive(order)
+                self.assertTrue(np.allclose(values[idx], eig_f.derive(order)(self.z)))
+                self.assertTrue(np.allclose(member(self.z), values[idx]))
+                self.assertTrue(np.array_equal(member.evaluation_hint(self.z), values[idx]))
+                self.assertAlmostEqual(member(.5), eig_f.derive(order)(.5))
+
+        self.assertRaises(ValueError, family.functions[0].derive, 3)
+        family.register("robin_family", overwrite=True)
+        self.assertEqual(get_base("robin_family", 2).shape, (self.n, ))
+
+        # dirichlet eigenfunctions solve the eigenvalue problem as well
+        om = np.arange(1, 4) * np.pi
+        family = ef.SecondOrderDirichletEigenfunctionFamily(om, self.param, (0, 1), norm_fac=np.sqrt(2))
+        eig_v = a0 - a2 * om ** 2 - a1 ** 2 / 4. / a2
+        self.assertTrue(np.allclose(a2 * family.evaluate(self.z, 2) + a1 * family.evaluate(self.z, 1)
+                                    + a0 * family.evaluate(self.z), eig_v[:, np.newaxis] * family.evaluate(self.z)))
+        for idx, freq in enumerate(om):
+            eig_f = ef.SecondOrderDirichletEigenfunction(freq, self.param, (0, 1), np.sqrt(2))
+            self.assertTrue(np.allclose(eig_f.derive(2)(self.z), family.evaluate(self.z, 2)[idx]))
+
+        # the families have to provide their evaluation
+        self.assertRaises(TypeError, ef.SecondOrderEigenfunctionFamily, om, self.param, (0, 1))
+
+    def test_dirichlet_derivatives(self):
+        a2, a1, a0, alpha, beta = self.param
+        eta = -a1 / 2. / a2
+        z = np.linspace(0, 1, 10001)
+        for om in np.arange(1, 4) * np.pi:
+            eig_f = ef.SecondOrderDirichletEigenfunction(om, self.param, (0, 1), np.sqrt(2))
+            self.assertTrue(np.allclose(eig_f.derive(2)(z),
+                                        np.sqrt(2) * np.exp(eta * z) * (2 * eta * om * np.cos(om * z)
+                                                                        + (eta ** 2 - om ** 2) * np.sin(om * z))))
+            # compare with the difference quotients of the lower derivatives
+            for order in (1, 2):
+                self.assertTrue(np.allclose(eig_f.derive(order)(z)[1:-1],
+                                            np.gradient(eig_f.derive(order - 1)(z), z)[1:-1], rtol=1e-4, atol=1e-4))
+
+    def test_closed_form_dot_product(self):
+        # the first eigenfrequency is imaginary
+        eig_funcs = self.eig_funcs[:4]
+        family = ef.SecondOrderRobinEigenfunctionFamily([func._om for func in eig_funcs], self.param, (0, 1))
+
+        for order in range(3):
+            funcs = np.array([func.derive(order) for func in eig_funcs])
+            plain_funcs = np.array([plain_function(func) for func in funcs])
+            self.assertTrue(all([func.exponential_terms() is not None for func in funcs]))
+            expected = cr.calculate_scalar_product_matrix(cr.dot_product_l2, plain_funcs, eig_funcs)
+            self.assertTrue(np.allclose(cr.calculate_scalar_product_matrix(cr.dot_product_l2, funcs, eig_funcs),
+                                        expected))
+            members = np.array([func.derive(order) for func in family.functions])
+            self.assertTrue(np.allclose(cr.calculate_scalar_product_matrix(cr.dot_product_l2, members,
+                                                                           family.functions), expected))
+
+        normed = cr.normalize_function(self.eig_funcs[1])
+        self.assertIsNotNone(normed.exponential_terms())
+        self.assertAlmostEqual(cr.dot_product_l2(normed, normed), 1)
+
+        # eigenfrequency zero has no closed form
+        self.assertIsNone(ef.SecondOrderRobinEigenfunction(0, self.param, (0, 1)).exponential_terms())
+
+        # dirichlet eigenfunctions
+        dirichlet_funcs = np.array([ef.SecondOrderDirichletEigenfunction(om, self.param, (0, 1), np.sqrt(2))
+                                    for om in np.arange(1, 4) * np.pi])
+        for order in range(3):
+            funcs = np.array([func.derive(order) for func in dirichlet_funcs])
+            plain_funcs = np.array([plain_function(func) for func in funcs])
+            self.assertTrue(all([func.exponential_terms() is not None for func in funcs]))
+            self.assertTrue(np.allclose(cr.calculate_scalar_product_matrix(cr.dot_product_l2, funcs, dirichlet_funcs),
+                                        cr.calculate_scalar_product_matrix(cr.dot_product_l2, plain_funcs,
+                                                                           dirichlet_funcs)))
+
     def test_spatially_varying_coefficient(self):
 
         # TODO: provide second derivative of transformed eigenfunctions
@@ -164,6 +302,97 @@ class TestSecondOrderRobinEigenvalueProblemFuctions(unittest.TestCase):
                                            eig_v.real*eig_f(self.z),
                                            rtol=1e-3)))
 
+    def test_transformed_family(self):
+        init_states = [[eig_f(0), eig_f.derive(1)(0), 0, 0] for eig_f in self.eig_funcs]
+        family = ef.TransformedSecondOrderEigenfunctionFamily(self.eig_val, init_states,
+                                                              [self.a2_z, self.a1_z, self.a0_z], self.z)
+        self.assertEqual(len(family), self.n)
+        self.assertTrue(np.allclose(family.eig_values, self.eig_val))
+        self.assertIsNone(family.eig_frequencies)
+
+        z = np.linspace(0, 1, 1001)
+        for order in range(3):
+            values = family.evaluate(z, order)
+            self.assertEqual(values.shape, (self.n, z.size))
+            for idx, eig_f in enumerate(self.eig_funcs):
+                expected = eig_f.derive(order)(z)
+                self.assertTrue(np.allclose(values[idx], expected, atol=1e-3 * np.max(np.abs(expected))))
+                self.assertTrue(np.allclose(family.functions[idx].derive(order)(z), values[idx]))
+                self.assertAlmostEqual(family.functions[idx].derive(order)(.3), values[idx][300], places=2)
+
+        # no extrapolation beyond the grid, the boundary values are kept like for the single eigenfunctions
+        outside = np.array([-.5, 0, 1, 1.5])
+        for order in range(3):
+            values = family.evaluate(outside, order)
+            self.assertTrue(np.all(np.isfinite(values)))
+            self.assertTrue(np.array_equal(values[:, 0], values[:, 1]))
+            self.assertTrue(np.array_equal(values[:, 2], values[:, 3]))
+            self.assertEqual(family.functions[0].derive(order)(1.5), values[0, 3])
+        single = self.transformed_eig_funcs[0]
+        self.assertAlmostEqual(family.functions[0](1.5), single(1.5), places=3)
+        self.assertAlmostEqual(family.functions[0](-.5), single(-.5), places=3)
+
+        # the coefficients are evaluated for all members at once
+        calls = []
+
+        def a0_z(z):
+            calls.append(z)
+            return self.param[2]
+
+        ef.TransformedSecondOrderEigenfunctionFamily(self.eig_val, init_states, [self.a2_z, self.a1_z, a0_z], self.z)
+        n_calls = len(calls)
+        ef.TransformedSecondOrderEigenfunction(self.eig_val[-1], init_states[-1], [self.a2_z, self.a1_z, a0_z],
+                                               self.z)
+        self.assertLess(n_calls, self.n * (len(calls) - n_calls))
+
+    def test_fem_family(self):
+        a2, a1, a0, alpha, beta = self.param
+        nodes, fem_funcs = sh.cure_interval(sh.LagrangeFirstOrder, (0, 1), node_count=61)
+        register_base("fem_funcs", fem_funcs, overwrite=True)
+        u = tr.RadTrajectory(1, 1, self.param, "robin", "robin")
+        weak_form = ut.get_parabolic_robin_weak_form("fem_funcs", "fem_funcs", u, self.param, (0, 1))
+
+        n = 4
+        family = ef.FemEigenfunctionFamily(weak_form, n)
+        self.assertTrue(np.allclose(family.eig_values, self.eig_val[:n].real, rtol=1e-2))
+
+        # compare with the normalized analytic eigenfunctions
+        for idx, eig_f in enumerate(self.eig_funcs[:n]):
+            desired = cr.normalize_function(eig_f)(self.z)
+            values = family.evaluate(self.z)[idx]
+            self.assertTrue(np.allclose(values, np.sign(np.dot(values, desired)) * desired, atol=1e-2))
+            self.assertTrue(np.allclose(family.functions[idx](self.z), values))
+
+        self.assertRaises(ValueError, ef.FemEigenfunctionFamily, weak_form, 61)
+
+        # the tabulated members are the linear combinations of the fem base
+        z = np.linspace(0, 1, 997)
+        for order in range(2):
+            base_values = np.array([func(z) for func in get_base("fem_funcs", order)])
+            self.assertTrue(np.allclose(family.evaluate(z, order), np.dot(family.eig_vectors.T, base_values)))
+            self.assertTrue(np.allclose(family.functions[1].derive(order)(z), family.evaluate(z, order)[1]))
+        self.assertTrue(np.array_equal(family.evaluate([-1, 2]), np.zeros((n, 2))))
+        self.assertEqual(family.functions[0](2), 0)
+        self.assertAlmostEqual(family.functions[2].derive(1)(.5),
+                               np.dot(family.eig_vectors[:, 2], [func.derive(1)(.5) for func in fem_funcs]))
+
+    def test_tabulate_modes(self):
+        nodes, fem_funcs = sh.cure_interval(sh.LagrangeSecondOrder, (0, 1), node_count=11)
+        vectors = np.random.RandomState(0).rand(len(fem_funcs), 3)
+        z = np.linspace(0, 1, 101)
+        desired = np.dot(vectors.T, np.array([func(z) for func in fem_funcs]))
+
+        # the combination of piecewise polynomials is exact
+        modes = ef._tabulate_modes(fem_funcs, vectors)
+        self.assertTrue(np.allclose(modes(z).T, desired))
+        self.assertTrue(np.allclose(modes.derivative(1)(.33).T,
+                                    np.dot(vectors.T, [func.derive(1)(.33) for func in fem_funcs])))
+
+        # other functions are sampled
+        plain_funcs = np.array([cr.Function(func, nonzero=func.nonzero) for func in fem_funcs])
+        modes = ef._tabulate_modes(plain_funcs, vectors)
+        self.assertTrue(np.allclose(modes(z).T, desired))
+
 
 class IntermediateTransformationTest(unittest.TestCase):
 
@@ -231,3 +460,11 @@ class ReturnRealPartTest(unittest.TestCase):
         self.assertRaises(ValueError, ef.return_real_part, [1, 2., 2+2j])
         self.assertRaises(ValueError, ef.return_real_part, 1+1e-10j)
         self.assertRaises(ValueError, ef.return_real_part, 1j)
+
+        # arrays keep their shape
+        real = ef.return_real_part(np.array([[1, 2 + 1e-20j]]))
+        self.assertEqual(real.shape, (1, 2))
+        self.assertFalse(np.iscomplexobj(real))
+        self.assertEqual(ef.return_real_part(np.array([1 + 0j])).shape, (1, ))
+        self.assertRaises(ValueError, ef.return_real_part, np.array([[1, 2j]]))
+        self.assertRaises(TypeError, ef.return_real_part, np.array([None, 1]))
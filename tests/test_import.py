@@ -0,0 +1,30 @@
+import unittest
+import subprocess
+import sys
+import os
+
+gui_modules = ["pyqtgraph", "PyQt4", "PyQt5", "PySide", "OpenGL", "matplotlib", "sympy"]
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    """
+    run *code* in a fresh interpreter and return its output
+    """
+    return subprocess.check_output([sys.executable, "-c", code], cwd=root_dir, universal_newlines=True)
+
+
+class HeadlessImportTestCase(unittest.TestCase):
+
+    def test_lazy_modules(self):
+        out = run_python("import sys, pyinduct; print(' '.join(sorted(sys.modules)))").split()
+        for module in gui_modules:
+            self.assertNotIn(module, out)
+
+        # the gui toolkits are loaded on first use
+        out = run_python("import sys, pyinduct.visualization as vis; vis.pg.mkPen; print('pyqtgraph' in sys.modules)")
+        self.assertEqual(out.strip(), "True")
+        out = run_python("import sys, pyinduct as pi; pi.SmoothTransition((0, 1), (0, 1), 'poly');"
+                         "print('sympy' in sys.modules)")
+        self.assertEqual(out.strip(), "True")
@@ -28,6 +28,20 @@ class CureTestCase(unittest.TestCase):
         self.assertRaises(ValueError, pyinduct.shapefunctions.cure_interval, pyinduct.shapefunctions.LagrangeFirstOrder,
                           (0, 2), 2, 1)
 
+    def test_half_elements(self):
+        # half elements that are built directly take the value 1 at their peak node
+        self.assertEqual(pi.LagrangeFirstOrder(0, 1, 1, half="right")(0), 1)
+        self.assertEqual(pi.LagrangeFirstOrder(0, 0, 1, half="left")(1), 1)
+        self.assertEqual(pi.LagrangeSecondOrder(0, .5, 1, curvature="concave", half="left")(0), 1)
+        self.assertEqual(pi.LagrangeSecondOrder(0, .5, 1, curvature="concave", half="right")(1), 1)
+
+        # the border flags only affect the derivatives at the ends of the support
+        func = pi.LagrangeFirstOrder(0, 0, 1, half="left")
+        border_func = pi.LagrangeFirstOrder(0, 0, 1, half="left", right_border=True)
+        self.assertEqual(border_func(1), 1)
+        self.assertEqual(func.derive(1)(1), .5)
+        self.assertEqual(border_func.derive(1)(1), 1)
+
     def test_smoothness(self):
         func_classes = [pi.LagrangeFirstOrder, pi.LagrangeSecondOrder]
         derivatives = {pi.LagrangeFirstOrder: range(0, 2),
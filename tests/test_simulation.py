@@ -1,5 +1,7 @@
 import unittest
 import os
+import shutil
+import tempfile
 from pickle import dump
 import numpy as np
 import sys
@@ -107,7 +109,304 @@ class SimulationInputTest(unittest.TestCase):
         # return EvalData if corresponding flag is set
         self.assertIsInstance(u.get_results(domain, as_eval_data=True), sim.EvalData)
 
-        # TODO interpolation methods and extrapolation errors
+        # interpolation methods
+        steps = np.array([0, .05, 2.33, 10])
+        self.assertTrue(np.allclose(u.get_results(steps, interpolation="linear"), steps))
+        self.assertTrue(np.allclose(u.get_results(steps, interpolation="quadratic"), steps))
+        self.assertTrue(np.allclose(u.get_results(steps), steps, atol=.1))
+
+        # extrapolation errors
+        self.assertRaises(ValueError, u.get_results, [11])
+
+    def test_record_modes(self):
+        a = np.eye(2, 2)
+        b = np.array([[0], [1]])
+        domain = sim.Domain((0, 10), step=.1)
+        self.assertRaises(ValueError, MonotonousInput, record="some")
+        self.assertRaises(ValueError, MonotonousInput, decimation=0)
+
+        u = MonotonousInput(record="steps")
+        sim.simulate_state_space(sim.StateSpace("test", a, b, input_handle=u), np.zeros(2), domain)
+        self.assertTrue(np.array_equal(u._time_storage.data, domain[:]))
+        self.assertTrue(np.array_equal(u.get_results(domain), domain[:]))
+
+        u = MonotonousInput(record="steps", decimation=10)
+        sim.simulate_state_space(sim.StateSpace("test", a, b, input_handle=u), np.zeros(2), domain)
+        self.assertTrue(np.array_equal(u._time_storage.data, domain[::10]))
+
+        # too few records for interpolation
+        u = MonotonousInput(record="steps", decimation=1000)
+        self.assertRaises(ValueError, u.get_results, [0])
+        sim.simulate_state_space(sim.StateSpace("test", a, b, input_handle=u), np.zeros(2), domain)
+        for interpolation in ["nearest", "linear", "cubic"]:
+            self.assertTrue(np.array_equal(u.get_results([0, 0], interpolation=interpolation), [0, 0]))
+            self.assertRaises(ValueError, u.get_results, [0, .1], interpolation=interpolation)
+
+        # inputs of a sum are recorded as well
+        u = MonotonousInput(record="steps")
+        u_sum = sim.SimulationInputSum([u, MonotonousInput()])
+        self.assertTrue(u_sum.records_steps)
+        sim.simulate_state_space(sim.StateSpace("test", a, b, input_handle=u_sum), np.zeros(2), domain)
+        self.assertTrue(np.array_equal(u._time_storage.data, domain[:]))
+        self.assertGreater(len(u_sum._time_storage), len(domain))
+
+    def test_sample_and_hold(self):
+        a = np.zeros((1, 1))
+        b = np.ones((1, 1))
+        domain = sim.Domain((0, 1), step=.1)
+        self.assertRaises(ValueError, MonotonousInput, sample_time=0)
+
+        # integral of the staircase that results from holding u(t) = t
+        u = MonotonousInput(sample_time=.25)
+        self.assertTrue(np.allclose(u.get_sample_times(0, 1), [.25, .5, .75, 1]))
+        t, q = sim.simulate_state_space(sim.StateSpace("test", a, b, input_handle=u), np.zeros(1), domain)
+        self.assertTrue(np.allclose(u._time_storage.data, [0, .25, .5, .75, 1]))
+        self.assertAlmostEqual(q[-1, 0], .25 * (0 + .25 + .5 + .75))
+        self.assertAlmostEqual(q[5, 0], .25 * .25)
+
+        # a second run starts from scratch, continuous inputs of a sum are not affected
+        u_sum = sim.SimulationInputSum([u, ConstantInput()])
+        self.assertTrue(np.allclose(u_sum.get_sample_times(0, .6), [.25, .5]))
+        t, q = sim.simulate_state_space(sim.StateSpace("test", a, b, input_handle=u_sum), np.zeros(1), domain)
+        self.assertAlmostEqual(q[-1, 0], 1.375)
+
+        # same for the stepper
+        stepper = sim.SimulationStepper(sim.StateSpace("test", a, b, input_handle=u), np.zeros(1), .1)
+        for idx in range(10):
+            stepper.step()
+        self.assertAlmostEqual(stepper.weights[0], .375)
+
+
+class ConstantInput(sim.SimulationInput):
+    """
+    an input that stays constant
+    """
+    def _calc_output(self, **kwargs):
+        return dict(output=np.array([1.]))
+
+
+class SineInput(sim.SimulationInput):
+    """
+    an input that follows sin(t)
+    """
+    def _calc_output(self, **kwargs):
+        return dict(output=np.array([np.sin(kwargs["time"])]))
+
+
+class AbortingInput(sim.SimulationInput):
+    """
+    constant input that breaks the integration after the given time
+    """
+
+    def __init__(self, abort_time, record="all"):
+        sim.SimulationInput.__init__(self, record=record)
+        self.abort_time = abort_time
+
+    def _calc_output(self, **kwargs):
+        if kwargs["time"] > self.abort_time:
+            return dict(output=np.array([np.nan]))
+        return dict(output=np.array([1.]))
+
+
+class FixedStepIntegratorTest(unittest.TestCase):
+
+    def setUp(self):
+        # stiff linear system with analytic step response
+        self.eig_values = np.array([-1, -1e3])
+        self.a = np.diag(self.eig_values)
+        self.b = np.array([[1.], [1.]])
+        self.ic = np.zeros(2)
+        self.domain = sim.Domain((0, 1), num=101)
+
+    def _exact(self, t):
+        return (np.exp(np.outer(t, self.eig_values)) - 1) / self.eig_values
+
+    def test_methods(self):
+        for method, tol in [("implicit_euler", 1e-2), ("crank_nicolson", 1e-4), ("imex", 1e-2)]:
+            ss = sim.StateSpace("test", self.a, self.b, input_handle=ConstantInput())
+            t, q = sim.simulate_state_space(ss, self.ic, self.domain, settings=dict(name=method, step=1e-3))
+            self.assertEqual(q.shape, (self.domain[:].size, 2))
+            self.assertTrue(np.allclose(q[:, 0], self._exact(t[:])[:, 0], atol=tol))
+            self.assertTrue(np.allclose(q[1:, 1], self._exact(t[1:])[:, 1], atol=tol))
+
+    def test_convergence_order(self):
+        # q' = -q + sin(t) with q(0) = 0
+        def exact(t):
+            return (np.sin(t) - np.cos(t) + np.exp(-t)) / 2
+
+        for method, order in [("implicit_euler", 1), ("imex", 1), ("crank_nicolson", 2)]:
+            errors = []
+            for step in [1e-1, 5e-2, 2.5e-2]:
+                ss = sim.StateSpace("test", -np.eye(1), np.array([[1.]]), input_handle=SineInput())
+                integrator = sim.FixedStepIntegrator(ss, method, step=step)
+                integrator.set_initial_value(np.zeros(1), 0)
+                errors.append(abs(integrator.integrate(1.)[0] - exact(1.)))
+            self.assertTrue(np.allclose(np.log2(np.array(errors[:-1]) / errors[1:]), order, atol=.1))
+
+    def test_complex_system(self):
+        # the weights of a complex system are complex, even for a real initial state
+        ss = sim.StateSpace("test", np.diag([1j, -1 + 0j]), np.zeros((2, 1)), input_handle=ConstantInput())
+        for settings in [dict(name="zvode"), dict(name="crank_nicolson", step=1e-3)]:
+            t, q = sim.simulate_state_space(ss, np.ones(2), self.domain, settings=settings)
+            self.assertTrue(np.iscomplexobj(q))
+            self.assertTrue(np.allclose(q[-1], [np.exp(1j), np.exp(-1)], atol=1e-5))
+
+    def test_factorization_reuse(self):
+        ss = sim.StateSpace("test", self.a, self.b, input_handle=ConstantInput())
+        integrator = sim.FixedStepIntegrator(ss, "crank_nicolson", step=1e-2)
+        integrator.set_initial_value(self.ic, 0)
+        for t in self.domain[1:]:
+            integrator.integrate(t)
+        self.assertEqual(len(integrator._factorizations), 1)
+
+    def test_nonlinear(self):
+        ss = sim.StateSpace("test", {1: self.a, 2: -np.eye(2)}, self.b, input_handle=ConstantInput())
+        self.assertRaises(ValueError, sim.FixedStepIntegrator, ss, "crank_nicolson")
+
+        # steady state of q' = -q - q^2 + 1
+        t, q = sim.simulate_state_space(ss, self.ic, sim.Domain((0, 20), num=21), settings=dict(name="imex",
+                                                                                                step=1e-2))
+        self.assertAlmostEqual(q[-1, 0], (np.sqrt(5) - 1) / 2, places=3)
+
+
+class SimulationStepperTest(unittest.TestCase):
+
+    def setUp(self):
+        self.eig_values = np.array([-1, -2])
+        self.ss = sim.StateSpace("test", np.diag(self.eig_values), np.array([[1.], [1.]]),
+                                 input_handle=ConstantInput())
+        self.ic = np.zeros(2)
+
+    def test_step(self):
+        stepper = sim.SimulationStepper(self.ss, self.ic, step=1e-2)
+        buffer = stepper.weights
+        for i in range(100):
+            q = stepper.step()
+        self.assertIs(q, buffer)
+        self.assertAlmostEqual(stepper.time, 1)
+        self.assertTrue(np.allclose(q, (np.exp(self.eig_values) - 1) / self.eig_values, atol=1e-5))
+
+        # fixed step integrators are supported as well
+        stepper = sim.SimulationStepper(self.ss, self.ic, step=1e-2, settings=dict(name="crank_nicolson"))
+        for i in range(100):
+            stepper.step()
+        self.assertTrue(np.allclose(stepper.weights, (np.exp(self.eig_values) - 1) / self.eig_values, atol=1e-4))
+
+    def test_injected_input(self):
+        stepper = sim.SimulationStepper(self.ss, self.ic, step=1e-2)
+        for i in range(100):
+            stepper.step(u=2)
+        self.assertTrue(np.allclose(stepper.weights, 2 * (np.exp(self.eig_values) - 1) / self.eig_values,
+                                    atol=1e-5))
+
+        # the regular input has not been used
+        self.assertEqual(len(self.ss.input._time_storage), 0)
+
+    def test_latency(self):
+        stepper = sim.SimulationStepper(self.ss, self.ic, step=1e-2, latency_window=10)
+        self.assertRaises(ValueError, stepper.get_latency_statistics)
+        for i in range(20):
+            stepper.step()
+        stats = stepper.get_latency_statistics()
+        self.assertEqual(stats["count"], 20)
+        self.assertTrue(0 < stats["min"] <= stats["mean"] <= stats["max"])
+
+    def test_integer_initial_state(self):
+        stepper = sim.SimulationStepper(self.ss, [0, 0], step=1e-1)
+        for i in range(10):
+            stepper.step()
+        self.assertEqual(stepper.weights.dtype, float)
+        self.assertTrue(np.allclose(stepper.weights, (np.exp(self.eig_values) - 1) / self.eig_values, atol=1e-3))
+
+    def test_record_steps(self):
+        domain = sim.Domain((0, 1), step=1e-2)
+        u = SineInput(record="steps")
+        stepper = sim.SimulationStepper(sim.StateSpace("test", np.diag(self.eig_values), np.array([[1.], [1.]]),
+                                                       input_handle=u), self.ic, step=1e-2)
+        for i in range(100):
+            stepper.step()
+        self.assertTrue(np.allclose(u._time_storage.data, domain[:]))
+        self.assertTrue(np.allclose(u.get_results(domain).flatten(), np.sin(domain[:])))
+
+        u = SineInput(record="steps", decimation=10)
+        stepper = sim.SimulationStepper(sim.StateSpace("test", np.diag(self.eig_values), np.array([[1.], [1.]]),
+                                                       input_handle=u), self.ic, step=1e-2)
+        for i in range(100):
+            stepper.step()
+        self.assertTrue(np.allclose(u._time_storage.data, domain[::10]))
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.domain = sim.Domain((0, 10), num=101)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "run")
+
+    def _state_space(self, input_handle=None):
+        return sim.StateSpace("test", np.diag([-1, -2]), np.array([[1.], [1.]]),
+                              input_handle=ConstantInput() if input_handle is None else input_handle)
+
+    def test_checkpoint(self):
+        self.assertRaises(ValueError, sim.simulate_state_space, self._state_space(), np.zeros(2), self.domain,
+                          checkpoint=dict(path=self.path))
+
+        t, q = sim.simulate_state_space(self._state_space(), np.zeros(2), self.domain)
+        t_chk, q_chk = sim.simulate_state_space(self._state_space(), np.zeros(2), self.domain,
+                                                checkpoint=dict(path=self.path, sim_time=1))
+        self.assertTrue(np.array_equal(t[:], t_chk[:]))
+        self.assertTrue(np.array_equal(q, q_chk))
+        self.assertTrue(np.array_equal(np.load(self.path + ".npy"), q))
+
+        checkpoint, state = sim.Checkpoint.load(self.path)
+        self.assertEqual(checkpoint.sim_time, 1)
+        self.assertEqual(state["index"], 100)
+
+    def test_resume(self):
+        ss = self._state_space(ConstantInput(record="steps"))
+        t, q = sim.simulate_state_space(ss, np.zeros(2), self.domain)
+        input_times = ss.input._time_storage.data.copy()
+
+        # let the first run die at t=3.05
+        ss = self._state_space(AbortingInput(3.05, record="steps"))
+        with self.assertWarns(UserWarning):
+            t_abort, q_abort = sim.simulate_state_space(ss, np.zeros(2), self.domain,
+                                                        checkpoint=dict(path=self.path, sim_time=1))
+        self.assertEqual(t_abort[-1], 3)
+        checkpoint, state = sim.Checkpoint.load(self.path)
+        self.assertEqual(state["time"], 3)
+        shutil.copy(self.path + ".chk", self.path + "_abort.chk")
+        shutil.copy(self.path + ".npy", self.path + "_abort.npy")
+
+        ss = self._state_space(ConstantInput(record="steps"))
+        t_res, q_res = sim.resume_simulation(ss, self.path)
+        self.assertTrue(np.array_equal(t_res[:], t[:]))
+        self.assertTrue(np.allclose(q_res, q, atol=1e-5))
+
+        # input history of the first run has been restored and continued
+        self.assertTrue(np.all(np.diff(ss.input._time_storage.data) > 0))
+        self.assertTrue(np.array_equal(ss.input._time_storage.data, input_times))
+        self.assertTrue(np.array_equal(ss.input.get_results(t), np.ones((t[:].size, 1))))
+
+        # other integrator settings are used for the rest of the run and stored in its checkpoints
+        settings = dict(name="crank_nicolson", step=1e-2)
+        t_res, q_res = sim.resume_simulation(self._state_space(), self.path + "_abort", settings=settings)
+        self.assertTrue(np.allclose(q_res, q, atol=1e-4))
+        self.assertEqual(sim.Checkpoint.load(self.path + "_abort")[1]["settings"], settings)
+
+    def test_input_storage(self):
+        # the evaluations of the adaptive integrator beyond the checkpoint are not saved
+        ss = self._state_space(AbortingInput(3.05))
+        with self.assertWarns(UserWarning):
+            sim.simulate_state_space(ss, np.zeros(2), self.domain, checkpoint=dict(path=self.path, sim_time=1))
+        self.assertGreater(np.max(ss.input._time_storage.data), 3)
+        checkpoint, state = sim.Checkpoint.load(self.path)
+        times = state["input_storage"]["time"]
+        self.assertLessEqual(np.max(times), 3)
+        self.assertEqual(times.size, state["input_storage"]["values"]["output"].shape[0])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
 
 
 class CanonicalFormTest(unittest.TestCase):
@@ -383,6 +682,53 @@ class StateSpaceTests(unittest.TestCase):
         self.assertTrue(np.allclose(ss.B[1], np.array([[0], [0], [0], [0.125], [-1.75], [6.875]])))
         self.assertEqual(self.cf.input_function, self.u)
 
+    def test_rhs(self):
+        rnd = np.random.RandomState(0)
+        a = {1: rnd.rand(4, 4), 2: rnd.rand(4, 4), 0: rnd.rand(4, 4)}
+        b = {1: rnd.rand(4, 2), 3: rnd.rand(4, 2)}
+        f = rnd.rand(4)
+        q = rnd.rand(4)
+        u = rnd.rand(2)
+
+        def rhs_ref(_q, _u, mats_a):
+            return f + sum([np.dot(mat, _q**p) for p, mat in mats_a.items()]) \
+                   + sum([np.dot(mat, _u**p) for p, mat in b.items()])
+
+        ss = sim.StateSpace("test", a, b, input_handle=lambda **kw: u, f_vector=f)
+        rhs = sim._StateSpaceRhs(ss)
+        self.assertTrue(np.allclose(rhs(0, q), rhs_ref(q, u, a)))
+        self.assertTrue(np.allclose(rhs(0, 2 * q), rhs_ref(2 * q, u, a)))
+
+        explicit = sim._StateSpaceRhs(ss, explicit_only=True)
+        self.assertTrue(np.allclose(explicit(0, q), rhs_ref(q, u, {0: a[0], 2: a[2]})))
+
+        # large sparse systems use the sparse kernel, vectorial input matrices are treated as column
+        a_large = np.diag(rnd.rand(200))
+        b_large = rnd.rand(200)
+        ss = sim.StateSpace("test", a_large, b_large, input_handle=lambda **kw: np.array([2.]))
+        rhs = sim._StateSpaceRhs(ss)
+        self.assertTrue(all([sim.issparse(term[-1]) for term in rhs._terms]))
+        q = rnd.rand(200)
+        self.assertTrue(np.allclose(rhs(0, q), np.dot(a_large, q) + 2 * b_large))
+
+        # complex weights
+        self.assertTrue(np.allclose(rhs(0, 1j * q), 1j * np.dot(a_large, q) + 2 * b_large))
+
+        # inputs have to fit to the input matrices
+        q = rnd.rand(4)
+        ss = sim.StateSpace("test", a, b, input_handle=lambda **kw: np.array([2.]), f_vector=f)
+        self.assertRaises(ValueError, sim._StateSpaceRhs(ss), 0, q)
+        ss = sim.StateSpace("test", a, b, input_handle=lambda **kw: np.ones(3), f_vector=f)
+        self.assertRaises(ValueError, sim._StateSpaceRhs(ss), 0, q)
+
+    def test_defaults(self):
+        # an autonomous system without input matrix and input
+        ss = sim.StateSpace("test", np.diag([-1., -2.]), None)
+        self.assertEqual(ss.B[1].shape, (2, 1))
+        self.assertEqual(ss.D.shape, (1, 1))
+        t, q = sim.simulate_state_space(ss, np.ones(2), sim.Domain((0, 1), num=11))
+        self.assertTrue(np.allclose(q[-1], np.exp([-1, -2]), atol=1e-5))
+
 
 class StringMassTest(unittest.TestCase):
 
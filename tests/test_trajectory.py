@@ -1,6 +1,9 @@
 
 import unittest
+import os
+import tempfile
 import numpy as np
+from scipy.special import comb, factorial
 from pyinduct import trajectory as tr, visualization as vis
 import pyinduct.utils as ut
 import sys
@@ -52,6 +55,88 @@ class SmoothTransitionTestCase(unittest.TestCase):
             ap = vis.PgAnimatedPlot(eval_data_x)
             app.exec_()
 
+    def test_vectorization(self):
+        st = tr.SmoothTransition((self.y0, self.y1), (1, 3), method="poly", differential_order=2)
+        values = st(self.t_values)
+        self.assertEqual(values.shape, (3, self.t_values.size))
+        for idx in [0, 150, 250, 999]:
+            self.assertTrue(np.array_equal(values[:, idx], st(self.t_values[idx])))
+
+        fs = tr.FlatString(y0=self.y0, y1=self.y1, z0=self.z_start, z1=self.z_end, t0=self.t_start, dt=2,
+                           params=self.params)
+        u_values = fs.control_input(self.t_values)
+        self.assertTrue(np.allclose(u_values, [fs(time=t) for t in self.t_values]))
+
+
+class TrajectoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.t = np.linspace(0, 1, 11)
+        self.u = self.t**2
+
+    def test_constant(self):
+        traj = tr.ConstantTrajectory(2)
+        self.assertEqual(traj(time=1), 2)
+        self.assertTrue(np.array_equal(traj(time=self.t), 2 * np.ones(11)))
+
+    def test_precompile(self):
+        traj = tr.InterpTrajectory(self.t, self.u)
+        fine_grid = np.linspace(0, 1, 101)
+        exact = traj(time=fine_grid)
+
+        # uniform grid
+        traj.precompile(fine_grid)
+        self.assertTrue(np.allclose([traj(time=t) for t in fine_grid], exact))
+        self.assertAlmostEqual(traj(time=.555), np.interp(.555, self.t, self.u))
+
+        # non uniform grid
+        traj.precompile(np.hstack((np.linspace(0, .5, 11), np.linspace(.51, 1, 50))))
+        self.assertTrue(np.allclose([traj(time=t) for t in fine_grid], exact))
+        self.assertTrue(np.allclose([traj(time=t) for t in fine_grid[::-1]], exact[::-1]))
+
+        # signal is held outside of the table
+        self.assertEqual(traj(time=-1), 0)
+        self.assertEqual(traj(time=2), 1)
+
+        self.assertRaises(ValueError, traj.precompile, [1])
+
+    def test_cursor(self):
+        # the grid is not uniform, although its steps are close in absolute terms
+        grid = np.arange(1001) * 1e-6
+        grid[500] += 1e-9
+        cursor = tr._Cursor(grid)
+        steps = np.hstack((grid[:-1], grid[:-1] + 5e-10, grid[1:] - 5e-10))
+        for t in np.hstack((steps, steps[::-1])):
+            idx = cursor.locate(t)
+            self.assertTrue(grid[idx] <= t < grid[idx + 1])
+        self.assertEqual(cursor.locate(grid[-1]), grid.size - 2)
+
+        # uniform grids
+        grid = np.linspace(0, 1, 101)
+        cursor = tr._Cursor(grid)
+        for t in np.hstack((grid[:-1], (grid[:-1] + grid[1:]) / 2)):
+            idx = cursor.locate(t)
+            self.assertTrue(grid[idx] <= t < grid[idx + 1])
+        self.assertEqual(cursor.locate(1), 99)
+
+    def test_interpolation(self):
+        t = np.linspace(0, 2*np.pi, 11)
+        fine_grid = np.linspace(0, 2*np.pi, 1001)
+        linear = tr.InterpTrajectory(t, np.sin(t))
+        hermite = tr.InterpTrajectory(t, np.sin(t), du=np.cos(t))
+        self.assertRaises(ValueError, tr.InterpTrajectory, t, np.sin(t), du=np.cos(t[1:]))
+
+        for traj, tol in [(linear, 1e-1), (hermite, 2e-3)]:
+            values = traj(time=fine_grid)
+            self.assertTrue(np.allclose(values, np.sin(fine_grid), atol=tol))
+
+            # scalar evaluation via the cursor, also going backwards
+            steps = np.hstack((fine_grid[:500], fine_grid[400:600:7], fine_grid[100::3]))
+            self.assertTrue(np.allclose([traj(time=step) for step in steps], traj(time=steps)))
+
+        self.assertGreater(np.abs(linear(time=fine_grid) - np.sin(fine_grid)).max(),
+                           10*np.abs(hermite(time=fine_grid) - np.sin(fine_grid)).max())
+
 
 class FormalPowerSeriesTest(unittest.TestCase):
 
@@ -85,6 +170,45 @@ class FormalPowerSeriesTest(unittest.TestCase):
             pw.plot(self.t, x_0t)
             app.exec_()
 
+    def test_gevrey_resolution(self):
+        self.assertEqual(self.t.size, 50)
+        y, t = tr.gevrey_tanh(self.T, 4, num=11)
+        self.assertEqual(y.shape, (5, 11))
+        self.assertTrue(np.allclose(t, np.linspace(0, self.T, 11)))
+
+        y_fine, t_fine = tr.gevrey_tanh(self.T, 4, step=.01)
+        self.assertEqual(t_fine.size, 101)
+        self.assertTrue(np.allclose(y_fine[:, ::10], y))
+
+        # boundary values
+        self.assertTrue(np.array_equal(y[:, 0], np.zeros(5)))
+        self.assertTrue(np.array_equal(y[:, -1], [1, 0, 0, 0, 0]))
+
+        # derivatives are consistent
+        self.assertTrue(np.allclose(np.gradient(y_fine[0], t_fine), y_fine[1], atol=5e-2))
+
+        traj = tr.RadTrajectory(self.l, self.T, self.param, "robin", "robin", n=self.n_y, num=201)
+        self.assertEqual(traj._t.size, 201)
+
+    def test_flat_out_series(self):
+        # compare with the plain series for a short termination index
+        a2, a1, a0, alpha, beta = self.param
+        n = 6
+        z = np.linspace(0, self.l, 5)
+        x, d_x = tr._power_series_flat_out(z, self.t, n, self.param, self.y, "robin")
+        self.assertEqual(x.shape, (len(self.t), len(z)))
+
+        x_ref = np.zeros(x.shape)
+        d_x_ref = alpha * np.outer(self.y[0], np.ones(len(z)))
+        for j in range(n):
+            b = sum([comb(j, k) * (-a0)**(j - k) * self.y[k] for k in range(j + 1)])
+            d_b = sum([comb(j + 1, k) * (-a0)**(j + 1 - k) * self.y[k] for k in range(j + 2)])
+            x_ref += np.outer(b, (1 + alpha*z/(2*j + 1)) * z**(2*j) / factorial(2*j) / a2**j)
+            d_x_ref += np.outer(d_b, (1 + alpha*z/(2*j + 2)) * z**(2*j + 1) / factorial(2*j + 1) / a2**(j + 1))
+
+        self.assertTrue(np.allclose(x, x_ref))
+        self.assertTrue(np.allclose(d_x, d_x_ref))
+
     def test_recursion_vs_explicit(self):
 
         # recursion
@@ -104,3 +228,62 @@ class FormalPowerSeriesTest(unittest.TestCase):
             pw.plot(self.t, u_b_t)
             app.exec_()
 
+
+
+class RadTrajectoryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.args = (1, 1, [1, 0, 6, .5, .5], "robin", "robin")
+        tr.clear_rad_trajectory_cache()
+
+    def test_memory(self):
+        traj = tr.RadTrajectory(*self.args)
+        self.assertEqual(tr.get_rad_trajectory_cache_info()["misses"], 1)
+
+        cached = tr.RadTrajectory(*self.args)
+        info = tr.get_rad_trajectory_cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (1, 1, 1))
+        self.assertTrue(np.array_equal(traj(time=traj._t), cached(time=traj._t)))
+
+        # the key depends on all parameters
+        tr.RadTrajectory(1, 1, [1, 0, 6, .5, .6], "robin", "robin")
+        tr.RadTrajectory(*self.args, num=21)
+        self.assertEqual(tr.get_rad_trajectory_cache_info()["misses"], 3)
+
+    def test_size(self):
+        tr.set_rad_trajectory_cache_size(2)
+        first = tr.RadTrajectory(*self.args)
+        tr.RadTrajectory(*self.args, num=21)
+        tr.RadTrajectory(*self.args)
+        tr.RadTrajectory(*self.args, num=31)
+        info = tr.get_rad_trajectory_cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["size"], info["max_size"]), (1, 3, 2, 2))
+
+        # the least recently used table has been dropped
+        tr.RadTrajectory(*self.args)
+        self.assertEqual(tr.get_rad_trajectory_cache_info()["hits"], 2)
+        tr.RadTrajectory(*self.args, num=21)
+        self.assertEqual(tr.get_rad_trajectory_cache_info()["misses"], 4)
+
+        tr.set_rad_trajectory_cache_size(0)
+        self.assertEqual(tr.get_rad_trajectory_cache_info()["size"], 0)
+        self.assertTrue(np.array_equal(tr.RadTrajectory(*self.args)(time=first._t), first(time=first._t)))
+        self.assertRaises(ValueError, tr.set_rad_trajectory_cache_size, -1)
+
+    def test_disk(self):
+        tr.set_rad_trajectory_cache_dir(self.temp_dir.name)
+        traj = tr.RadTrajectory(*self.args)
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 1)
+
+        tr.clear_rad_trajectory_cache()
+        cached = tr.RadTrajectory(*self.args)
+        info = tr.get_rad_trajectory_cache_info()
+        self.assertEqual((info["disk_hits"], info["misses"]), (1, 0))
+        self.assertTrue(np.array_equal(traj(time=traj._t), cached(time=traj._t)))
+
+    def tearDown(self):
+        tr.set_rad_trajectory_cache_dir(None)
+        tr.set_rad_trajectory_cache_size(32)
+        tr.clear_rad_trajectory_cache()
+        self.temp_dir.cleanup()
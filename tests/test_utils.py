@@ -1,5 +1,6 @@
 import unittest
 import sys
+import multiprocessing
 import numpy as np
 
 from pyinduct import register_base, \
@@ -85,10 +86,51 @@ class FindRootsTestCase(unittest.TestCase):
                           atol=float_num)
         self.assertRaises(ValueError, ut.find_roots, self.char_eq, self.n_roots, to_small_area_end, self.rtol)
 
+    def test_bracket(self):
+        roots = ut.find_roots(self.char_eq, self.n_roots, self.grid, self.rtol)
+        bracket_roots = ut.find_roots(self.char_eq, self.n_roots, self.grid, self.rtol, bracket=True)
+        self.assertTrue(np.allclose(roots, bracket_roots))
+
+        # scalar function handle and sign changes at poles
+        all_roots = ut.find_roots(lambda x: float(np.tan(x)), None, np.arange(.5, 10, .3), bracket=True)
+        self.assertTrue(np.allclose(all_roots, [np.pi, 2 * np.pi, 3 * np.pi]))
+
+        # handles that accept arrays without mapping them elementwise are evaluated pointwise
+        all_roots = ut.find_roots(lambda x: np.cos(np.max(x)), None, np.arange(0, 10, .3), bracket=True)
+        self.assertTrue(np.allclose(all_roots, np.pi * np.array([.5, 1.5, 2.5])))
+
+        self.assertRaises(ValueError, ut.find_roots, self.char_eq, 100, self.grid, self.rtol, bracket=True)
+        self.assertRaises(ValueError, ut.find_roots, self.cmplx_eq, 3, [np.arange(-10, 10), np.arange(-5, 5)],
+                          complex=True, bracket=True)
+
+    def test_parallel(self):
+        roots = ut.find_roots(self.char_eq, self.n_roots, self.grid, self.rtol)
+        self.assertTrue(np.allclose(roots, ut.find_roots(self.char_eq, self.n_roots, self.grid, self.rtol,
+                                                         processes=2)))
+
+        # complex roots are sorted by their real and then by their imaginary part
+        grid = [np.linspace(-3, 3, 7), np.linspace(0, 20, 41)]
+        roots = ut.find_roots(lambda lam: np.cosh(lam) - 2, 6, grid, -3, complex=True, processes=2)
+        desired = np.arccosh(2) * np.array([-1, 1])[:, np.newaxis] + 2j * np.pi * np.arange(3)
+        self.assertTrue(np.allclose(roots, desired.flatten()))
+
+    def test_parallel_spawn(self):
+        # workers that are spawned instead of forked receive the (wrapped) function handle pickled
+        start_method = multiprocessing.get_start_method()
+        multiprocessing.set_start_method("spawn", force=True)
+        try:
+            grid = [np.linspace(-3, 3, 7), np.linspace(0, 20, 41)]
+            roots = ut.find_roots(np.cosh, 2, grid, -3, complex=True, processes=2)
+        finally:
+            multiprocessing.set_start_method(start_method, force=True)
+        self.assertTrue(np.allclose(roots, ut.find_roots(np.cosh, 2, grid, -3, complex=True)))
+
     def test_debug_plot(self):
         if show_plots:
             self.roots = ut.find_roots(self.char_eq, self.n_roots, self.grid, rtol=self.rtol,
                                        show_plot=show_plots)
+            self.roots = ut.find_roots(self.char_eq, self.n_roots, self.grid, rtol=self.rtol,
+                                       show_plot=show_plots, bracket=True)
 
     def test_cmplx_func(self):
         grid = [np.arange(-10, 10), np.arange(-5, 5)]